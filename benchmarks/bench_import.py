@@ -0,0 +1,55 @@
+"""Measure the cold import time of the entry point modules.
+
+Usage: python -m benchmarks.bench_import --repeat 5
+
+Every import runs in a new interpreter, the heavy libraries it loads are listed next to its time.
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+
+
+PROJECT_ROOT_PATH = pathlib.Path(__file__).parent.parent
+MODULES = ['src.main', 'src.utils', 'src.report', 'src.summary']
+HEAVY_MODULES = ['pandas', 'pydantic', 'openpyxl', 'reportlab.platypus', 'matplotlib', 'PIL.Image', 'faker']
+# Prints the import time and the heavy modules loaded by it.
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [name for name in {heavy_modules!r} if name in sys.modules]]))
+'''
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(module=module, heavy_modules=HEAVY_MODULES)],
+        capture_output=True,
+        check=True,
+        cwd=PROJECT_ROOT_PATH,
+        text=True,
+    ).stdout
+
+    return tuple(json.loads(output))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the import time of the entry point modules.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"module":<14} {"best [s]":>10}  loaded')
+    for module in MODULES:
+        timings, loaded = [], []
+        for _ in range(args.repeat):
+            seconds, loaded = measure(module)
+            timings.append(seconds)
+        print(f'{module:<14} {min(timings):>10.3f}  {", ".join(loaded) or "-"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""Time each stage of the generate pipeline on synthetic daily reports.
+
+Usage: python -m benchmarks.bench_pipeline --days 7 --rows 100000 --error-rate .01
+
+Results are written as JSON, to compare runs over time. The stages are the ones the app profiles
+with --profile; the time of a stage includes the stages nested in it.
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import subprocess
+import tempfile
+import time
+import unittest.mock
+
+import numpy as np
+import pandas as pd
+
+from src.constans import DATE_FORMAT, SUMMARY_DETAIL, SUMMARY_DETAIL_MODES, XLSX_READER, XLSX_WRITER
+from src.profiling import PROFILER
+from src.readers import READERS
+from src.report import Report
+from src.summary import Summary
+from src.utils import generate_fake_orders
+from src.writers import WRITERS, write_frame
+
+
+RESULTS_DIR_PATH = pathlib.Path(__file__).parent / 'results'
+
+
+def add_errors(orders: pd.DataFrame, error_rate: float, rng: np.random.Generator) -> pd.DataFrame:
+    """Break one field of `error_rate` of the orders, keeping the types of the columns.
+
+    An invalid order has a negative id, a too short name, no quantity or a missing price.
+    """
+    orders = orders.astype({'id': 'float64', 'quantity': 'float64'})
+    invalid = np.flatnonzero(rng.random(len(orders)) < error_rate)
+    fields = rng.integers(0, 4, len(invalid))
+    orders.loc[invalid[fields == 0], 'id'] = -1
+    orders.loc[invalid[fields == 1], 'name'] = 'ab'
+    orders.loc[invalid[fields == 2], 'quantity'] = 0
+    orders.loc[invalid[fields == 3], 'price'] = np.nan
+
+    return orders
+
+
+def write_days(
+    data_path: pathlib.Path,
+    dates: list[datetime.date],
+    rows: int,
+    error_rate: float,
+    seed: int,
+) -> None:
+    """Write daily reports of fake orders, as the dummy entry point does, with invalid orders among them."""
+    seeds = np.random.SeedSequence(seed).spawn(len(dates))
+    for day, (date, day_seed) in enumerate(zip(dates, seeds)):
+        orders = generate_fake_orders(rows, order_id_start=day * rows + 1, seed=day_seed)
+        write_frame(
+            data_path / f'{date.strftime(DATE_FORMAT)}.xlsx',
+            add_errors(orders, error_rate, np.random.default_rng(day_seed)),
+        )
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            cwd=pathlib.Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    days: int,
+    rows: int,
+    error_rate: float,
+    seed: int,
+    reader: str,
+    writer: str,
+    detail: str,
+    read_ahead: int = 0,
+    compact: bool = False,
+) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = pathlib.Path(temp_dir)
+        data_path = temp_path / 'data'
+        data_path.mkdir()
+        first_date = datetime.date(2025, 1, 1)
+        dates = [first_date + datetime.timedelta(days=day) for day in range(days)]
+        write_days(data_path, dates, rows, error_rate, seed)
+
+        enabled, PROFILER.enabled, PROFILER.stages = PROFILER.enabled, True, []
+        try:
+            with (
+                unittest.mock.patch('src.report.REPORTS_DIR_PATH', temp_path),
+                unittest.mock.patch('src.report.VALIDATION_ERRORS_DIR_PATH', temp_path),
+                unittest.mock.patch('src.summary.SUMMARY_PATH', temp_path / 'Summary.pdf'),
+                unittest.mock.patch('src.summary.TEMP_DIR_PATH', temp_path),
+            ):
+                start = time.perf_counter()
+                reports = [
+                    Report(
+                        data_path / f'{date.strftime(DATE_FORMAT)}.xlsx',
+                        date,
+                        reader=reader,
+                        writer=writer,
+                        compact=compact,
+                    )
+                    for date in dates
+                ]
+                summary = Summary(reports, detail=detail, read_ahead=read_ahead)
+                summary.save()
+                total_seconds = time.perf_counter() - start
+            stages = PROFILER.get_totals()
+            table = PROFILER.get_table()
+        finally:
+            PROFILER.enabled, PROFILER.stages = enabled, []
+
+    return {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'days': days,
+            'rows': rows,
+            'error_rate': error_rate,
+            'seed': seed,
+            'reader': reader,
+            'writer': writer,
+            'detail': detail,
+            'read_ahead': read_ahead,
+            'compact': compact,
+        },
+        'orders': summary.aggregates.rows_count,
+        'summary_data_bytes': int(summary.data.memory_usage(deep=True).sum()),
+        'total_seconds': total_seconds,
+        'stages': stages,
+        'stages_table': table,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the stages of the generate pipeline.')
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--rows', type=int, default=10_000, help='Orders of each day')
+    parser.add_argument(
+        '--error-rate', type=float, default=.01, help='Share of the orders with an invalid field'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reader', choices=READERS, default=XLSX_READER)
+    parser.add_argument('--writer', choices=WRITERS, default=XLSX_WRITER)
+    parser.add_argument('--detail', choices=SUMMARY_DETAIL_MODES, default=SUMMARY_DETAIL)
+    parser.add_argument('--read-ahead', type=int, default=0)
+    parser.add_argument('--compact', action='store_true')
+    parser.add_argument(
+        '--output',
+        type=pathlib.Path,
+        help=f'JSON file of the results (default: a new file in {RESULTS_DIR_PATH})',
+    )
+    args = parser.parse_args()
+
+    result = run(
+        args.days,
+        args.rows,
+        args.error_rate,
+        args.seed,
+        args.reader,
+        args.writer,
+        args.detail,
+        args.read_ahead,
+        args.compact,
+    )
+
+    output = args.output or RESULTS_DIR_PATH / f'pipeline-{datetime.datetime.now():%Y%m%d-%H%M%S}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as results:
+        json.dump(result, results, indent=4)
+
+    print(result['stages_table'])
+    print(f'Total: {result["total_seconds"]:.3f} s')
+    print(f'Orders in memory: {result["summary_data_bytes"] / 2 ** 20:.1f} MB')
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Compare the float and the integer cents money calculations of a daily report.
+
+Usage: python -m benchmarks.bench_pricing --rows 1000000 --products 5000 --repeat 5
+
+Prices the orders and sums the money columns both ways, then also sums them by a product like
+the report and the summary do. The float sums differ from the exact cents sums by the unrounded
+gross prices and by the float rounding errors of the sums.
+"""
+
+import argparse
+import time
+import typing
+
+import numpy as np
+import pandas as pd
+
+from src.constans import TAX_RATE
+from src.pricing import calculate_gross_cents, from_cents, to_cents
+
+
+def price_floats(price: np.ndarray, quantity: np.ndarray, tax_rate: float) -> dict[str, float]:
+    gross = price * (1 + tax_rate)
+    total = gross * quantity
+
+    return {'price': price.sum(), 'gross': gross.sum(), 'total': total.sum()}
+
+
+def price_cents(price: np.ndarray, quantity: np.ndarray, tax_rate: float) -> dict[str, float]:
+    cents = to_cents(price)
+    gross_cents = calculate_gross_cents(cents, tax_rate)
+    total_cents = gross_cents * quantity
+
+    return {
+        'price': from_cents(cents.sum()),
+        'gross': from_cents(gross_cents.sum()),
+        'total': from_cents(total_cents.sum()),
+    }
+
+
+def price_floats_by_name(
+    price: np.ndarray,
+    quantity: np.ndarray,
+    tax_rate: float,
+    names: pd.Categorical,
+) -> pd.DataFrame:
+    gross = price * (1 + tax_rate)
+    money = {'price': price, 'gross': gross, 'total': gross * quantity}
+
+    return pd.DataFrame({'name': names, **money}).groupby('name', observed=True, sort=False).sum()
+
+
+def price_cents_by_name(
+    price: np.ndarray,
+    quantity: np.ndarray,
+    tax_rate: float,
+    names: pd.Categorical,
+) -> pd.DataFrame:
+    cents = to_cents(price)
+    gross_cents = calculate_gross_cents(cents, tax_rate)
+    money = {'price': cents, 'gross': gross_cents, 'total': gross_cents * quantity}
+
+    return pd.DataFrame({'name': names, **money}).groupby('name', observed=True, sort=False).sum()
+
+
+def best_time(function: typing.Callable, repeat: int, *args) -> tuple[float, dict[str, float]]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the money calculations.')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    price = rng.integers(1, 1_000_000, args.rows) / 100
+    quantity = rng.integers(1, 10, args.rows)
+    names = pd.Categorical(rng.integers(0, args.products, args.rows))
+
+    float_seconds, float_sums = best_time(price_floats, args.repeat, price, quantity, TAX_RATE)
+    cents_seconds, cents_sums = best_time(price_cents, args.repeat, price, quantity, TAX_RATE)
+    float_by_name_seconds, _ = best_time(price_floats_by_name, args.repeat, price, quantity, TAX_RATE, names)
+    cents_by_name_seconds, _ = best_time(price_cents_by_name, args.repeat, price, quantity, TAX_RATE, names)
+
+    print(f'{"engine":<16} {"best [ms]":>10} {"rows/s":>14}')
+    for name, seconds in [
+        ('float', float_seconds),
+        ('cents', cents_seconds),
+        ('float by name', float_by_name_seconds),
+        ('cents by name', cents_by_name_seconds),
+    ]:
+        print(f'{name:<16} {seconds * 1000:>10.2f} {args.rows / seconds:>14,.0f}')
+    for column in cents_sums:
+        print(f'{column:<6} float - cents: {float_sums[column] - cents_sums[column]:+.6f}')
+
+if __name__ == '__main__':
+    main()
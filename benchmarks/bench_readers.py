@@ -0,0 +1,63 @@
+"""Compare the xlsx readers of daily reports.
+
+Usage: python -m benchmarks.bench_readers --rows 100000 --repeat 3
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+
+from src.readers import READERS
+
+
+def write_xlsx(path: pathlib.Path, rows: int, seed: int = 0, error_rate: float = 0) -> None:
+    """Write a daily report of synthetic orders, `error_rate` of them with an invalid field."""
+    rng = np.random.default_rng(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['id', 'name', 'quantity', 'price'])
+    ids = (np.arange(rows) + 1).astype(object)
+    names = rng.choice(['AeroFlare', 'QuantumBlend', 'SolarPure', 'EcoSphere'], rows).astype(object)
+    quantities = rng.integers(1, 10, rows).astype(object)
+    prices = (rng.integers(100, 1000000, rows) / 100).astype(object)
+
+    # Each invalid order breaks one of its fields: a negative id, a too short name,
+    # a quantity which is not a number or a missing price.
+    invalid = np.flatnonzero(rng.random(rows) < error_rate)
+    fields = rng.integers(0, 4, len(invalid))
+    ids[invalid[fields == 0]] = -1
+    names[invalid[fields == 1]] = 'ab'
+    quantities[invalid[fields == 2]] = 'many'
+    prices[invalid[fields == 3]] = None
+
+    for row in zip(ids.tolist(), names.tolist(), quantities.tolist(), prices.tolist()):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the xlsx readers.')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = pathlib.Path(temp_dir) / '2025_01_01.xlsx'
+        write_xlsx(path, args.rows)
+
+        print(f'{"reader":<10} {"best [s]":>10} {"rows/s":>12}')
+        for name, reader in READERS.items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                reader(path)
+                timings.append(time.perf_counter() - start)
+            print(f'{name:<10} {min(timings):>10.3f} {args.rows / min(timings):>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
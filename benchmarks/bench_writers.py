@@ -0,0 +1,58 @@
+"""Compare the xlsx writers of daily reports.
+
+Usage: python -m benchmarks.bench_writers --rows 500000 --repeat 1
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+import unittest.mock
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.report import Report
+from src.writers import WRITERS
+
+
+def get_report(rows: int, seed: int = 0) -> Report:
+    rng = np.random.default_rng(seed)
+    report = Report(pathlib.Path('2025_01_01.xlsx'), date(2025, 1, 1))
+    report.data = pd.DataFrame({
+        'id': np.arange(rows) + 1,
+        'name': rng.choice(['AeroFlare', 'QuantumBlend', 'SolarPure', 'EcoSphere'], rows),
+        'price': rng.integers(100, 1000000, rows) / 100,
+        'quantity': rng.integers(1, 10, rows),
+    })
+    report.validated = True
+    report.set_price_cols()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the xlsx writers.')
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    report = get_report(args.rows)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = pathlib.Path(temp_dir) / '2025_01_01_report.xlsx'
+
+        print(f'{"writer":<10} {"best [s]":>10} {"rows/s":>12}')
+        with unittest.mock.patch.object(Report, 'output_path', output_path):
+            for name, writer in WRITERS.items():
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    writer(report)
+                    timings.append(time.perf_counter() - start)
+                print(f'{name:<10} {min(timings):>10.3f} {args.rows / min(timings):>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
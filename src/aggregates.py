@@ -0,0 +1,108 @@
+"""Running aggregates of the summarised reports."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.pricing import from_cents
+from src.ranking import get_top, get_top_positions
+from src.report import Report
+
+
+TOTAL_COLUMNS = ['price', 'gross', 'total']
+BY_DATE_COLUMNS = ['orders', 'quantity', *TOTAL_COLUMNS]
+BY_NAME_COLUMNS = ['quantity', 'total']
+ROLLUP_COLUMNS = ['date', 'name', *BY_DATE_COLUMNS]
+
+
+def get_rollups(report: Report) -> pd.DataFrame:
+    """Orders, quantity and money in cents of each product of a report, by the date and the product name."""
+    rollups = report.get_sums_by('name').sort_index().reset_index()
+    # Names of compact reports are categorical, rollups are kept by plain names.
+    rollups['name'] = rollups['name'].astype(object)
+    rollups.insert(0, 'date', report.date)
+
+    return rollups[ROLLUP_COLUMNS]
+
+
+class SummaryAggregates:
+    """Totals the Summary needs, updated one report at a time.
+
+    Money is summed in integer cents, so the totals are exact whatever the number of orders.
+    Memory depends on the number of days and products only, not on the number of orders.
+    """
+
+    def __init__(self) -> None:
+        self.rows_count: int = 0
+        self._totals: pd.Series = pd.Series(0, index=TOTAL_COLUMNS, dtype='int64')
+        self._by_name: pd.DataFrame = pd.DataFrame(columns=BY_NAME_COLUMNS, dtype='int64').rename_axis('name')
+        # Sums of BY_DATE_COLUMNS by a date.
+        self._by_date: dict[datetime.date, np.ndarray] = {}
+
+    def add(self, report: Report) -> pd.DataFrame:
+        """Add the orders of a report, return its rollups."""
+        rollups = get_rollups(report)
+        self.add_dates([report.date])
+        self.add_rollups(rollups)
+
+        return rollups
+
+    def add_dates(self, dates: list[datetime.date]) -> None:
+        """Give the dates their place in the totals by a date, also when they have no valid orders."""
+        for date in dates:
+            self._by_date.setdefault(date, np.zeros(len(BY_DATE_COLUMNS), dtype='int64'))
+
+    def add_rollups(self, rollups: pd.DataFrame) -> None:
+        """Add daily rollups of products, in the layout returned by `get_rollups`."""
+        self.rows_count += int(rollups['orders'].sum())
+        self._totals = self._totals.add(rollups[TOTAL_COLUMNS].sum())
+        by_date = rollups.groupby('date')[BY_DATE_COLUMNS].sum()
+        for date, sums in zip(by_date.index, by_date.to_numpy(dtype='int64')):
+            self._by_date[date] = self._by_date[date] + sums if date in self._by_date else sums
+        by_name = rollups.groupby('name')[BY_NAME_COLUMNS].sum()
+        self._by_name = self._by_name.add(by_name, fill_value=0).astype('int64').sort_index()
+
+    @property
+    def dates(self) -> list[datetime.date]:
+        return sorted(self._by_date)
+
+    @property
+    def totals(self) -> pd.Series:
+        return from_cents(self._totals)
+
+    @property
+    def by_name(self) -> pd.DataFrame:
+        return self._by_name.assign(total=from_cents(self._by_name['total']))
+
+    def get_top_by_name(self, top_n: int) -> pd.DataFrame:
+        """`by_name` of the `top_n` products with the largest total, largest first."""
+        by_name = self._by_name.iloc[get_top_positions(self._by_name['total'].to_numpy(), top_n)]
+
+        return by_name.assign(total=from_cents(by_name['total']))
+
+    def get_top_total_by_name(self, top_n: int | None) -> pd.Series:
+        """`total_by_name` of the `top_n` products with the largest total, largest first,
+        then of the rest as Other.
+        """
+        return from_cents(get_top(self._by_name['total'], top_n))
+
+    @property
+    def by_date(self) -> pd.DataFrame:
+        by_date = pd.DataFrame(
+            [self._by_date[date] for date in sorted(self._by_date)],
+            index=pd.Index(sorted(self._by_date), name='date'),
+            columns=BY_DATE_COLUMNS,
+            dtype='int64',
+        )
+
+        return by_date.assign(**{column: from_cents(by_date[column]) for column in TOTAL_COLUMNS})
+
+    @property
+    def total_by_date(self) -> dict[datetime.date, float]:
+        total = BY_DATE_COLUMNS.index('total')
+        return {date: from_cents(sums[total]).item() for date, sums in self._by_date.items()}
+
+    @property
+    def total_by_name(self) -> pd.Series:
+        return self.by_name['total']
@@ -0,0 +1,85 @@
+"""On-disk cache of prepared daily reports."""
+
+import hashlib
+import os
+import pathlib
+import pickle
+
+import pandas as pd
+
+from src.constans import REPORT_CACHE_MAX_ENTRIES
+from src.report import Report
+from src.utils import CACHE_DIR_PATH
+
+
+# Bump when prepared reports change, like their layout or how data files are read, to drop older entries.
+CACHE_VERSION = 4
+
+
+class ReportCache:
+    """Keeps the validated and priced data of each report, with its validation errors.
+
+    Entries are keyed by the source file path, mtime and size together with the settings
+    that change the prepared data, so a changed source file is prepared again.
+    Least recently used entries are evicted above `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path = CACHE_DIR_PATH,
+        max_entries: int | None = REPORT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        if max_entries is not None and max_entries < 0:
+            raise ValueError('max_entries must be >= 0')
+
+        self.path: pathlib.Path = path
+        self.max_entries: int | None = max_entries
+
+    def get_key(self, report: Report) -> str:
+        stat = report.path.stat()
+        key = ':'.join(map(str, [
+            CACHE_VERSION,
+            report.path.resolve(),
+            stat.st_mtime_ns,
+            stat.st_size,
+            report.reader,
+            report.max_errors,
+            report.compact,
+        ]))
+
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get_entry_path(self, report: Report) -> pathlib.Path:
+        return self.path / f'{report.path.stem}-{self.get_key(report)}.pkl'
+
+    def load(self, report: Report) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+        entry_path = self.get_entry_path(report)
+        try:
+            with open(entry_path, 'rb') as entry:
+                data, errors = pickle.load(entry)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        os.utime(entry_path)
+        return data, errors
+
+    def save(self, report: Report) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        entry_path = self.get_entry_path(report)
+
+        for stale_entry in self.path.glob(f'{report.path.stem}-*.pkl'):
+            if stale_entry != entry_path:
+                stale_entry.unlink(missing_ok=True)
+
+        temp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as entry:
+            pickle.dump((report.data, report.errors), entry, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+
+    def evict(self) -> None:
+        if self.max_entries is None or not self.path.exists():
+            return
+
+        entries = sorted(self.path.glob('*.pkl'), key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+        for entry in entries[self.max_entries:]:
+            entry.unlink(missing_ok=True)
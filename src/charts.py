@@ -0,0 +1,136 @@
+"""Charts of the summary, rendered with the object-oriented matplotlib API."""
+
+import hashlib
+import io
+import json
+import os
+import pathlib
+import struct
+import typing
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src.constans import CHART_DPI
+
+if typing.TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+# Bump when the look of the charts changes, to drop older entries.
+CHART_VERSION = 1
+
+
+class RenderedChart(typing.NamedTuple):
+    path: pathlib.Path
+    width: int
+    height: int
+
+
+def draw_line_chart(figure: 'Figure', x: list[str], y: list[float]) -> None:
+    axes = figure.subplots()
+    axes.plot(x, y, marker='o')
+    axes.tick_params(axis='x', labelrotation=45)
+    for x_value, y_value in zip(x, y):
+        axes.text(x_value, y_value, str(y_value), ha='center', va='bottom')
+
+
+def draw_pie_chart(figure: 'Figure', sizes: list[float], labels: list[str]) -> None:
+    axes = figure.subplots()
+    axes.pie(sizes, labels=labels, autopct='%1.1f%%')
+    axes.axis('equal')
+
+
+# Kind of a chart: its drawing function and figure size in inches.
+CHARTS = {
+    'line': (draw_line_chart, (8, 6)),
+    'pie': (draw_pie_chart, (10, 8)),
+}
+
+
+def render_chart(path: pathlib.Path, chart: tuple) -> RenderedChart:
+    """Render a (kind, *series) chart next to `path`, its size in pixels is read from the rendered PNG."""
+    # Matplotlib takes long to import, it is only loaded when a chart is not in the cache.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    kind, *series = chart
+    draw, figsize = CHARTS[kind]
+    # Figures created without pyplot are not kept by its global state and are freed with the last reference.
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    draw(figure, *series)
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=CHART_DPI, bbox_inches='tight', transparent=True)
+    png = buffer.getvalue()
+    # Width and height open the IHDR chunk, which follows the 8 bytes signature and the chunk header.
+    width, height = struct.unpack('>II', png[16:24])
+
+    chart_path = path.with_name(f'{path.name}-{width}x{height}.png')
+    temp_path = chart_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(temp_path, 'wb') as chart_file:
+        chart_file.write(png)
+    os.replace(temp_path, chart_path)
+
+    return RenderedChart(chart_path, width, height)
+
+
+class ChartRenderer:
+    """Renders charts, concurrently with more than one worker, and keeps them in `path`.
+
+    Charts are keyed by their kind and input series, so unchanged charts are not rendered again.
+    The size of each chart is a part of its file name.
+    """
+
+    def __init__(self, path: pathlib.Path, workers: int = 1) -> None:
+        if workers < 1:
+            raise ValueError('workers must be >= 1')
+
+        self.path: pathlib.Path = path
+        self.workers: int = workers
+
+    @staticmethod
+    def get_key(kind: str, *series: list) -> str:
+        key = json.dumps([CHART_VERSION, CHART_DPI, kind, *series])
+
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get_entry_path(self, chart: tuple) -> pathlib.Path:
+        """Path of a chart without its size suffix."""
+        kind, *series = chart
+
+        return self.path / f'{kind}-{self.get_key(kind, *series)}'
+
+    def load(self, chart: tuple) -> RenderedChart | None:
+        entry_path = self.get_entry_path(chart)
+        for chart_path in self.path.glob(f'{entry_path.name}-*x*.png'):
+            width, height = map(int, chart_path.stem.rsplit('-', 1)[1].split('x'))
+            return RenderedChart(chart_path, width, height)
+
+        return None
+
+    def render(self, charts: list[tuple]) -> list[RenderedChart]:
+        """Render the (kind, *series) charts, in their order, reusing the ones already rendered."""
+        os.makedirs(self.path, exist_ok=True)
+        rendered = [self.load(chart) for chart in charts]
+        missing = [chart for chart, rendered_chart in zip(charts, rendered) if rendered_chart is None]
+
+        paths = [self.get_entry_path(chart) for chart in missing]
+        if self.workers > 1 and len(missing) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                new_charts = iter(list(executor.map(render_chart, paths, missing)))
+        else:
+            new_charts = iter([render_chart(path, chart) for path, chart in zip(paths, missing)])
+
+        rendered = [chart if chart is not None else next(new_charts) for chart in rendered]
+        self.remove_stale(rendered)
+
+        return rendered
+
+    def remove_stale(self, charts: list[RenderedChart]) -> None:
+        """Remove older charts of the same kinds as `charts`."""
+        paths = {chart.path for chart in charts}
+        for kind in {chart.path.name.split('-', 1)[0] for chart in charts}:
+            for chart_path in self.path.glob(f'{kind}-*.png'):
+                if chart_path not in paths:
+                    chart_path.unlink(missing_ok=True)
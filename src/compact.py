@@ -0,0 +1,42 @@
+"""Compact in-memory representation of the orders."""
+
+import numpy as np
+import pandas as pd
+
+
+# Integer columns narrowed to int32 when all of their values fit.
+COMPACT_INT_COLUMNS = ['id', 'quantity']
+
+
+def compact_orders(data: pd.DataFrame) -> pd.DataFrame:
+    """Dictionary encode the product names and narrow the integer columns.
+
+    Prices are left as they are, so totals do not change.
+    """
+    data = data.copy()
+    if 'name' in data:
+        data['name'] = data['name'].astype('category')
+
+    int32 = np.iinfo(np.int32)
+    for column in COMPACT_INT_COLUMNS:
+        if column not in data or not pd.api.types.is_integer_dtype(data[column]):
+            continue
+        values = data[column]
+        if values.empty or (values.min() >= int32.min and values.max() <= int32.max):
+            data[column] = values.astype('int32')
+
+    return data
+
+
+def concat_orders(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate the orders of reports, product names stay categorical when they are in every report.
+
+    pandas falls back to object names when the categories of the frames differ,
+    so the frames are given the union of their categories first.
+    """
+    names = [frame['name'] for frame in frames if 'name' in frame]
+    if names and all(isinstance(name.dtype, pd.CategoricalDtype) for name in names):
+        dtype = pd.CategoricalDtype(pd.api.types.union_categoricals(names, sort_categories=True).categories)
+        frames = [frame.astype({'name': dtype}) for frame in frames]
+
+    return pd.concat(frames, ignore_index=True)
@@ -2,6 +2,8 @@
 
 import pydantic
 
+from src.constans import MAX_PRICE, MAX_QUANTITY
+
 
 class OrderConfig(pydantic.BaseModel):
     id: pydantic.PositiveInt = pydantic.Field(
@@ -14,7 +16,10 @@ class OrderConfig(pydantic.BaseModel):
     )
     price: pydantic.PositiveFloat = pydantic.Field(
         description='Product price (net)',
+        le=MAX_PRICE,
+        allow_inf_nan=False,
     )
     quantity: pydantic.PositiveInt = pydantic.Field(
         description='Product quantity',
+        le=MAX_QUANTITY,
     )
@@ -1,27 +1,51 @@
 """Project constants."""
 
-from reportlab.lib import colors
-
 
 XLSX_FILE_NAME_PATTERN = r'\d{4}_\d{2}_\d{2}\.xlsx'
 DATE_FORMAT = '%Y_%m_%d'
 DATA_DIR_NAME = 'data'
+# Reader of the daily xlsx reports, one of src.readers.READERS.
+XLSX_READER = 'pandas'
+# Writer of the daily xlsx reports, one of src.writers.WRITERS.
+XLSX_WRITER = 'xml'
 TAX_RATE = .23
+TAX_RATE_COL_NAME = 'TAX_RATE'
+# Largest net price, quantity and total price of an order, so money in cents fits int64 and float64 exactly.
+MAX_PRICE = 1_000_000_000
+MAX_QUANTITY = 1_000_000_000
+MAX_TOTAL = 10 ** 13
+# Max number of validation errors kept per report, None keeps all of them.
+MAX_VALIDATION_ERRORS = None
 TABLE_STYLE = [
-    ('BACKGROUND', (0, 0), (-1, 0), colors.black),
-    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('BACKGROUND', (0, 0), (-1, 0), 'black'),
+    ('TEXTCOLOR', (0, 0), (-1, 0), 'whitesmoke'),
     ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
     ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
     ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-    ('BACKGROUND', (0, 1), (-1, -1), colors.whitesmoke),
-    ('GRID', (0, 0), (-1, -1), 1, colors.white)
+    ('BACKGROUND', (0, 1), (-1, -1), 'whitesmoke'),
+    ('GRID', (0, 0), (-1, -1), 1, 'white')
 ]
 TOTAL_TABLE_STYLE = [
-    ('BACKGROUND', (0, 0), (0, -1), colors.black),
-    ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+    ('BACKGROUND', (0, 0), (0, -1), 'black'),
+    ('TEXTCOLOR', (0, 0), (0, -1), 'whitesmoke'),
     ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
     ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-    ('BACKGROUND', (1, 0), (-1, -1), colors.whitesmoke),
-    ('GRID', (0, 0), (-1, -1), 1, colors.white)
+    ('BACKGROUND', (1, 0), (-1, -1), 'whitesmoke'),
+    ('GRID', (0, 0), (-1, -1), 1, 'white')
 ]
+# Orders table of the summary: full, top (products), daily or off.
+SUMMARY_DETAIL_MODES = ['full', 'top', 'daily', 'off']
+SUMMARY_DETAIL = 'full'
+SUMMARY_DETAIL_TOP_N = 20
+# Products in the pie chart of the summary and in the most often purchased of a daily report,
+# the rest of them is summed as Other. None keeps all of them.
+PIE_CHART_TOP_N = 10
+MOST_PURCHASED_TOP_N = 50
+# Rows of each table the full orders table is split into.
+SUMMARY_TABLE_CHUNK_ROWS = 1000
+# Resolution of the summary charts, they are scaled down to 20% in the PDF.
+CHART_DPI = 300
 TEMP_DIR_NAME = 'temp'
+CACHE_DIR_NAME = 'cache'
+# Max number of prepared reports kept in the cache, None keeps all of them.
+REPORT_CACHE_MAX_ENTRIES = 3660
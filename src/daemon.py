@@ -0,0 +1,178 @@
+"""Long-running daemon which keeps the summary up to date with the data files.
+
+The prepared reports stay in memory between the runs, so each run only reads the data files
+which were added or changed since the previous one. The data directory is checked every second
+by default, a data file is processed once it is completely written.
+"""
+
+import argparse
+import os
+import pathlib
+import time
+import traceback
+
+from datetime import datetime
+
+import schedule
+
+import src.utils as utils
+
+from src.cache import ReportCache
+from src.constans import SUMMARY_DETAIL_TOP_N, XLSX_READER, XLSX_WRITER
+from src.main import check_pipeline_args, get_pipeline_parser
+from src.manifest import Manifest
+from src.report import Report
+from src.summary import Summary
+from src.watcher import WATCHER_SETTLE_SECONDS, DataWatcher
+
+
+DAEMON_INTERVAL = 1
+
+
+class Daemon:
+    def __init__(
+        self,
+        path: pathlib.Path = utils.DATA_DIR_PATH,
+        workers: int = 1,
+        reader: str = XLSX_READER,
+        writer: str = XLSX_WRITER,
+        compact: bool = False,
+        cache: ReportCache | None = None,
+        detail: str | None = None,
+        detail_top_n: int = SUMMARY_DETAIL_TOP_N,
+        read_ahead: int = 0,
+        manifest: Manifest | None = None,
+        settle: float = WATCHER_SETTLE_SECONDS,
+    ) -> None:
+        self.path: pathlib.Path = path
+        self.workers: int = workers
+        self.reader: str = reader
+        self.writer: str = writer
+        self.compact: bool = compact
+        self.cache: ReportCache | None = cache
+        self.detail: str | None = detail
+        self.detail_top_n: int = detail_top_n
+        self.read_ahead: int = read_ahead
+        self.manifest: Manifest = manifest if manifest is not None else Manifest.load()
+        self.watcher: DataWatcher = DataWatcher(path, settle=settle)
+        # Prepared reports and the state of their data files when prepared, by the path of the data file.
+        self.reports: dict[pathlib.Path, Report] = {}
+        self.states: dict[pathlib.Path, tuple[int, int]] = {}
+        self.summary: Summary | None = None
+
+    def run(self) -> bool:
+        """Process the complete data files changed since the previous run and generate the summary again.
+
+        Returns whether the summary was generated, it is not when nothing changed.
+        """
+        self.watcher.poll()
+        states = dict(self.watcher.states)
+        summary_exists = self.summary is not None and self.summary.path.exists()
+        if states == self.states and (summary_exists or not states):
+            return False
+
+        for path in list(self.reports):
+            if self.states.get(path) != states.get(path):
+                del self.reports[path]
+        for path in states.keys() - self.reports.keys():
+            self.reports[path] = Report(
+                path=path,
+                date=utils.get_file_date(path),
+                reader=self.reader,
+                writer=self.writer,
+                compact=self.compact,
+            )
+        self.manifest.remove_stale(list(self.reports.values()))
+
+        if not self.reports:
+            self.summary = None
+            self.states = states
+            self.manifest.save()
+            return False
+
+        os.makedirs(utils.TEMP_DIR_PATH, exist_ok=True)
+        self.summary = Summary(
+            reports=list(self.reports.values()),
+            workers=self.workers,
+            cache=self.cache,
+            manifest=self.manifest,
+            detail=self.detail,
+            detail_top_n=self.detail_top_n,
+            read_ahead=self.read_ahead,
+        )
+        self.summary.save()
+        self.manifest.save()
+        # Reports prepared by worker processes are copies of the ones passed to the summary.
+        self.reports = {report.path: report for report in self.summary.reports}
+        # Kept only once processed, so the data files of a failed run are processed again by the next one.
+        self.states = states
+
+        return True
+
+    def run_safely(self) -> None:
+        """Run the daemon without stopping it on errors, the run is retried by the next job."""
+        try:
+            if self.run():
+                print(
+                    f'{datetime.now():%Y-%m-%d %H:%M:%S} Summary generated from {len(self.reports)} reports'
+                )
+        except Exception:
+            traceback.print_exc()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Keep the daily reports and their summary up to date with the data files.',
+        parents=[get_pipeline_parser()],
+    )
+    parser.add_argument(
+        '--every',
+        type=int,
+        default=DAEMON_INTERVAL,
+        help=f'Seconds between the checks of the data files (default: {DAEMON_INTERVAL})',
+    )
+    parser.add_argument(
+        '--settle',
+        type=float,
+        default=WATCHER_SETTLE_SECONDS,
+        help=(
+            'Seconds a data file has to be left unmodified before it is processed, '
+            f'so files still being written are skipped (default: {WATCHER_SETTLE_SECONDS})'
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    check_pipeline_args(parser, args)
+    if args.every < 1:
+        parser.error('--every must be >= 1')
+    if args.settle < 0:
+        parser.error('--settle must be >= 0')
+
+    return args
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    daemon = Daemon(
+        workers=args.workers,
+        reader=args.reader,
+        writer=args.writer,
+        compact=args.compact,
+        cache=ReportCache() if args.cache else None,
+        detail=args.detail,
+        detail_top_n=args.detail_top,
+        read_ahead=args.read_ahead,
+        settle=args.settle,
+    )
+    scheduler = schedule.Scheduler()
+    scheduler.every(args.every).seconds.do(daemon.run_safely)
+
+    daemon.run_safely()
+    try:
+        while True:
+            scheduler.run_pending()
+            time.sleep(max(scheduler.idle_seconds or 0, 0))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Local SQLite database of the validated orders and the validation errors, for queries across many days."""
+
+import datetime
+import itertools
+import os
+import pathlib
+import sqlite3
+import typing
+
+import pandas as pd
+
+from src.report import Report
+from src.utils import DATABASE_PATH
+
+
+# Rows inserted by a single executemany, so the rows of a large report are not all converted at once.
+DATABASE_BATCH_ROWS = 50_000
+ORDER_COLUMNS = ['date', 'id', 'name', 'price', 'quantity', 'tax', 'gross', 'total']
+ERROR_COLUMNS = ['date', 'row', 'col', 'msg']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS orders (
+    date TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    tax REAL NOT NULL,
+    gross INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_date ON orders (date);
+CREATE INDEX IF NOT EXISTS orders_name_date ON orders (name, date);
+CREATE TABLE IF NOT EXISTS errors (
+    date TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    col TEXT NOT NULL,
+    msg TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS errors_date ON errors (date);
+'''
+
+
+def get_order_batches(report: Report) -> typing.Iterator[list[tuple]]:
+    """Priced orders of a report, in batches of `DATABASE_BATCH_ROWS` rows."""
+    data = report.data
+    date = str(report.date)
+    for start in range(0, len(data), DATABASE_BATCH_ROWS):
+        batch = data.iloc[start:start + DATABASE_BATCH_ROWS]
+        yield list(zip(
+            itertools.repeat(date),
+            batch['id'].tolist(),
+            batch['name'].tolist(),
+            batch['price'].tolist(),
+            batch['quantity'].tolist(),
+            batch['TAX'].tolist(),
+            batch['gross'].tolist(),
+            batch['total'].tolist(),
+        ))
+
+def get_error_rows(report: Report) -> typing.Iterator[tuple]:
+    """Validation errors of a report, by the row of the data file they are in."""
+    date = str(report.date)
+    for row, col, msg in report.errors[['index', 'col', 'msg']].itertuples(index=False, name=None):
+        yield date, int(row), str(col), str(msg)
+
+
+class OrderDatabase:
+    """Keeps the priced orders and the validation errors of every day, money in cents.
+
+    A single connection is kept open for all of the reports. The rows of a date are
+    replaced in one transaction whenever its report is processed again.
+    """
+
+    def __init__(self, path: pathlib.Path = DATABASE_PATH) -> None:
+        self.path: pathlib.Path = path
+        os.makedirs(path.parent, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        # Readers, like BI tools, do not block the writes of the reports.
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, report: Report) -> None:
+        """Replace the orders and the validation errors of the date of a prepared report."""
+        with self.connection:
+            self._delete([report.date])
+            for batch in get_order_batches(report):
+                self.connection.executemany(
+                    f'INSERT INTO orders VALUES ({", ".join("?" * len(ORDER_COLUMNS))})',
+                    batch,
+                )
+            if not report.errors.empty:
+                self.connection.executemany(
+                    f'INSERT INTO errors VALUES ({", ".join("?" * len(ERROR_COLUMNS))})',
+                    get_error_rows(report),
+                )
+
+    def remove(self, dates: list[datetime.date]) -> None:
+        with self.connection:
+            self._delete(dates)
+
+    def has_date(self, date: datetime.date) -> bool:
+        """Whether the date has orders or validation errors."""
+        return self.connection.execute(
+            'SELECT 1 FROM orders WHERE date = ? UNION ALL SELECT 1 FROM errors WHERE date = ? LIMIT 1',
+            (str(date), str(date)),
+        ).fetchone() is not None
+
+    def _delete(self, dates: list[datetime.date]) -> None:
+        params = [(str(date),) for date in dates]
+        self.connection.executemany('DELETE FROM orders WHERE date = ?', params)
+        self.connection.executemany('DELETE FROM errors WHERE date = ?', params)
+
+    def get_dates(self) -> list[datetime.date]:
+        """Dates with orders or validation errors."""
+        return [
+            datetime.date.fromisoformat(date)
+            for date, in self.connection.execute(
+                'SELECT date FROM orders UNION SELECT date FROM errors ORDER BY date'
+            )
+        ]
+
+    def query(self, sql: str, params: typing.Sequence = ()) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.connection, params=params)
@@ -0,0 +1,79 @@
+"""Reportlab flowables."""
+
+import typing
+
+from reportlab.platypus import Flowable, Table
+
+
+class LazyFlowable(Flowable):
+    """Creates the wrapped flowable only when the document lays it out.
+
+    Build drops flowables once they are drawn, so large content is held in memory one part at a time.
+    """
+
+    def __init__(self, factory: typing.Callable[[], Flowable]) -> None:
+        super().__init__()
+        self._factory: typing.Callable[[], Flowable] = factory
+        self._flowable: Flowable | None = None
+
+    @property
+    def flowable(self) -> Flowable:
+        if self._flowable is None:
+            self._flowable = self._factory()
+
+        return self._flowable
+
+    def __repr__(self) -> str:
+        return repr(self.flowable)
+
+    def wrap(self, availWidth: float, availHeight: float) -> tuple[float, float]:
+        return self.flowable.wrap(availWidth, availHeight)
+
+    def split(self, availWidth: float, availHeight: float) -> list[Flowable]:
+        return self.flowable.split(availWidth, availHeight)
+
+    def drawOn(self, canvas, x: float, y: float, _sW: float = 0) -> None:
+        self.flowable.drawOn(canvas, x, y, _sW)
+
+    def getSpaceBefore(self) -> float:
+        return self.flowable.getSpaceBefore()
+
+    def getSpaceAfter(self) -> float:
+        return self.flowable.getSpaceAfter()
+
+
+class LazyTableChunk(LazyFlowable):
+    """Rows `start` to `stop` of a long table, created only when the document lays them out.
+
+    A chunk starts with the header row of the table only when it is the first one or at the top
+    of a frame, so the header is repeated on every page but not between the chunks of a page.
+    """
+
+    def __init__(self, factory: typing.Callable[[int, int, bool], Table], start: int, stop: int) -> None:
+        super().__init__(lambda: factory(start, stop, self.header))
+        self.table_factory: typing.Callable[[int, int, bool], Table] = factory
+        self.start: int = start
+        self.stop: int = stop
+        self.header: bool = start == 0
+
+    def _set_header(self) -> None:
+        # Frames set themselves on the flowables they lay out.
+        frame = getattr(self, '_frame', None)
+        header = self.start == 0 or bool(frame is not None and frame._atTop)
+        if header != self.header:
+            self.header = header
+            self._flowable = None
+
+    def wrap(self, availWidth: float, availHeight: float) -> tuple[float, float]:
+        self._set_header()
+        return super().wrap(availWidth, availHeight)
+
+    def split(self, availWidth: float, availHeight: float) -> list[Flowable]:
+        self._set_header()
+        parts = super().split(availWidth, availHeight)
+        if len(parts) < 2:
+            return parts
+
+        # The rest of the rows are continued by a chunk with the header, at the top of the next frame.
+        rows_count = parts[0]._nrows - self.header
+        return [parts[0], LazyTableChunk(self.table_factory, self.start + rows_count, self.stop)]
@@ -1,47 +1,353 @@
-"""Main script file."""
+"""Main script file.
 
+Each entry point imports the modules of its pipeline when it runs, so `dummy` does not load
+the report and summary modules, with pydantic and reportlab.
+"""
+
+import argparse
 import os
+import pathlib
 import shutil
 
-from datetime import datetime
+from datetime import date
 
 import src.utils as utils
 
-from src.constans import DATE_FORMAT, XLSX_FILE_NAME_PATTERN
-from src.report import Report
-from src.summary import Summary
+from src.constans import (
+    SUMMARY_DETAIL,
+    SUMMARY_DETAIL_MODES,
+    SUMMARY_DETAIL_TOP_N,
+    XLSX_FILE_NAME_PATTERN,
+    XLSX_READER,
+    XLSX_WRITER,
+)
+from src.profiling import PROFILER
 
 
-def generate_fake_data():
-    fake_data_report, fake_data_path = utils.generate_fake_data(10)
-    fake_data_report.to_excel(fake_data_path , index=False, header=True)
+def parse_fake_data_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate daily reports of fake orders.')
+    parser.add_argument('--rows', type=int, default=10, help='Orders of each day (default: 10)')
+    parser.add_argument(
+        '--days',
+        type=int,
+        help='Number of consecutive days until --end, one random date when not given',
+    )
+    parser.add_argument(
+        '--end',
+        type=date.fromisoformat,
+        help='Last day of --days, as YYYY-MM-DD (default: today)',
+    )
+    parser.add_argument('--seed', type=int, help='Seed of the random orders')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of processes writing the days of --days (default: 1)',
+    )
+    args = parser.parse_args(argv)
 
-def main():
-    os.makedirs(utils.TEMP_DIR_PATH, exist_ok=True)
-    for report_xlsx in utils.dir_files(
-            path=utils.PROJECT_ROOT_PATH / 'reports',
-            pattern=XLSX_FILE_NAME_PATTERN.replace('.xlsx', '_report.xlsx')
-    ):
-        os.remove(report_xlsx)
-
-    for report_xlsx in utils.dir_files(
-            path=utils.VALIDATION_ERRORS_DIR_PATH,
-            pattern=XLSX_FILE_NAME_PATTERN.replace('.xlsx', '_errors.json')
-    ):
-            os.remove(report_xlsx)
-
-    reports = [
-        Report(
-            path=report,
-            date=datetime.strptime(report.stem, DATE_FORMAT).date(),
+    if args.rows < 0:
+        parser.error('--rows must be >= 0')
+    if args.days is not None and args.days < 1:
+        parser.error('--days must be >= 1')
+    if args.days is None and args.end is not None:
+        parser.error('--end can only be used with --days')
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+
+    return args
+
+def generate_fake_data(argv: list[str] | None = None):
+    from src.writers import write_frame
+
+    args = parse_fake_data_args(argv)
+
+    if args.days is None:
+        fake_data_report, fake_data_path = utils.generate_fake_data(10, rows=args.rows, seed=args.seed)
+        write_frame(fake_data_path, fake_data_report)
+    else:
+        utils.generate_fake_days(
+            args.days, args.rows, end_date=args.end, seed=args.seed, workers=args.workers
         )
-        for report in utils.dir_files(path=utils.PROJECT_ROOT_PATH / 'data', pattern=XLSX_FILE_NAME_PATTERN)
-    ]
+
+def get_pipeline_parser() -> argparse.ArgumentParser:
+    """Options of the report pipeline, shared by the `generate` and `daemon` entry points."""
+    from src.readers import READERS
+    from src.writers import WRITERS
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of processes preparing the daily reports (default: 1)',
+    )
+    parser.add_argument(
+        '--read-ahead',
+        type=int,
+        default=0,
+        help=(
+            'Number of daily reports read and written by threads while another one is validated, '
+            'only with a single worker (default: 0, one report at a time)'
+        ),
+    )
+    parser.add_argument(
+        '--reader',
+        choices=READERS,
+        default=XLSX_READER,
+        help=f'Reader of the daily xlsx files (default: {XLSX_READER})',
+    )
+    parser.add_argument(
+        '--writer',
+        choices=WRITERS,
+        default=XLSX_WRITER,
+        help=f'Writer of the daily xlsx reports (default: {XLSX_WRITER})',
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Keep the orders in memory with categorical product names and 32-bit ids and quantities',
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f'Reuse prepared reports of unchanged data files, kept in {utils.CACHE_DIR_PATH}',
+    )
+    parser.add_argument(
+        '--detail',
+        choices=SUMMARY_DETAIL_MODES,
+        help=(
+            'Detail of the summary: every order (full), the top products (top), totals by a date (daily) '
+            f'or none (off) (default: {SUMMARY_DETAIL}, off with --streaming)'
+        ),
+    )
+    parser.add_argument(
+        '--detail-top',
+        type=int,
+        default=SUMMARY_DETAIL_TOP_N,
+        help=f'Number of products listed by --detail top (default: {SUMMARY_DETAIL_TOP_N})',
+    )
+
+    return parser
+
+def check_pipeline_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.detail_top < 1:
+        parser.error('--detail-top must be >= 1')
+    if args.read_ahead < 0:
+        parser.error('--read-ahead must be >= 0')
+    if args.read_ahead and args.workers > 1:
+        parser.error('--read-ahead can not be used with --workers')
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Generate daily reports and their summary.',
+        parents=[get_pipeline_parser()],
+    )
+    parser.add_argument(
+        '--from',
+        dest='from_date',
+        type=date.fromisoformat,
+        help='First date of the data files to process, as YYYY-MM-DD (default: the first data file)',
+    )
+    parser.add_argument(
+        '--to',
+        dest='to_date',
+        type=date.fromisoformat,
+        help='Last date of the data files to process, as YYYY-MM-DD (default: the last data file)',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Keep the outputs of unchanged data files and only generate the missing ones, implies --cache',
+    )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Keep only running totals in memory, the summary is generated without the orders table',
+    )
+    parser.add_argument(
+        '--rollups',
+        action='store_true',
+        help=f'Keep the daily totals of each product in {utils.ROLLUPS_PATH}, for the summarize entry point',
+    )
+    parser.add_argument(
+        '--database',
+        action='store_true',
+        help=(
+            f'Keep the priced orders and the validation errors of every day in {utils.DATABASE_PATH}, '
+            'for SQL queries. Runs without --incremental rewrite all of the days in range'
+        ),
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print the wall time, CPU time, peak memory and rows of each stage',
+    )
+    parser.add_argument(
+        '--trace',
+        type=pathlib.Path,
+        help=(
+            'Write the stages of each report to a JSON trace for chrome://tracing or Perfetto, '
+            'implies --profile'
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    check_pipeline_args(parser, args)
+    if args.from_date and args.to_date and args.from_date > args.to_date:
+        parser.error('--from must not be after --to')
+    if args.streaming and args.detail == 'full':
+        parser.error('--detail full can not be used with --streaming')
+
+    return args
+
+def parse_summarize_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate the summary of a range of dates from the rollups.')
+    parser.add_argument(
+        '--from',
+        dest='from_date',
+        type=date.fromisoformat,
+        help='First date of the summary, as YYYY-MM-DD (default: the first date of the rollups)',
+    )
+    parser.add_argument(
+        '--to',
+        dest='to_date',
+        type=date.fromisoformat,
+        help='Last date of the summary, as YYYY-MM-DD (default: the last date of the rollups)',
+    )
+    parser.add_argument(
+        '--detail',
+        choices=[mode for mode in SUMMARY_DETAIL_MODES if mode != 'full'],
+        default='off',
+        help='Detail of the summary, the rollups do not keep the orders (default: off)',
+    )
+    parser.add_argument(
+        '--detail-top',
+        type=int,
+        default=SUMMARY_DETAIL_TOP_N,
+        help=f'Number of products listed by --detail top (default: {SUMMARY_DETAIL_TOP_N})',
+    )
+    args = parser.parse_args(argv)
+
+    if args.detail_top < 1:
+        parser.error('--detail-top must be >= 1')
+    if args.from_date and args.to_date and args.from_date > args.to_date:
+        parser.error('--from must not be after --to')
+
+    return args
+
+def summarize(argv: list[str] | None = None):
+    from src.rollups import RollupStore
+    from src.summary import Summary
+
+    args = parse_summarize_args(argv)
+    if not utils.ROLLUPS_PATH.exists():
+        raise Exception("No rollups found, generate the reports with --rollups first")
+
+    rollups = RollupStore()
+    try:
+        summary = Summary.from_rollups(
+            rollups,
+            start=args.from_date,
+            end=args.to_date,
+            detail=args.detail,
+            detail_top_n=args.detail_top,
+        )
+    finally:
+        rollups.close()
+
+    os.makedirs(utils.TEMP_DIR_PATH, exist_ok=True)
+    summary.save()
+    shutil.rmtree(utils.TEMP_DIR_PATH)
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    PROFILER.enabled = args.profile or args.trace is not None
+
+    with PROFILER.stage('generate'):
+        generate(args)
+
+    if PROFILER.enabled:
+        print(PROFILER.get_table())
+    if args.trace is not None:
+        PROFILER.save_trace(args.trace)
+
+def generate(args: argparse.Namespace):
+    from src.cache import ReportCache
+    from src.database import OrderDatabase
+    from src.manifest import Manifest
+    from src.report import Report
+    from src.rollups import RollupStore
+    from src.summary import Summary
+
+    os.makedirs(utils.TEMP_DIR_PATH, exist_ok=True)
+    with PROFILER.stage('scan') as stage:
+        reports = [
+            Report(
+                path=report,
+                date=utils.get_file_date(report),
+                reader=args.reader,
+                writer=args.writer,
+                compact=args.compact,
+            )
+            for report in utils.scan_data_files(start=args.from_date, end=args.to_date)
+        ]
+        stage.rows = len(reports)
+
+    # Outputs of the dates outside of --from and --to are kept.
+    manifest = Manifest.load()
+    if args.incremental:
+        manifest.remove_stale(reports, start=args.from_date, end=args.to_date)
+        manifest.save()
+    else:
+        manifest.remove_stale([], start=args.from_date, end=args.to_date)
+        for report_xlsx in utils.dir_files(
+                path=utils.REPORTS_DIR_PATH,
+                pattern=XLSX_FILE_NAME_PATTERN.replace('.xlsx', '_report.xlsx')
+        ):
+            if utils.in_date_range(utils.get_file_date(report_xlsx), start=args.from_date, end=args.to_date):
+                os.remove(report_xlsx)
+
+        for report_xlsx in utils.dir_files(
+                path=utils.VALIDATION_ERRORS_DIR_PATH,
+                pattern=XLSX_FILE_NAME_PATTERN.replace('.xlsx', '_errors.json')
+        ):
+            if utils.in_date_range(utils.get_file_date(report_xlsx), start=args.from_date, end=args.to_date):
+                os.remove(report_xlsx)
+
     if not reports:
         raise Exception("No reports found")
 
-    summary = Summary(reports=reports)
-    summary.save()
+    rollups = RollupStore() if args.rollups else None
+    database = OrderDatabase() if args.database else None
+
+    summary = Summary(
+        reports=reports,
+        workers=args.workers,
+        cache=ReportCache() if args.cache or args.incremental else None,
+        manifest=manifest,
+        streaming=args.streaming,
+        detail=args.detail,
+        detail_top_n=args.detail_top,
+        read_ahead=args.read_ahead,
+        rollups=rollups,
+        database=database,
+    )
+    with PROFILER.stage('summary'):
+        summary.save()
+    manifest.save()
+    # Dates of deleted data files.
+    for store in [rollups, database]:
+        if store is None:
+            continue
+        stored_dates = {
+            day for day in store.get_dates()
+            if utils.in_date_range(day, start=args.from_date, end=args.to_date)
+        }
+        store.remove(sorted(stored_dates - {report.date for report in reports}))
+        store.close()
 
     shutil.rmtree(utils.TEMP_DIR_PATH)
 
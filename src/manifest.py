@@ -0,0 +1,108 @@
+"""Manifest of processed data files, used by incremental runs."""
+
+import datetime
+import json
+import os
+import pathlib
+
+from src.report import Report
+from src.utils import MANIFEST_PATH, get_file_date, in_date_range
+
+
+class Manifest:
+    """Maps each processed data file to its state and to the outputs generated from it.
+
+    A report is fresh when its data file and settings did not change since it was processed
+    and all of its outputs still exist, so its outputs do not need to be generated again.
+    The sinks, like the database, a report was saved to are kept until its data file changes.
+    """
+
+    def __init__(self, path: pathlib.Path = MANIFEST_PATH, entries: dict[str, dict] | None = None) -> None:
+        self.path: pathlib.Path = path
+        self.entries: dict[str, dict] = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path: pathlib.Path = MANIFEST_PATH) -> 'Manifest':
+        try:
+            with open(path) as manifest:
+                return cls(path=path, entries=json.load(manifest))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path=path)
+
+    def save(self) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w') as manifest:
+            json.dump(self.entries, manifest, indent=4, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def get_key(report: Report) -> str:
+        return str(report.path.resolve())
+
+    @staticmethod
+    def get_state(report: Report) -> dict:
+        stat = report.path.stat()
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'reader': report.reader,
+            'writer': report.writer,
+            'max_errors': report.max_errors,
+        }
+
+    def is_fresh(self, report: Report) -> bool:
+        entry = self.entries.get(self.get_key(report))
+
+        return (
+            entry is not None
+            and entry['state'] == self.get_state(report)
+            and all(pathlib.Path(output).exists() for output in entry['outputs'])
+        )
+
+    def get_sinks(self, report: Report) -> set[str]:
+        """Sinks the report was saved to since its data file and settings last changed."""
+        entry = self.entries.get(self.get_key(report))
+        if entry is None or entry['state'] != self.get_state(report):
+            return set()
+
+        return set(entry.get('sinks', []))
+
+    def update(self, report: Report, sinks: list[str] | None = None) -> None:
+        outputs = [report.output_path]
+        if not report.errors.empty:
+            outputs.append(report.errors_path)
+
+        self.entries[self.get_key(report)] = {
+            'state': self.get_state(report),
+            'outputs': [str(output) for output in outputs],
+            'sinks': sorted(self.get_sinks(report) | set(sinks or [])),
+        }
+
+    def remove_stale(
+        self,
+        reports: list[Report],
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[pathlib.Path]:
+        """Forget deleted or changed data files and remove their outputs.
+
+        Only the data files of the dates between `start` and `end` are considered, the others are kept.
+        """
+        reports_by_key = {self.get_key(report): report for report in reports}
+        removed = []
+
+        for key, entry in list(self.entries.items()):
+            if not in_date_range(get_file_date(pathlib.Path(key)), start=start, end=end):
+                continue
+            report = reports_by_key.get(key)
+            if report is not None and entry['state'] == self.get_state(report):
+                continue
+
+            for output in map(pathlib.Path, entry['outputs']):
+                if output.exists():
+                    output.unlink()
+                    removed.append(output)
+            del self.entries[key]
+
+        return removed
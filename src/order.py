@@ -2,17 +2,22 @@
 
 from src.configs import OrderConfig
 from src.constans import TAX_RATE
+from src.pricing import calculate_gross_price, calculate_total_price
 
 
 class Order:
+    __slots__ = ('data', 'tax_rate')
+
     def __init__(
         self,
         data: OrderConfig,
+        tax_rate: float = TAX_RATE,
     ):
         self.data: OrderConfig = data
+        self.tax_rate: float = tax_rate
 
     def calculate_gross_price(self) -> float:
-        return self.data.price * (1 + TAX_RATE)
+        return calculate_gross_price(self.data.price, self.tax_rate)
 
     def calculate_total_price(self) -> float:
-        return self.calculate_gross_price() * self.data.quantity
+        return calculate_total_price(self.data.price, self.data.quantity, self.tax_rate)
@@ -0,0 +1,91 @@
+"""Price calculations working on scalars and whole columns alike.
+
+Money is calculated and kept in integer cents, so sums are exact and the totals of the daily reports
+and of the summary agree to the cent. Amounts are converted back only for the outputs. Rounding rules:
+
+- amounts are rounded to whole cents and tax rates to basis points (0.01%), half up,
+  as written in decimal: 1.005 is 101 cents, though its nearest float is just below 1.005,
+  amounts of any size already in whole cents are kept as they are,
+- the gross price of a unit is rounded to whole cents, half up,
+- the total price is the gross price of a unit times the quantity, it is not rounded again.
+"""
+
+import decimal
+
+import numpy as np
+import pandas as pd
+
+from src.constans import TAX_RATE
+
+
+CENTS = 100
+BASIS_POINTS = 10_000
+# Scaled amounts within this many units in the last place of a half are rounded as written in decimal.
+# Floats of decimal amounts are within half of a unit of them and scaling adds up to another half.
+HALF_UP_ULPS = 4
+# Columns of the priced orders kept in cents.
+MONEY_COLUMNS = ['price', 'gross', 'total']
+
+
+def _round_decimal_half_up(value: float, scale: int) -> int:
+    # The shortest repr of a float is the decimal it was written as.
+    return int((decimal.Decimal(repr(float(value))) * scale + decimal.Decimal('.5')).to_integral_value(
+        rounding=decimal.ROUND_FLOOR,
+    ))
+
+
+def _round_half_up(values: float | np.ndarray, scale: int) -> np.int64 | np.ndarray:
+    values = np.asarray(values, dtype='float64')
+    scaled = values.reshape(-1) * scale
+    whole = np.floor(scaled)
+    rounded = whole.astype('int64')
+    fraction = np.subtract(scaled, whole, out=whole)
+    rounded += fraction >= .5
+    # Only amounts with a 5 right below the unit, like 1.005, are this close to a half.
+    fraction -= .5
+    near_half = np.abs(fraction, out=fraction) <= np.abs(scaled, out=scaled) * (HALF_UP_ULPS * 2 ** -52)
+    if near_half.any():
+        rounded[near_half] = [_round_decimal_half_up(value, scale) for value in values.reshape(-1)[near_half]]
+
+    return rounded.reshape(values.shape)[()]
+
+
+def to_cents(amount: float | np.ndarray) -> np.int64 | np.ndarray:
+    return _round_half_up(amount, CENTS)
+
+
+def from_cents(cents: int | np.ndarray) -> np.float64 | np.ndarray:
+    return np.divide(cents, CENTS)
+
+
+def to_basis_points(rate: float | np.ndarray) -> np.int64 | np.ndarray:
+    return _round_half_up(rate, BASIS_POINTS)
+
+
+def from_cents_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Orders with the money columns in cents converted to amounts, for the outputs."""
+    return data.assign(**{
+        column: from_cents(data[column].to_numpy()) for column in MONEY_COLUMNS if column in data
+    })
+
+
+def calculate_gross_cents(
+    price_cents: int | np.ndarray,
+    tax_rate: float | np.ndarray = TAX_RATE,
+) -> np.int64 | np.ndarray:
+    return (price_cents * (BASIS_POINTS + to_basis_points(tax_rate)) + BASIS_POINTS // 2) // BASIS_POINTS
+
+
+def calculate_gross_price(
+    price: float | np.ndarray,
+    tax_rate: float | np.ndarray = TAX_RATE,
+) -> float | np.ndarray:
+    return from_cents(calculate_gross_cents(to_cents(price), tax_rate))
+
+
+def calculate_total_price(
+    price: float | np.ndarray,
+    quantity: int | np.ndarray,
+    tax_rate: float | np.ndarray = TAX_RATE,
+) -> float | np.ndarray:
+    return from_cents(calculate_gross_cents(to_cents(price), tax_rate) * quantity)
@@ -0,0 +1,146 @@
+"""Wall time, CPU time, peak memory and row counts of the pipeline stages."""
+
+import contextlib
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import typing
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+
+def get_max_rss() -> int | None:
+    """Peak resident set size of the process in bytes."""
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class Stage:
+    def __init__(self, name: str, report: str | None = None, rows: int | None = None) -> None:
+        self.name: str = name
+        self.report: str | None = report
+        self.rows: int | None = rows
+        self.start_ns: int = 0
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.max_rss: int | None = None
+        self.pid: int = os.getpid()
+        self.tid: int = threading.get_ident()
+
+    def to_trace_event(self) -> dict:
+        args = {'cpu_s': self.cpu, 'max_rss': self.max_rss}
+        if self.report is not None:
+            args['report'] = self.report
+        if self.rows is not None:
+            args['rows'] = self.rows
+
+        return {
+            'name': self.name if self.report is None else f'{self.name} {self.report}',
+            'cat': self.name,
+            'ph': 'X',
+            'ts': self.start_ns / 1000,
+            'dur': self.wall * 1e6,
+            'pid': self.pid,
+            'tid': self.tid,
+            'args': args,
+        }
+
+
+class Profiler:
+    """Records the stages run while it is enabled, stages are not recorded otherwise.
+
+    Stages can be nested, the time of a stage includes the stages run within it.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self.stages: list[Stage] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str, report: str | None = None, rows: int | None = None) -> typing.Iterator[Stage]:
+        """Record a stage, its rows can be set on the yielded Stage once they are known."""
+        stage = Stage(name, report=report, rows=rows)
+        if not self.enabled:
+            yield stage
+            return
+
+        stage.start_ns = time.perf_counter_ns()
+        cpu_start = time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.wall = (time.perf_counter_ns() - stage.start_ns) / 1e9
+            stage.cpu = time.process_time() - cpu_start
+            stage.max_rss = get_max_rss()
+            self.stages.append(stage)
+
+    def collect(self, results: typing.Iterable[tuple[typing.Any, list[Stage]]]) -> typing.Iterator:
+        """Yield the results of `run_profiled` and record the stages they ran in another process."""
+        for result, stages in results:
+            self.stages.extend(stages)
+            yield result
+
+    def get_totals(self) -> dict[str, dict]:
+        """Calls, wall and CPU time, peak memory and rows of each stage, in the order they first ran."""
+        totals: dict[str, dict] = {}
+        for stage in self.stages:
+            total = totals.setdefault(
+                stage.name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'max_rss': None, 'rows': None}
+            )
+            total['calls'] += 1
+            total['wall'] += stage.wall
+            total['cpu'] += stage.cpu
+            if stage.max_rss is not None:
+                total['max_rss'] = max(total['max_rss'] or 0, stage.max_rss)
+            if stage.rows is not None:
+                total['rows'] = (total['rows'] or 0) + stage.rows
+
+        return totals
+
+    def get_table(self) -> str:
+        totals = self.get_totals()
+        lines = [
+            f'{"stage":<16} {"calls":>6} {"wall [s]":>10} {"cpu [s]":>10} {"peak rss [MB]":>14} {"rows":>12}'
+        ]
+        for name, total in totals.items():
+            max_rss = f'{total["max_rss"] / 2 ** 20:.1f}' if total['max_rss'] is not None else '-'
+            rows = f'{total["rows"]:,}' if total['rows'] is not None else '-'
+            lines.append(
+                f'{name:<16} {total["calls"]:>6} {total["wall"]:>10.3f} {total["cpu"]:>10.3f} '
+                f'{max_rss:>14} {rows:>12}'
+            )
+
+        return '\n'.join(lines)
+
+    def save_trace(self, path: pathlib.Path) -> None:
+        """Write the stages in the Trace Event Format, loaded by chrome://tracing and Perfetto."""
+        with open(path, 'w') as trace:
+            json.dump(
+                {
+                    'traceEvents': [stage.to_trace_event() for stage in self.stages],
+                    'displayTimeUnit': 'ms',
+                },
+                trace,
+            )
+
+
+PROFILER = Profiler()
+
+
+def run_profiled(function: typing.Callable, *args) -> tuple[typing.Any, list[Stage]]:
+    """Run `function` in a worker process with profiling enabled, for `Profiler.collect`."""
+    PROFILER.enabled = True
+    PROFILER.stages = []
+    result = function(*args)
+
+    return result, PROFILER.stages
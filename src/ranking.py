@@ -0,0 +1,48 @@
+"""Rankings of the largest values, like the best selling products, without sorting all of them."""
+
+import numpy as np
+import pandas as pd
+
+
+OTHER_LABEL = 'Other'
+
+
+def get_top_positions(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the `k` largest values, largest first, equal values in the order they are in.
+
+    The `k` largest values are selected in linear time and only they are sorted.
+    """
+    values = np.asarray(values)
+    if k < len(values):
+        threshold = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        larger = np.flatnonzero(values > threshold)
+        equal = np.flatnonzero(values == threshold)[:k - len(larger)]
+        positions = np.concatenate([larger, equal])
+    else:
+        positions = np.arange(len(values))
+
+    return positions[np.lexsort((positions, -values[positions]))]
+
+
+def get_top(values: pd.Series, k: int | None = None, other: str = OTHER_LABEL) -> pd.Series:
+    """The `k` largest values largest first, the rest summed into a single `other` value after them.
+
+    Values of the same labels from different days can be added together before ranking,
+    so a ranking over many days needs only their sums, none of the daily rankings.
+    All values are ranked when `k` is None.
+    """
+    if k is not None and k < 1:
+        raise ValueError('k must be >= 1')
+
+    k = len(values) if k is None else k
+    positions = get_top_positions(values.to_numpy(), k)
+    top = values.iloc[positions]
+    if len(positions) == len(values):
+        return top
+
+    return pd.Series(
+        [*top.tolist(), np.delete(values.to_numpy(), positions).sum()],
+        index=pd.Index([*top.index.tolist(), other], name=values.index.name),
+        name=values.name,
+        dtype=values.dtype,
+    )
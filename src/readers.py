@@ -0,0 +1,327 @@
+"""Readers of the daily xlsx reports."""
+
+import pathlib
+import posixpath
+import typing
+import zipfile
+
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+import numpy as np
+import pandas as pd
+
+from src.configs import OrderConfig
+from src.constans import TAX_RATE_COL_NAME
+
+
+READ_COLUMNS = [*OrderConfig.model_fields, TAX_RATE_COL_NAME]
+# Strings read as missing values by pandas.read_excel.
+NA_VALUES = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+    'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def read_pandas(path: pathlib.Path) -> pd.DataFrame:
+    return pd.read_excel(path, header=0)
+
+
+def _to_cell_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in NA_VALUES:
+        return None
+
+    return value
+
+
+def _to_column(values: list) -> np.ndarray:
+    if all(type(value) is int for value in values):
+        return np.array(values, dtype='int64')
+
+    if all(type(value) in (int, float) or value is None for value in values):
+        return np.array(values, dtype='float64')
+
+    return np.array([np.nan if value is None else value for value in values], dtype=object)
+
+
+class ColumnsCollector:
+    """Collects the known columns of a sheet, row by row, the first row being the header.
+
+    Like pandas.read_excel, blank rows are kept unless they trail the data.
+    """
+
+    def __init__(self) -> None:
+        self.columns: dict[int, str] | None = None
+        self.values: dict[str, list] = {}
+        self.rows_count: int = 0
+
+    def add_header(self, header: dict[int, object]) -> None:
+        self.columns = {position: name for position, name in header.items() if name in READ_COLUMNS}
+        self.values = {name: [] for name in self.columns.values()}
+
+    def add_row(self, row: dict[int, object]) -> None:
+        if self.columns is None:
+            self.add_header(row)
+            return
+
+        cells = [_to_cell_value(row.get(position)) for position in self.columns]
+        for name, cell in zip(self.values, cells):
+            self.values[name].append(cell)
+
+        if any(cell is not None for cell in cells):
+            self.rows_count = len(next(iter(self.values.values())))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            name: _to_column(column[:self.rows_count])
+            for name, column in self.values.items()
+        })
+
+
+def read_openpyxl(path: pathlib.Path) -> pd.DataFrame:
+    """Stream the first sheet with openpyxl in read-only mode, keeping only the known columns."""
+    import openpyxl
+
+    collector = ColumnsCollector()
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            if collector.columns is None:
+                collector.add_row(dict(enumerate(row)))
+            else:
+                collector.add_row({
+                    position: row[position]
+                    for position in collector.columns
+                    if position < len(row)
+                })
+    finally:
+        workbook.close()
+
+    return collector.to_frame()
+
+
+def _get_relationships(archive: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    directory, name = posixpath.split(part)
+    rels_path = posixpath.join(directory, '_rels', f'{name}.rels')
+    if rels_path not in archive.namelist():
+        return {}
+
+    relationships = {}
+    root = ElementTree.fromstring(archive.read(rels_path))
+    for relationship in root.iter(f'{PACKAGE_RELATIONSHIPS_NS}Relationship'):
+        target = relationship.get('Target')
+        if target.startswith('/'):
+            target = target.lstrip('/')
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        relationships[relationship.get('Id')] = (relationship.get('Type'), target)
+
+    return relationships
+
+
+def _get_target(relationships: dict[str, tuple[str, str]], type_name: str) -> str | None:
+    return next((target for type_, target in relationships.values() if type_.endswith(f'/{type_name}')), None)
+
+
+def _read_shared_strings(archive: zipfile.ZipFile, path: str | None) -> list[str]:
+    if path is None:
+        return []
+
+    shared_strings = []
+    with archive.open(path) as source:
+        for _, element in ElementTree.iterparse(source):
+            if element.tag == f'{SPREADSHEET_NS}si':
+                # Phonetic runs (rPh) are not part of the text.
+                texts = element.findall(f'{SPREADSHEET_NS}t') + element.findall(
+                    f'{SPREADSHEET_NS}r/{SPREADSHEET_NS}t'
+                )
+                shared_strings.append(''.join(text.text or '' for text in texts))
+                element.clear()
+
+    return shared_strings
+
+
+def _get_column_position(reference: str) -> int:
+    position = 0
+    for char in reference:
+        if char.isdigit():
+            break
+        position = position * 26 + ord(char.upper()) - ord('A') + 1
+
+    return position - 1
+
+
+def _read_date_styles(archive: zipfile.ZipFile, path: str | None) -> dict[int, bool]:
+    """Cell styles with date or time number formats, mapped to whether they format durations."""
+    if path is None:
+        return {}
+
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+    root = ElementTree.fromstring(archive.read(path))
+    formats = dict(BUILTIN_FORMATS)
+    for number_format in root.iter(f'{SPREADSHEET_NS}numFmt'):
+        formats[int(number_format.get('numFmtId'))] = number_format.get('formatCode')
+
+    date_styles = {}
+    cell_formats = root.find(f'{SPREADSHEET_NS}cellXfs')
+    for style, cell_format in enumerate(cell_formats if cell_formats is not None else []):
+        number_format = formats.get(int(cell_format.get('numFmtId', 0)))
+        if is_date_format(number_format):
+            date_styles[style] = is_timedelta_format(number_format)
+
+    return date_styles
+
+
+def _get_cell_value(cell_type: str, value: str | None, shared_strings: list[str]):
+    if value is None:
+        return None
+    if cell_type == 'n':
+        return float(value) if any(char in value for char in '.eE') else int(value)
+    if cell_type == 's':
+        return shared_strings[int(value)]
+    if cell_type == 'b':
+        return bool(int(value))
+
+    return value
+
+
+class SheetParser:
+    """Expat handlers passing the rows of a sheet XML to a ColumnsCollector."""
+
+    # Expat joins namespaces and tags with the separator only, without the opening brace.
+    CELL_TAG = f'{SPREADSHEET_NS[1:]}c'
+    ROW_TAG = f'{SPREADSHEET_NS[1:]}row'
+    TEXT_TAGS = (f'{SPREADSHEET_NS[1:]}v', f'{SPREADSHEET_NS[1:]}t')
+    PHONETIC_TAG = f'{SPREADSHEET_NS[1:]}rPh'
+
+    def __init__(
+        self,
+        collector: ColumnsCollector,
+        shared_strings: list[str],
+        date_styles: dict[int, bool] | None = None,
+        date1904: bool = False,
+    ) -> None:
+        self.collector: ColumnsCollector = collector
+        self.shared_strings: list[str] = shared_strings
+        self.date_styles: dict[int, bool] = date_styles or {}
+        self.date1904: bool = date1904
+        self.style: int = 0
+        self.row: dict[int, object] = {}
+        self.rows_count: int = 0
+        self.position: int = 0
+        self.cell_type: str | None = None
+        self.text: list[str] | None = None
+        self.phonetic: bool = False
+        self.column_positions: dict[str, int] = {}
+
+    def _get_column_position(self, reference: str) -> int:
+        letters = reference.rstrip('0123456789')
+        if letters not in self.column_positions:
+            self.column_positions[letters] = _get_column_position(letters)
+
+        return self.column_positions[letters]
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        if tag == self.CELL_TAG:
+            reference = attrs.get('r')
+            if reference:
+                self.position = self._get_column_position(reference)
+            columns = self.collector.columns
+            if columns is None or self.position in columns:
+                self.cell_type = attrs.get('t', 'n')
+                self.style = int(attrs.get('s', 0))
+            else:
+                self.cell_type = None
+        elif self.cell_type is not None and tag in self.TEXT_TAGS and self.text is None:
+            self.text = []
+        elif tag == self.ROW_TAG:
+            row_number = int(attrs.get('r', self.rows_count + 1))
+            for _ in range(self.rows_count + 1, row_number):
+                self.collector.add_row({})
+            self.rows_count = row_number
+            self.position = 0
+            self.row = {}
+        elif tag == self.PHONETIC_TAG:
+            self.phonetic = True
+
+    def characters(self, data: str) -> None:
+        # Phonetic runs are not part of the text.
+        if self.text is not None and not self.phonetic:
+            self.text.append(data)
+
+    def end(self, tag: str) -> None:
+        if tag == self.CELL_TAG:
+            if self.cell_type is not None:
+                value = ''.join(self.text) if self.text is not None else None
+                if self.cell_type == 'inlineStr':
+                    self.row[self.position] = value
+                else:
+                    self.row[self.position] = _get_cell_value(self.cell_type, value, self.shared_strings)
+                if self.cell_type == 'n' and value is not None and self.style in self.date_styles:
+                    self.row[self.position] = self._to_date(self.row[self.position])
+            self.position += 1
+            self.cell_type = None
+            self.text = None
+        elif tag == self.ROW_TAG:
+            self.collector.add_row(self.row)
+        elif tag == self.PHONETIC_TAG:
+            self.phonetic = False
+
+    def _to_date(self, value: int | float):
+        # Like openpyxl, so dates in numeric columns are rejected by the validation
+        # instead of read as numbers.
+        from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel
+
+        epoch = MAC_EPOCH if self.date1904 else WINDOWS_EPOCH
+        return from_excel(value, epoch=epoch, timedelta=self.date_styles[self.style])
+
+    def parse(self, source: typing.BinaryIO) -> None:
+        parser = expat.ParserCreate(namespace_separator='}')
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start
+        parser.CharacterDataHandler = self.characters
+        parser.EndElementHandler = self.end
+        parser.ParseFile(source)
+
+
+def read_xml(path: pathlib.Path) -> pd.DataFrame:
+    """Stream the XML of the first sheet straight from the archive, keeping only the known columns.
+
+    Like openpyxl, numbers in cells with date or time formats are read as dates, times or durations.
+    """
+    collector = ColumnsCollector()
+    with zipfile.ZipFile(path) as archive:
+        package = _get_relationships(archive, '')
+        workbook_path = _get_target(package, 'officeDocument')
+        relationships = _get_relationships(archive, workbook_path)
+        shared_strings = _read_shared_strings(
+            archive,
+            _get_target(relationships, 'sharedStrings'),
+        )
+        date_styles = _read_date_styles(
+            archive,
+            _get_target(relationships, 'styles'),
+        )
+        workbook = ElementTree.fromstring(archive.read(workbook_path))
+        properties = workbook.find(f'{SPREADSHEET_NS}workbookPr')
+        date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+        sheet = workbook.find(f'{SPREADSHEET_NS}sheets/{SPREADSHEET_NS}sheet')
+        _, sheet_path = relationships[sheet.get(f'{RELATIONSHIPS_NS}id')]
+
+        with archive.open(sheet_path) as source:
+            SheetParser(collector, shared_strings, date_styles=date_styles, date1904=date1904).parse(source)
+
+    return collector.to_frame()
+
+
+READERS = {
+    'pandas': read_pandas,
+    'openpyxl': read_openpyxl,
+    'xml': read_xml,
+}
@@ -2,14 +2,29 @@
 
 import pandas as pd
 import pathlib
+import typing
 
 from datetime import datetime
-from pydantic import ValidationError
 
+from src.compact import compact_orders
 from src.configs import OrderConfig
-from src.constans import TAX_RATE
+from src.constans import (
+    MAX_VALIDATION_ERRORS,
+    MOST_PURCHASED_TOP_N,
+    TAX_RATE,
+    TAX_RATE_COL_NAME,
+    XLSX_READER,
+    XLSX_WRITER,
+)
 from src.order import Order
-from src.utils import PROJECT_ROOT_PATH, VALIDATION_ERRORS_DIR_PATH
+from src.pricing import MONEY_COLUMNS, calculate_gross_cents, from_cents, from_cents_columns, to_cents
+from src.profiling import PROFILER
+from src.ranking import get_top
+from src.readers import READERS
+from src.utils import REPORTS_DIR_PATH, VALIDATION_ERRORS_DIR_PATH
+from src.validation import validate_orders
+from src.writers import WRITERS
+
 
 
 class Report:
@@ -17,78 +32,159 @@ class Report:
         self,
         path: pathlib.Path,
         date: datetime.date,
+        max_errors: int | None = MAX_VALIDATION_ERRORS,
+        reader: str = XLSX_READER,
+        writer: str = XLSX_WRITER,
+        compact: bool = False,
     ):
+        if reader not in READERS:
+            raise ValueError(f'reader must be one of: {", ".join(READERS)}')
+        if writer not in WRITERS:
+            raise ValueError(f'writer must be one of: {", ".join(WRITERS)}')
+
         self.path = path
         self.date: datetime.date = date
-        self.orders: list[Order] = []
-        self.data: pd.DataFrame = pd.read_excel(self.path, header=0)
-
-    def set_orders(self) -> None:
-        rows_to_drop = []
-        errors = pd.DataFrame(columns=['index', 'col', 'msg'])
-
-        for index, order in self.data.iterrows():
-            try:
-                self.orders.append(Order(OrderConfig(**order.to_dict())))
-            except ValidationError as e:
-                for err in e.errors():
-                    errors.loc[len(errors)] = ({
-                        'index': index,
-                        'col': err.get('loc')[0],
-                        'msg': err.get('msg'),
-                    })
-                rows_to_drop.append(index)
-
-        if not errors.empty:
-            errors.to_json(
-                path_or_buf=VALIDATION_ERRORS_DIR_PATH / f'{self.path.stem}_errors.json',
+        self.max_errors: int | None = max_errors
+        self.reader: str = reader
+        self.writer: str = writer
+        self.compact: bool = compact
+        self.validated: bool = False
+        self.errors: pd.DataFrame = pd.DataFrame()
+        self._data: pd.DataFrame | None = None
+        # Sums of the data shared by the writers and the summary, computed once for the data.
+        self._sums: dict[typing.Hashable, pd.Series | pd.DataFrame] = {}
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self._data = self.load()
+
+        return self._data
+
+    @data.setter
+    def data(self, data: pd.DataFrame) -> None:
+        self._data = data
+        self._sums = {}
+
+    @property
+    def output_path(self) -> pathlib.Path:
+        return REPORTS_DIR_PATH / f'{self.path.stem}_report.xlsx'
+
+    @property
+    def errors_path(self) -> pathlib.Path:
+        return VALIDATION_ERRORS_DIR_PATH / f'{self.path.stem}_errors.json'
+
+    def load(self) -> pd.DataFrame:
+        with PROFILER.stage('read', report=self.path.stem) as stage:
+            data = READERS[self.reader](self.path)
+            stage.rows = len(data)
+
+        return data
+
+    def release(self) -> None:
+        # Keep the columns, so the report is not read again on the next access to data.
+        # The empty frames are copies, a slice of the rows would keep all of their arrays alive.
+        self.data = self.data.iloc[:0].copy()
+        self.errors = self.errors.iloc[:0].copy()
+
+    def set_orders(self, save_errors: bool = True) -> None:
+        data = self.data
+        with PROFILER.stage('validate', report=self.path.stem, rows=len(data)):
+            self.data, self.errors = validate_orders(data, max_errors=self.max_errors)
+            if self.compact:
+                self.data = compact_orders(self.data)
+        self.validated = True
+
+        if save_errors:
+            self.save_errors()
+
+    def save_errors(self) -> None:
+        if self.errors.empty:
+            return
+
+        with PROFILER.stage('save_errors', report=self.path.stem, rows=len(self.errors)):
+            self.errors.to_json(
+                path_or_buf=self.errors_path,
                 orient='records',
                 default_handler=str,
                 indent=4,
                 index=False,
             )
 
-        self.data.drop(rows_to_drop, inplace=True)
+    @property
+    def orders(self) -> list[Order]:
+        if not self.validated:
+            return []
+
+        tax_rates = self.data['TAX'] if 'TAX' in self.data else [TAX_RATE] * len(self.data)
+        data = from_cents_columns(self.data) if 'gross' in self.data else self.data
+        return [
+            Order(OrderConfig.model_construct(**order), tax_rate=tax_rate)
+            for order, tax_rate in zip(
+                data.reindex(columns=list(OrderConfig.model_fields)).to_dict('records'),
+                tax_rates,
+            )
+        ]
 
     def set_price_cols(self) -> None:
-        self.data['TAX'] = [TAX_RATE for _ in range(len(self.orders))]
-        self.data['gross'] = [order.calculate_gross_price() for order in self.orders]
-        self.data['total'] = [order.calculate_total_price() for order in self.orders]
+        with PROFILER.stage('price', report=self.path.stem, rows=len(self.data)):
+            tax_rate = TAX_RATE
+            # Rates are validated by set_orders, blank ones are charged the default rate.
+            if TAX_RATE_COL_NAME in self.data:
+                tax_rate = pd.to_numeric(self.data.pop(TAX_RATE_COL_NAME), errors='coerce')
+                tax_rate = tax_rate.fillna(TAX_RATE).to_numpy()
+
+            price_cents = to_cents(self.data['price'].to_numpy())
+            quantity = self.data['quantity'].to_numpy(dtype='int64')
+
+            gross_cents = calculate_gross_cents(price_cents, tax_rate)
+
+            # Money is kept in cents, amounts are written by the outputs.
+            self.data['price'] = price_cents
+            self.data['TAX'] = tax_rate
+            self.data['gross'] = gross_cents
+            self.data['total'] = gross_cents * quantity
+        # The columns were changed in place.
+        self._sums = {}
+
+    def get_sum_row(self) -> pd.Series:
+        if 'sum_row' not in self._sums:
+            cols = self.data.drop(columns=['id', 'quantity', 'TAX']).select_dtypes(include='number')
+            sum_row = cols.sum().astype(object)
+            for col in cols.columns.intersection(MONEY_COLUMNS):
+                sum_row[col] = from_cents(int(cols[col].sum()))
+            sum_row['name'] = 'Total'
+            self._sums['sum_row'] = sum_row
+
+        return self._sums['sum_row'].copy()
 
     def get_data_with_sum_row(self) -> pd.DataFrame:
-        data = self.data.copy()
-        cols = data.drop(columns=['id', 'quantity', 'TAX']).select_dtypes(include='number')
-        sum_row = cols.sum()
-        sum_row['name'] = 'Total'
+        return pd.concat(
+            [from_cents_columns(self.data), pd.DataFrame([self.get_sum_row()])],
+            ignore_index=True,
+        )
 
-        return pd.concat([data, pd.DataFrame([sum_row])], ignore_index=True)
+    def get_sums_by(self, col_name: str) -> pd.DataFrame:
+        """Orders, quantity and money in cents by `col_name`, the rows in the order of the first orders.
 
-    def get_col_sum_by(self, col_name: str) -> pd.DataFrame:
-        return pd.DataFrame(
-            self.data.groupby(col_name)['quantity'].sum().sort_values(ascending=False).reset_index()
-        )
+        Money is summed once the orders are priced. Computed once for the data,
+        the returned frame must not be changed.
+        """
+        if ('sums_by', col_name) not in self._sums:
+            data = self.data
+            self._sums['sums_by', col_name] = pd.DataFrame({
+                col_name: data[col_name].array,
+                'orders': 1,
+                'quantity': data['quantity'].to_numpy(dtype='int64'),
+                **{column: data[column].to_numpy() for column in MONEY_COLUMNS if 'gross' in data},
+            }).groupby(col_name, observed=True, sort=False).sum()
 
-    def save(self) -> None:
-        sheet_name = 'Report'
+        return self._sums['sums_by', col_name]
 
-        with pd.ExcelWriter(path=PROJECT_ROOT_PATH / 'reports' / f'{self.path.stem}_report.xlsx') as writer:
-            self.get_data_with_sum_row().to_excel(
-                writer,
-                sheet_name=sheet_name,
-                index=False,
-                header=True,
-                startrow=1,
-                startcol=0
-            )
-            self.get_col_sum_by(col_name='name').to_excel(
-                writer,
-                sheet_name=sheet_name,
-                index=False,
-                header=True,
-                startrow=1,
-                startcol=len(self.data.columns) + 4
-            )
+    def get_col_sum_by(self, col_name: str, top_n: int | None = MOST_PURCHASED_TOP_N) -> pd.DataFrame:
+        """Quantity by `col_name`, the `top_n` largest first and the rest summed as Other."""
+        return pd.DataFrame(get_top(self.get_sums_by(col_name)['quantity'], top_n).reset_index())
 
-            worksheet = writer.sheets[sheet_name]
-            worksheet.cell(row=1, column=1).value = 'Summary for ' + str(self.date)
-            worksheet.cell(row=1, column=len(self.data.columns) + 5).value = 'Most often purchased'
+    def save(self) -> None:
+        with PROFILER.stage('write', report=self.path.stem, rows=len(self.data)):
+            WRITERS[self.writer](self)
@@ -0,0 +1,105 @@
+"""Persistent daily rollups of products, to summarise any range of dates without the data files."""
+
+import datetime
+import os
+import pathlib
+import sqlite3
+
+import pandas as pd
+
+from src.aggregates import ROLLUP_COLUMNS
+from src.utils import ROLLUPS_PATH
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rollups (
+    date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    orders INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    price INTEGER NOT NULL,
+    gross INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (date, name)
+) WITHOUT ROWID;
+-- Every summarised date, also the ones without valid orders, which have no rollups.
+CREATE TABLE IF NOT EXISTS dates (
+    date TEXT PRIMARY KEY
+) WITHOUT ROWID;
+'''
+
+
+class RollupStore:
+    """Keeps the orders, quantity and money in cents of each product on each day in SQLite.
+
+    The rollups of a date are replaced whenever its report is processed again,
+    a day without valid orders is kept with no rollups.
+    """
+
+    def __init__(self, path: pathlib.Path = ROLLUPS_PATH) -> None:
+        self.path: pathlib.Path = path
+        os.makedirs(path.parent, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        with self.connection:
+            has_dates = self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'dates'").fetchone()
+            self.connection.executescript(SCHEMA)
+            if not has_dates:
+                # Rollups kept before the dates were, their days without valid orders are not known.
+                self.connection.execute('INSERT INTO dates SELECT DISTINCT date FROM rollups')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, date: datetime.date, rollups: pd.DataFrame) -> None:
+        """Replace the rollups of a date by `rollups`, in the layout returned by `get_rollups`."""
+        if not (rollups['date'] == date).all():
+            raise ValueError(f'rollups must all be of {date}')
+
+        rows = rollups[ROLLUP_COLUMNS].astype({'date': str}).itertuples(index=False, name=None)
+        with self.connection:
+            self._delete([date])
+            self.connection.execute('INSERT INTO dates VALUES (?)', (str(date),))
+            self.connection.executemany(
+                f'INSERT INTO rollups VALUES ({", ".join("?" * len(ROLLUP_COLUMNS))})',
+                rows,
+            )
+
+    def remove(self, dates: list[datetime.date]) -> None:
+        with self.connection:
+            self._delete(dates)
+
+    def has_date(self, date: datetime.date) -> bool:
+        """Whether the date is summarised."""
+        return self.connection.execute(
+            'SELECT 1 FROM dates WHERE date = ?', (str(date),)
+        ).fetchone() is not None
+
+    def _delete(self, dates: list[datetime.date]) -> None:
+        params = [(str(date),) for date in dates]
+        self.connection.executemany('DELETE FROM rollups WHERE date = ?', params)
+        self.connection.executemany('DELETE FROM dates WHERE date = ?', params)
+
+    def get_dates(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[datetime.date]:
+        """Summarised dates between `start` and `end`, both included, unbounded when not given."""
+        return [
+            datetime.date.fromisoformat(date)
+            for date, in self.connection.execute(
+                'SELECT date FROM dates WHERE date >= ? AND date <= ? ORDER BY date',
+                (str(start or datetime.date.min), str(end or datetime.date.max)),
+            )
+        ]
+
+    def load(self, start: datetime.date | None = None, end: datetime.date | None = None) -> pd.DataFrame:
+        """Rollups of the dates between `start` and `end`, both included, unbounded when not given."""
+        rollups = pd.read_sql_query(
+            'SELECT * FROM rollups WHERE date >= ? AND date <= ? ORDER BY date, name',
+            self.connection,
+            params=(str(start or datetime.date.min), str(end or datetime.date.max)),
+        )
+        rollups['date'] = [datetime.date.fromisoformat(date) for date in rollups['date']]
+
+        return rollups[ROLLUP_COLUMNS]
@@ -1,118 +1,389 @@
 """Generate a summary report."""
 
-import pathlib
+import asyncio
+import collections
+import datetime
+import functools
+import typing
+
+from concurrent.futures import Executor, ProcessPoolExecutor
 
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from PIL import Image as PILImage
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Image, LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import (
+    Flowable,
+    Image,
+    LongTable,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
 
-from src.constans import TABLE_STYLE, TOTAL_TABLE_STYLE
+from src.aggregates import SummaryAggregates
+from src.cache import ReportCache
+from src.charts import ChartRenderer
+from src.compact import concat_orders
+from src.constans import (
+    PIE_CHART_TOP_N,
+    SUMMARY_DETAIL,
+    SUMMARY_DETAIL_MODES,
+    SUMMARY_DETAIL_TOP_N,
+    SUMMARY_TABLE_CHUNK_ROWS,
+    TABLE_STYLE,
+    TOTAL_TABLE_STYLE,
+)
+from src.database import OrderDatabase
+from src.flowables import LazyTableChunk
+from src.manifest import Manifest
+from src.pricing import from_cents_columns
+from src.profiling import PROFILER, run_profiled
 from src.report import Report
-from src.utils import SUMMARY_PATH, TEMP_DIR_PATH
+from src.rollups import RollupStore
+from src.utils import CHARTS_CACHE_DIR_PATH, SUMMARY_PATH, TEMP_DIR_PATH
+
+
+# Style of the chunks of the orders table without the header row.
+TABLE_BODY_STYLE = [
+    (command, (start_col, max(start_row - 1, 0)), stop, *args)
+    for command, (start_col, start_row), stop, *args in TABLE_STYLE
+    if stop[1] != 0
+]
+
+
+def load_report(
+    report: Report,
+    cache: ReportCache | None = None,
+    manifest: Manifest | None = None,
+) -> bool:
+    """Read the data of a report, or its prepared data from the cache.
+
+    Returns whether the outputs of the report are fresh.
+    """
+    fresh = manifest is not None and manifest.is_fresh(report)
+    cached = None
+    if report.validated:
+        # Prepared by an earlier run of a long-running process, like the daemon.
+        return fresh
+    if cache is not None:
+        with PROFILER.stage('cache_load', report=report.path.stem):
+            cached = cache.load(report)
+
+    if cached is not None:
+        report.data, report.errors = cached
+        report.validated = True
+    else:
+        report.data  # Read on the first access.
+
+    return fresh
+
+def process_report(report: Report, cache: ReportCache | None = None) -> None:
+    if report.validated:
+        return
+
+    report.set_orders(save_errors=False)
+    report.set_price_cols()
+    if cache is not None:
+        with PROFILER.stage('cache_save', report=report.path.stem, rows=len(report.data)):
+            cache.save(report)
+
+def save_report(report: Report, fresh: bool = False) -> None:
+    if not fresh:
+        report.save_errors()
+        report.save()
+
+def prepare_report(
+    report: Report,
+    cache: ReportCache | None = None,
+    manifest: Manifest | None = None,
+) -> Report:
+    with PROFILER.stage('prepare', report=report.path.stem) as stage:
+        fresh = load_report(report, cache=cache, manifest=manifest)
+        process_report(report, cache=cache)
+        save_report(report, fresh=fresh)
+        stage.rows = len(report.data)
+
+    return report
+
+
+def map_bounded(
+    executor: Executor,
+    function: typing.Callable,
+    items: typing.Iterable,
+    window: int,
+) -> typing.Iterator:
+    """Like `executor.map`, in order, but with at most `window` items submitted and not yet consumed.
+
+    Results of finished items are kept until they are consumed, the window caps how many of them are held.
+    """
+    pending: collections.deque = collections.deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 class Summary:
-    def __init__(self, reports: list[Report]) -> None:
+    def __init__(
+        self,
+        reports: list[Report],
+        workers: int = 1,
+        cache: ReportCache | None = None,
+        manifest: Manifest | None = None,
+        streaming: bool = False,
+        detail: str | None = None,
+        detail_top_n: int = SUMMARY_DETAIL_TOP_N,
+        read_ahead: int = 0,
+        rollups: RollupStore | None = None,
+        database: OrderDatabase | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError('workers must be >= 1')
+        if read_ahead < 0:
+            raise ValueError('read_ahead must be >= 0')
+        if read_ahead and workers > 1:
+            raise ValueError('read_ahead can not be used with workers > 1')
+
+        detail = detail or ('off' if streaming else SUMMARY_DETAIL)
+        if detail not in SUMMARY_DETAIL_MODES:
+            raise ValueError(f'detail must be one of: {", ".join(SUMMARY_DETAIL_MODES)}')
+        if streaming and detail == 'full':
+            raise ValueError('full detail needs the orders, which streaming summaries do not keep')
+        if detail_top_n < 1:
+            raise ValueError('detail_top_n must be >= 1')
+
         self.reports: list[Report] = reports
+        self.workers: int = workers
+        self.cache: ReportCache | None = cache
+        self.manifest: Manifest | None = manifest
+        self.streaming: bool = streaming
+        self.detail: str = detail
+        self.detail_top_n: int = detail_top_n
+        self.read_ahead: int = read_ahead
+        self.rollups: RollupStore | None = rollups
+        self.database: OrderDatabase | None = database
+        self.aggregates: SummaryAggregates = SummaryAggregates()
         self.data: pd.DataFrame = pd.DataFrame()
         self.path = SUMMARY_PATH
 
         self._prepare_reports()
 
+    @classmethod
+    def from_rollups(
+        cls,
+        rollups: RollupStore,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        detail: str | None = None,
+        detail_top_n: int = SUMMARY_DETAIL_TOP_N,
+    ) -> 'Summary':
+        """Summary of the dates between `start` and `end` from the rollups, without reading the data files.
+
+        The orders are not kept in the rollups, so the summary can not have the full detail.
+        """
+        summary = cls([], streaming=True, detail=detail, detail_top_n=detail_top_n)
+        with PROFILER.stage('rollups_load') as stage:
+            dates = rollups.get_dates(start, end)
+            data = rollups.load(start, end)
+            stage.rows = len(data)
+        if not dates:
+            raise ValueError(f'No rollups between {start or "the first"} and {end or "the last"} date')
+        summary.aggregates.add_dates(dates)
+        summary.aggregates.add_rollups(data)
+
+        return summary
+
     def _prepare_reports(self) -> None:
         self.reports.sort(key=lambda r: r.date)
 
-        for report in self.reports:
-            report.set_orders()
-            report.set_price_cols()
-            report.save()
+        prepare = functools.partial(prepare_report, cache=self.cache, manifest=self.manifest)
+        if self.workers > 1 and len(self.reports) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(self.reports))) as executor:
+                # Two reports per worker keep the workers busy, without holding all of the prepared reports.
+                map_prepared = functools.partial(
+                    map_bounded, executor, items=self.reports, window=2 * self.workers
+                )
+                if PROFILER.enabled:
+                    # Stages run in the workers are sent back with the reports.
+                    prepared = PROFILER.collect(map_prepared(functools.partial(run_profiled, prepare)))
+                else:
+                    prepared = map_prepared(prepare)
+                self.reports = [self._add_report(report) for report in prepared]
+        elif self.read_ahead:
+            self.reports = asyncio.run(self._prepare_reports_async())
+        else:
+            self.reports = [self._add_report(prepare(report)) for report in self.reports]
+
+        if self.cache is not None:
+            self.cache.evict()
+
+        if not self.streaming:
+            with PROFILER.stage('concat') as stage:
+                self.data = concat_orders([report.data for report in self.reports])
+                stage.rows = len(self.data)
+
+    async def _prepare_reports_async(self) -> list[Report]:
+        """Prepare the reports in order, overlapping the reading and writing of reports with their validation.
+
+        Up to `read_ahead` reports are read by threads ahead of the one being validated and priced,
+        and the outputs of up to `read_ahead` reports are written by threads in the background.
+        Reports are added to the summary in order once their outputs are written.
+        """
+        load = functools.partial(load_report, cache=self.cache, manifest=self.manifest)
+        reads: list[asyncio.Task] = []
+        writes: collections.deque[tuple[Report, asyncio.Task]] = collections.deque()
+        prepared = []
+
+        for index, report in enumerate(self.reports):
+            for next_report in self.reports[len(reads):index + 1 + self.read_ahead]:
+                reads.append(asyncio.create_task(asyncio.to_thread(load, next_report)))
+            fresh = await reads[index]
+            await asyncio.to_thread(process_report, report, self.cache)
+
+            writes.append((report, asyncio.create_task(asyncio.to_thread(save_report, report, fresh))))
+            if len(writes) > self.read_ahead:
+                written_report, write = writes.popleft()
+                await write
+                prepared.append(self._add_report(written_report))
 
-        self.data = pd.concat([report.data for report in self.reports], ignore_index=True)
+        for written_report, write in writes:
+            await write
+            prepared.append(self._add_report(written_report))
 
-    def _get_total_by_product_name(self) -> pd.DataFrame:
-        return self.data.groupby('name')['total'].sum()
+        return prepared
 
-    def get_image_size(self, path: pathlib.Path | str) -> tuple[int, int]:
-        with PILImage.open(path) as img:
-            return img.size
+    def _add_report(self, report: Report) -> Report:
+        with PROFILER.stage('aggregate', report=report.path.stem, rows=len(report.data)):
+            rollups = self.aggregates.add(report)
+        # Sinks already holding the unchanged data file are not written again.
+        saved = self.manifest.get_sinks(report) if self.manifest is not None else set()
+        if self.rollups is not None and not ('rollups' in saved and self.rollups.has_date(report.date)):
+            with PROFILER.stage('rollups_save', report=report.path.stem, rows=len(rollups)):
+                self.rollups.update(report.date, rollups)
+        if self.database is not None and not ('database' in saved and self.database.has_date(report.date)):
+            with PROFILER.stage('database_save', report=report.path.stem, rows=len(report.data)):
+                self.database.update(report)
+        if self.manifest is not None:
+            sinks = [
+                name for name, sink in [('rollups', self.rollups), ('database', self.database)]
+                if sink is not None
+            ]
+            self.manifest.update(report, sinks=sinks)
+        if self.streaming:
+            report.release()
+
+        return report
+
+    def _get_total_by_product_name(self) -> pd.Series:
+        return self.aggregates.get_top_total_by_name(PIE_CHART_TOP_N)
+
+    def _get_orders_table(self, start: int, stop: int, header: bool = True) -> LongTable:
+        list_data = [[col.title() for col in self.data.columns.tolist()]] if header else []
+        list_data += from_cents_columns(self.data.iloc[start:stop]).round(2).values.tolist()
+
+        return LongTable(
+            list_data,
+            style=TableStyle(TABLE_STYLE if header else TABLE_BODY_STYLE),
+            colWidths=[50, 80, 50, 80, 50, 80, 80],
+            repeatRows=int(header)
+        )
+
+    def _get_detail_elements(self) -> list[Flowable]:
+        if self.detail == 'off':
+            return []
+
+        if self.detail == 'full':
+            return [
+                *(
+                    LazyTableChunk(self._get_orders_table, start, start + SUMMARY_TABLE_CHUNK_ROWS)
+                    for start in range(0, max(len(self.data), 1), SUMMARY_TABLE_CHUNK_ROWS)
+                ),
+                Spacer(1,12),
+            ]
+
+        if self.detail == 'top':
+            heading = f'Top {self.detail_top_n} products'
+            data = self.aggregates.get_top_by_name(self.detail_top_n).reset_index()
+            data['quantity'] = data['quantity'].astype('int64')
+            col_widths = [160, 80, 100]
+        else:
+            heading = 'Total by a date'
+            data = self.aggregates.by_date.reset_index()
+            data['date'] = data['date'].astype(str)
+            data[['orders', 'quantity']] = data[['orders', 'quantity']].astype('int64')
+            col_widths = [80, 60, 60, 80, 80, 80]
+
+        list_data = [[col.title() for col in data.columns.tolist()]] + data.round(2).values.tolist()
+        return [
+            Paragraph(heading, style=getSampleStyleSheet()['Heading2']),
+            LongTable(list_data, style=TableStyle(TABLE_STYLE), colWidths=col_widths, repeatRows=1),
+            Spacer(1,12),
+        ]
 
     def save(self) -> None:
-        list_data = [[col.title() for col in self.data.columns.tolist()]] + self.data.round(2).values.tolist()
         pdf = SimpleDocTemplate(str(self.path), pagesize=A4)
 
+        dates = self.aggregates.dates
         title_date_range = ' - '.join([
-            str(self.reports[0].date),
-            str(self.reports[-1].date)
-        ]) if len(self.reports) > 1 else self.reports[0].date
+            str(dates[0]),
+            str(dates[-1])
+        ]) if len(dates) > 1 else dates[0]
 
         title = Paragraph(f'Summary {title_date_range}', style=getSampleStyleSheet()['Title'])
         total_heading = Paragraph(f'Total', style=getSampleStyleSheet()['Heading2'])
 
-        total = self.data.drop(columns=['id', 'quantity', 'TAX']).select_dtypes(include='number').sum()
+        total = self.aggregates.totals
         total_data = list(zip(['Net', 'Gross', 'Total'], [value.item() for value in total.round(2).values]))
 
-        table = LongTable(
-            list_data,
-            style=TableStyle(TABLE_STYLE),
-            colWidths=[50, 80, 50, 80, 50, 80, 80],
-            repeatRows=1
-        )
         total_table = Table(total_data, style=TableStyle(TOTAL_TABLE_STYLE), hAlign='LEFT')
 
-        x = [str(report.date) for report in self.reports]
-        y = [report.get_data_with_sum_row().tail(1)['total'].round(2).item() for report in self.reports]
-
-        plt.figure(figsize=(8, 6))
-        plt.plot(x, y, marker='o',)
-        plt.xticks(rotation=45)
-        for i in range(len(x)):
-            plt.text(x[i], y[i], str(y[i]), ha='center', va='bottom')
-
-        plot_title = Paragraph(f'Total income by a date', style=getSampleStyleSheet()['Heading2'])
-        plot_path = f'{TEMP_DIR_PATH}/total_by_date.png'
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight', transparent=True)
-        width, height = self.get_image_size(plot_path)
-        total_plot = Image(plot_path, width=width * .2, height=height * .2)
-
         total_by_name = self._get_total_by_product_name()
-        sizes = total_by_name.round(2).tolist()
-        labels = total_by_name.index.tolist()
-        plt.figure(figsize=(10, 8))
-        plt.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%'
-        )
-        plt.axis('equal')
+        charts = [('pie', total_by_name.round(2).tolist(), total_by_name.index.tolist())]
+        if len(dates) > 1:
+            x = [str(date) for date in dates]
+            y = [round(self.aggregates.total_by_date[date], 2) for date in dates]
+            charts.insert(0, ('line', x, y))
 
+        renderer = ChartRenderer(
+            path=CHARTS_CACHE_DIR_PATH if self.cache is not None else TEMP_DIR_PATH,
+            workers=self.workers,
+        )
+        with PROFILER.stage('charts'):
+            rendered_charts = renderer.render(charts)
+        images = [
+            Image(str(chart.path), width=chart.width * .2, height=chart.height * .2)
+            for chart in rendered_charts
+        ]
+        plot_title = Paragraph(f'Total income by a date', style=getSampleStyleSheet()['Heading2'])
         pie_plot_title = Paragraph(f'Total income by a product', style=getSampleStyleSheet()['Heading2'])
-        pie_plot_path = f'{TEMP_DIR_PATH}/total_by_name.png'
-        plt.savefig(pie_plot_path, dpi=300, bbox_inches='tight', transparent=True)
-        width, height = self.get_image_size(pie_plot_path)
-        total_pie_plot = Image(pie_plot_path, width=width * .2, height=height * .2)
 
         elements = [
             title,
             Spacer(1,12),
-            table,
-            Spacer(1,12),
+            *self._get_detail_elements(),
             total_heading,
             total_table,
             Spacer(1,12),
         ]
-        if len(self.reports) > 1:
+        if len(dates) > 1:
             elements.extend([
                 plot_title,
-                total_plot,
+                images[0],
                 Spacer(1,12),
             ])
         elements.extend([
             pie_plot_title,
-            total_pie_plot,
+            images[-1],
         ])
 
-        pdf.build(elements)
+        with PROFILER.stage('pdf'):
+            pdf.build(elements)
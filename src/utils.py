@@ -1,21 +1,35 @@
 """Utils for the project."""
 
+import functools
+import numpy as np
 import pandas as pd
 import pathlib
 import re
+import typing
 
-from datetime import datetime
-from faker import Faker
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 
-from src.constans import DATA_DIR_NAME, DATE_FORMAT, TEMP_DIR_NAME
+if typing.TYPE_CHECKING:
+    from faker import Faker
+
+from src.constans import CACHE_DIR_NAME, DATA_DIR_NAME, DATE_FORMAT, TEMP_DIR_NAME, XLSX_FILE_NAME_PATTERN
+from src.writers import write_frame
 
 
 PROJECT_ROOT_PATH = pathlib.Path(__file__).parent.parent.resolve()
-VALIDATION_ERRORS_DIR_PATH = PROJECT_ROOT_PATH / DATA_DIR_NAME / 'validation_errors'
+DATA_DIR_PATH = PROJECT_ROOT_PATH / DATA_DIR_NAME
+VALIDATION_ERRORS_DIR_PATH = DATA_DIR_PATH / 'validation_errors'
+REPORTS_DIR_PATH = PROJECT_ROOT_PATH / 'reports'
+MANIFEST_PATH = REPORTS_DIR_PATH / '.manifest.json'
+ROLLUPS_PATH = REPORTS_DIR_PATH / 'rollups.sqlite'
+DATABASE_PATH = REPORTS_DIR_PATH / 'orders.sqlite'
 SUMMARY_PATH = pathlib.Path(PROJECT_ROOT_PATH / 'Summary.pdf')
 TEMP_DIR_PATH = pathlib.Path(PROJECT_ROOT_PATH / TEMP_DIR_NAME)
-
-faker = Faker()
+CACHE_DIR_PATH = pathlib.Path(PROJECT_ROOT_PATH / CACHE_DIR_NAME)
+CHARTS_CACHE_DIR_PATH = CACHE_DIR_PATH / 'charts'
+# Year partitions of the data directory, like data/2025.
+YEAR_DIR_PATTERN = r'\d{4}$'
 
 FAKE_PRODUCT_NAMES = [
     'AeroFlare',
@@ -40,40 +54,140 @@ FAKE_PRODUCT_NAMES = [
     'ElementFlow'
 ]
 
-fake_products = [
-    {'name': name, 'price': faker.pyfloat(positive=True, min_value=1, max_value=10000, right_digits=2)}
-    for name in FAKE_PRODUCT_NAMES
-]
+# Chance of an order to have the id of the previous one.
+FAKE_REPEATED_ID_CHANCE = .25
+
+@functools.cache
+def get_faker() -> 'Faker':
+    # Faker takes long to import, it is only loaded when fake data is generated.
+    from faker import Faker
+
+    return Faker()
 
 def dir_files(path: pathlib.Path, pattern: str = '*') -> list[pathlib.Path]:
     return [p for p in path.iterdir() if re.match(pattern, str(p.name))]
 
-def generate_fake_data(order_id_start: int, rows=10) -> tuple[pd.DataFrame, pathlib.Path]:
+def get_file_date(path: pathlib.Path) -> date:
+    """Date in the name of a data file, or of an output named after it like 2025_01_31_report.xlsx."""
+    return datetime.strptime(path.name[:10], DATE_FORMAT).date()
+
+def in_date_range(day: date, start: date | None = None, end: date | None = None) -> bool:
+    return (start is None or day >= start) and (end is None or day <= end)
+
+def get_data_dirs(
+    path: pathlib.Path = DATA_DIR_PATH,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[pathlib.Path]:
+    """The data directory and its year partitions, like data/2025, which can hold dates
+    between `start` and `end`.
+    """
+    return [path] + sorted(
+        year_dir
+        for year_dir in dir_files(path, YEAR_DIR_PATTERN)
+        if year_dir.is_dir()
+        and (start is None or int(year_dir.name) >= start.year)
+        and (end is None or int(year_dir.name) <= end.year)
+    )
+
+def scan_data_files(
+    path: pathlib.Path = DATA_DIR_PATH,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[pathlib.Path]:
+    """Data files of the dates between `start` and `end`, both included, sorted by their date.
+
+    Files are selected by the dates in their names, so nothing is read, and year partitions
+    outside of the range are not listed.
+    """
+    files = {}
+    for data_dir in get_data_dirs(path, start=start, end=end):
+        for file in dir_files(data_dir, XLSX_FILE_NAME_PATTERN):
+            day = get_file_date(file)
+            if not in_date_range(day, start=start, end=end):
+                continue
+            if day in files:
+                raise ValueError(f'Data files {files[day]} and {file} are of the same date')
+            files[day] = file
+
+    return [files[day] for day in sorted(files)]
+
+def generate_fake_orders(
+    rows: int,
+    order_id_start: int = 0,
+    seed: int | np.random.SeedSequence | None = None,
+) -> pd.DataFrame:
+    """Orders drawn from seeded NumPy random arrays, about 25% of them repeat the id of the previous order."""
     if order_id_start < 0:
         raise ValueError('order_id_start must be >= 0')
+    if rows < 0:
+        raise ValueError('rows must be >= 0')
+
+    rng = np.random.default_rng(seed)
+    new_ids = rng.random(rows) >= FAKE_REPEATED_ID_CHANCE
+    new_ids[:1] = True
+    products = rng.integers(0, len(FAKE_PRODUCT_NAMES), rows)
+    product_prices = rng.uniform(1, 10000, len(FAKE_PRODUCT_NAMES)).round(2)
+
+    return pd.DataFrame({
+        'id': order_id_start + np.cumsum(new_ids) - 1,
+        'name': np.array(FAKE_PRODUCT_NAMES, dtype=object)[products],
+        'quantity': rng.integers(1, 10, rows),
+        'price': product_prices[products],
+    })
 
+def generate_fake_data(
+    order_id_start: int,
+    rows=10,
+    seed: int | None = None,
+) -> tuple[pd.DataFrame, pathlib.Path]:
+    report = generate_fake_orders(rows, order_id_start=order_id_start, seed=seed)
+    faker = get_faker()
+    if seed is not None:
+        # The date is drawn by faker, so it is seeded too.
+        faker.seed_instance(seed)
     report_dest_path = pathlib.Path(
-        PROJECT_ROOT_PATH /
-        DATA_DIR_NAME /
+        DATA_DIR_PATH /
         f'{faker.unique.date(pattern=DATE_FORMAT, end_datetime=datetime.now())}.xlsx')
-    report = pd.DataFrame(columns=['id', 'name', 'quantity', 'price'])
-
-    ids = []
-    for i in range(order_id_start, order_id_start + rows):
-        if i > order_id_start and faker.boolean(chance_of_getting_true=25):
-            id = ids[-1]
-        else:
-            id = ids[-1] + 1 if ids and ids[-1] + 1 != i else i
-        ids.append(id)
-
-    for id in ids:
-        product = faker.random_element(fake_products)
-
-        report.loc[len(report)] = [
-            id,
-            product['name'],
-            faker.pydecimal(positive=True, min_value=1, max_value=9, right_digits=0),
-            product['price']
-        ]
 
     return report, report_dest_path
+
+def write_fake_day(
+    path: pathlib.Path,
+    rows: int,
+    order_id_start: int,
+    seed: np.random.SeedSequence,
+) -> pathlib.Path:
+    write_frame(path, generate_fake_orders(rows, order_id_start=order_id_start, seed=seed))
+
+    return path
+
+def generate_fake_days(
+    days: int,
+    rows: int,
+    end_date: date | None = None,
+    seed: int | None = None,
+    workers: int = 1,
+) -> list[pathlib.Path]:
+    """Write daily reports of fake orders for the `days` days until `end_date`, today by default.
+
+    Every day has its own random stream spawned from `seed` and its own range of order ids.
+    """
+    if days < 1:
+        raise ValueError('days must be >= 1')
+    if workers < 1:
+        raise ValueError('workers must be >= 1')
+
+    end_date = end_date or date.today()
+    paths = [
+        DATA_DIR_PATH / f'{(end_date - timedelta(days=day)).strftime(DATE_FORMAT)}.xlsx'
+        for day in range(days - 1, -1, -1)
+    ]
+    order_id_starts = [day * rows + 1 for day in range(days)]
+    args = (paths, [rows] * days, order_id_starts, np.random.SeedSequence(seed).spawn(days))
+
+    if workers > 1 and days > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, days)) as executor:
+            return list(executor.map(write_fake_day, *args))
+
+    return list(map(write_fake_day, *args))
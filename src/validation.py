@@ -0,0 +1,270 @@
+"""Columnar validation of orders against OrderConfig."""
+
+import functools
+import typing
+
+import numpy as np
+import pandas as pd
+import pydantic
+
+from src.configs import OrderConfig
+from src.constans import MAX_TOTAL, TAX_RATE, TAX_RATE_COL_NAME
+
+
+MISSING_FIELD_MSG = 'Field required'
+TAX_RATE_NUMBER_MSG = 'Input should be a valid number'
+TAX_RATE_RANGE_MSG = 'Input should be greater than or equal to 0 and less than 1'
+TOTAL_COL_NAME = 'total'
+TOTAL_RANGE_MSG = f'Total price should be less than or equal to {MAX_TOTAL}'
+ERRORS_COLUMNS = ['index', 'col', 'msg']
+# Integral floats outside of this range are left for pydantic to judge.
+MAX_EXACT_INT = 2 ** 53
+FIELD_DTYPES = {
+    int: 'int64',
+    float: 'float64',
+}
+
+
+@functools.cache
+def get_field_adapter(field_name: str) -> pydantic.TypeAdapter:
+    field = OrderConfig.model_fields[field_name]
+    return pydantic.TypeAdapter(typing.Annotated[field.annotation, *field.metadata])
+
+
+def get_field_constraint(field_name: str, constraint: str) -> typing.Any:
+    return next(
+        (
+            getattr(metadata, constraint)
+            for metadata in OrderConfig.model_fields[field_name].metadata
+            if hasattr(metadata, constraint)
+        ),
+        None,
+    )
+
+
+def _native_numbers(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Return float values of the column and a mask of cells holding plain numbers."""
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        is_number = values.map(type).isin([int, float]).to_numpy()
+        numbers = pd.to_numeric(values.where(is_number), errors='coerce').to_numpy(dtype='float64')
+        return numbers, is_number
+
+    return values.to_numpy(dtype='float64'), np.ones(len(values), dtype=bool)
+
+
+def _valid_number_mask(values: pd.Series, field_name: str) -> np.ndarray:
+    numbers, mask = _native_numbers(values)
+    gt = get_field_constraint(field_name, 'gt')
+    le = get_field_constraint(field_name, 'le')
+
+    with np.errstate(invalid='ignore'):
+        if gt is not None:
+            mask &= numbers > gt
+        if le is not None:
+            mask &= numbers <= le
+        if get_field_constraint(field_name, 'allow_inf_nan') is False:
+            mask &= np.isfinite(numbers)
+        is_int_field = OrderConfig.model_fields[field_name].annotation is int
+        if is_int_field and not pd.api.types.is_integer_dtype(values):
+            mask &= np.isfinite(numbers) & (np.mod(numbers, 1) == 0) & (np.abs(numbers) < MAX_EXACT_INT)
+
+    return mask
+
+
+def _valid_string_mask(values: pd.Series, field_name: str) -> np.ndarray:
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return np.zeros(len(values), dtype=bool)
+
+    mask = values.map(type).eq(str).to_numpy()
+    lengths = values.where(mask, '').str.len().to_numpy()
+    min_length = get_field_constraint(field_name, 'min_length')
+    max_length = get_field_constraint(field_name, 'max_length')
+    if min_length is not None:
+        mask &= lengths >= min_length
+    if max_length is not None:
+        mask &= lengths <= max_length
+
+    return mask
+
+
+def valid_mask(values: pd.Series, field_name: str) -> np.ndarray:
+    """Return a mask of cells that certainly pass validation of the given field.
+
+    Cells outside of the mask are not necessarily invalid, pydantic has the final word on them.
+    """
+    if OrderConfig.model_fields[field_name].annotation is str:
+        return _valid_string_mask(values, field_name)
+
+    return _valid_number_mask(values, field_name)
+
+
+def _coerce_column(values: pd.Series, field_name: str, replacements: dict[int, typing.Any]) -> pd.Series:
+    if replacements:
+        coerced = values.to_numpy(dtype=object).copy()
+        coerced[list(replacements)] = list(replacements.values())
+        values = pd.Series(coerced, index=values.index, name=values.name)
+
+    dtype = FIELD_DTYPES.get(OrderConfig.model_fields[field_name].annotation)
+    if dtype is None or values.dtype == dtype:
+        return values
+
+    try:
+        return values.astype(dtype)
+    except (OverflowError, TypeError, ValueError):
+        return values
+
+
+def validate_tax_rates(values: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Validate the optional tax rates of the orders, numbers with 0 <= rate < 1.
+
+    Returns the rates as floats, NaN for blank cells, which are priced with the default TAX_RATE,
+    and the positions of the invalid rates with their messages.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        rates = values.to_numpy(dtype='float64')
+        blank = np.isnan(rates)
+        not_number = np.zeros(len(values), dtype=bool)
+    else:
+        types = values.map(type)
+        is_str = types.eq(str).to_numpy()
+        blank = values.isna().to_numpy() | (is_str & values.where(is_str, '').str.strip().eq('').to_numpy())
+        is_bool = types.isin([bool, np.bool_]).to_numpy()
+        rates = pd.to_numeric(values.where(~blank & ~is_bool), errors='coerce').to_numpy(dtype='float64')
+        not_number = ~blank & (is_bool | np.isnan(rates))
+
+    with np.errstate(invalid='ignore'):
+        out_of_range = ~blank & ~not_number & ~((rates >= 0) & (rates < 1))
+    positions = np.flatnonzero(not_number | out_of_range)
+    msgs = np.where(not_number[positions], TAX_RATE_NUMBER_MSG, TAX_RATE_RANGE_MSG).astype(object)
+    rates[blank] = np.nan
+
+    return rates, positions, msgs
+
+
+def validate_totals(data: pd.DataFrame, tax_rates: np.ndarray | None = None) -> np.ndarray:
+    """Positions of the orders whose total price, with the tax, is over MAX_TOTAL."""
+    price = pd.to_numeric(data['price'], errors='coerce').to_numpy(dtype='float64')
+    quantity = pd.to_numeric(data['quantity'], errors='coerce').to_numpy(dtype='float64')
+    tax_rate = TAX_RATE if tax_rates is None else np.where(np.isnan(tax_rates), TAX_RATE, tax_rates)
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        return np.flatnonzero(price * quantity * (1 + tax_rate) > MAX_TOTAL)
+
+
+class ValidationErrors:
+    """Collects validation errors column by column and builds the errors frame once.
+
+    Only the first `max_errors` errors, in row order, are kept.
+    """
+
+    def __init__(self, max_errors: int | None = None) -> None:
+        if max_errors is not None and max_errors < 0:
+            raise ValueError('max_errors must be >= 0')
+
+        self.max_errors: int | None = max_errors
+        self.count: int = 0
+        self._fields_order: dict[str, int] = {
+            name: order for order, name in enumerate(OrderConfig.model_fields)
+        }
+        self._positions: list[np.ndarray] = []
+        self._fields: list[np.ndarray] = []
+        self._cols: list[np.ndarray] = []
+        self._msgs: list[np.ndarray] = []
+
+    def add(self, positions: np.ndarray, col: str, msgs: list[str] | str) -> None:
+        positions = np.asarray(positions)
+        if isinstance(msgs, str):
+            msgs = np.full(len(positions), msgs, dtype=object)
+        else:
+            msgs = np.array(msgs, dtype=object)
+        self.count += len(positions)
+
+        if self.max_errors is not None:
+            positions, msgs = positions[:self.max_errors], msgs[:self.max_errors]
+
+        self._positions.append(positions)
+        self._fields.append(np.full(len(positions), self._fields_order.get(col, len(self._fields_order))))
+        self._cols.append(np.full(len(positions), col, dtype=object))
+        self._msgs.append(msgs)
+
+    def to_frame(self, index: pd.Index) -> pd.DataFrame:
+        if not self.count:
+            return pd.DataFrame(columns=ERRORS_COLUMNS)
+
+        positions = np.concatenate(self._positions)
+        order = np.lexsort((np.concatenate(self._fields), positions))[:self.max_errors]
+
+        return pd.DataFrame({
+            'index': index.take(positions[order]),
+            'col': np.concatenate(self._cols)[order],
+            'msg': np.concatenate(self._msgs)[order],
+        })
+
+
+def validate_orders(data: pd.DataFrame, max_errors: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Validate all orders at once, column by column.
+
+    Returns the valid rows, coerced to the OrderConfig types, and the validation errors
+    in the same shape and order as validating each row with OrderConfig would give.
+    The optional tax rates are validated after the OrderConfig fields, then the total prices
+    of the orders valid so far.
+    """
+    rows_count = len(data)
+    valid = np.ones(rows_count, dtype=bool)
+    coerced = {}
+    errors = ValidationErrors(max_errors=max_errors)
+
+    for field_name in OrderConfig.model_fields:
+        if field_name not in data.columns:
+            valid[:] = False
+            errors.add(np.arange(rows_count), field_name, MISSING_FIELD_MSG)
+            continue
+
+        values = data[field_name]
+        suspects = np.flatnonzero(~valid_mask(values, field_name))
+        replacements = {}
+        positions, msgs = [], []
+        if len(suspects):
+            adapter = get_field_adapter(field_name)
+            raw_values = values.to_numpy(dtype=object)
+            for position in suspects:
+                try:
+                    replacements[position] = adapter.validate_python(raw_values[position])
+                except pydantic.ValidationError as e:
+                    for err in e.errors():
+                        positions.append(position)
+                        msgs.append(err.get('msg'))
+
+        if positions:
+            valid[positions] = False
+            errors.add(np.array(positions), field_name, msgs)
+        coerced[field_name] = (values, replacements)
+
+    tax_rates = None
+    if TAX_RATE_COL_NAME in data.columns:
+        tax_rates, positions, msgs = validate_tax_rates(data[TAX_RATE_COL_NAME])
+        if len(positions):
+            valid[positions] = False
+            errors.add(positions, TAX_RATE_COL_NAME, msgs.tolist())
+
+    if valid.any():
+        positions = validate_totals(data, tax_rates)
+        positions = positions[valid[positions]]
+        if len(positions):
+            valid[positions] = False
+            errors.add(positions, TOTAL_COL_NAME, TOTAL_RANGE_MSG)
+
+    valid_data = data.take(np.flatnonzero(valid))
+    if tax_rates is not None:
+        valid_data[TAX_RATE_COL_NAME] = tax_rates[valid]
+    for field_name, field in OrderConfig.model_fields.items():
+        if field_name not in valid_data.columns:
+            valid_data[field_name] = pd.Series(dtype=FIELD_DTYPES.get(field.annotation, object))
+    for field_name, (values, replacements) in coerced.items():
+        replacements = {position: value for position, value in replacements.items() if valid[position]}
+        if replacements:
+            valid_positions = np.cumsum(valid) - 1
+            replacements = {valid_positions[position]: value for position, value in replacements.items()}
+        valid_data[field_name] = _coerce_column(valid_data[field_name], field_name, replacements)
+
+    return valid_data, errors.to_frame(data.index)
@@ -0,0 +1,85 @@
+"""Notice new and modified data files without reading them."""
+
+import pathlib
+import time
+import typing
+
+import src.utils as utils
+
+
+WATCHER_SETTLE_SECONDS = 2.0
+
+
+class DataWatcher:
+    """Polls the data directory and its year partitions for complete data files.
+
+    The directories are listed again only when one of their mtimes changes, which happens when files
+    are added, removed or renamed in them, the listed files are only checked with a stat. A file is
+    complete once it was not modified for `settle` seconds, so a file still being copied or written
+    is not processed until it is complete, and a data file being overwritten keeps its previous state
+    until then.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path = utils.DATA_DIR_PATH,
+        settle: float = WATCHER_SETTLE_SECONDS,
+    ) -> None:
+        if settle < 0:
+            raise ValueError('settle must be >= 0')
+
+        self.path: pathlib.Path = path
+        self.settle_ns: int = int(settle * 1e9)
+        self.dir_mtimes: dict[pathlib.Path, int] = {}
+        self.files: list[pathlib.Path] = []
+        # Mtime and size of the complete data files, by their path.
+        self.states: dict[pathlib.Path, tuple[int, int]] = {}
+        self.pending: set[pathlib.Path] = set()
+
+    @staticmethod
+    def get_dir_mtimes(dirs: typing.Iterable[pathlib.Path]) -> dict[pathlib.Path, int]:
+        mtimes = {}
+        for data_dir in dirs:
+            try:
+                mtimes[data_dir] = data_dir.stat().st_mtime_ns
+            except FileNotFoundError:  # A removed year partition.
+                continue
+
+        return mtimes
+
+    def list_files(self, now_ns: int) -> None:
+        dir_mtimes = self.get_dir_mtimes(self.dir_mtimes or [self.path])
+        # The mtime of a directory changed within its resolution could be missed,
+        # it is listed again until it settles.
+        settled = all(now_ns - mtime >= self.settle_ns for mtime in dir_mtimes.values())
+        if dir_mtimes == self.dir_mtimes and settled:
+            return
+
+        # Taken before listing, so files added while listing are noticed by the next poll.
+        self.dir_mtimes = self.get_dir_mtimes(utils.get_data_dirs(self.path))
+        self.files = utils.scan_data_files(self.path)
+
+    def poll(self) -> bool:
+        """Update the states of the complete data files, return whether they changed."""
+        now_ns = time.time_ns()
+        self.list_files(now_ns)
+
+        states = {}
+        self.pending = set()
+        for path in self.files:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Removed since it was listed.
+                continue
+
+            if now_ns - stat.st_mtime_ns < self.settle_ns:
+                self.pending.add(path)
+                if path in self.states:
+                    states[path] = self.states[path]
+                continue
+            states[path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = states != self.states
+        self.states = states
+
+        return changed
@@ -0,0 +1,316 @@
+"""Writers of the daily xlsx reports."""
+
+import itertools
+import pathlib
+import re
+import typing
+import zipfile
+
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from src.pricing import from_cents_columns
+
+if typing.TYPE_CHECKING:
+    from src.report import Report
+
+
+SHEET_NAME = 'Report'
+# Empty columns between the orders and the most often purchased products.
+COLUMNS_GAP = 4
+# Rows converted to Python values at once by the streaming writer.
+WRITE_CHUNK_ROWS = 10_000
+
+
+def write_pandas(report: 'Report') -> None:
+    """Write the sheet with pandas, the orders a chunk at a time and the sum row below them."""
+    with pd.ExcelWriter(path=report.output_path) as writer:
+        for start in range(0, max(len(report.data), 1), WRITE_CHUNK_ROWS):
+            from_cents_columns(report.data.iloc[start:start + WRITE_CHUNK_ROWS]).to_excel(
+                writer,
+                sheet_name=SHEET_NAME,
+                index=False,
+                header=start == 0,
+                startrow=start + 1 + (start > 0),
+                startcol=0
+            )
+        pd.DataFrame([report.get_sum_row()]).reindex(columns=report.data.columns).to_excel(
+            writer,
+            sheet_name=SHEET_NAME,
+            index=False,
+            header=False,
+            startrow=len(report.data) + 2,
+            startcol=0
+        )
+        report.get_col_sum_by(col_name='name').to_excel(
+            writer,
+            sheet_name=SHEET_NAME,
+            index=False,
+            header=True,
+            startrow=1,
+            startcol=len(report.data.columns) + COLUMNS_GAP
+        )
+
+        worksheet = writer.sheets[SHEET_NAME]
+        worksheet.cell(row=1, column=1).value = 'Summary for ' + str(report.date)
+        most_purchased_column = len(report.data.columns) + COLUMNS_GAP + 1
+        worksheet.cell(row=1, column=most_purchased_column).value = 'Most often purchased'
+
+
+def _iter_rows(data: pd.DataFrame) -> typing.Iterator[list]:
+    for start in range(0, len(data), WRITE_CHUNK_ROWS):
+        chunk = from_cents_columns(data.iloc[start:start + WRITE_CHUNK_ROWS])
+        yield from chunk.astype(object).values.tolist()
+
+
+def write_openpyxl(report: 'Report') -> None:
+    """Stream the rows with openpyxl in write-only mode, the sheet is laid out like by `write_pandas`.
+
+    Rows are converted to Python values a chunk at a time, without a copy of the data with its sum row.
+    """
+    import openpyxl
+
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    # Header style of pandas.DataFrame.to_excel.
+    header_font = Font(bold=True)
+    header_border = Border(*(Side(style='thin') for _ in range(4)))
+    header_alignment = Alignment(horizontal='center', vertical='top')
+    data = report.data
+    most_purchased = report.get_col_sum_by(col_name='name')
+    gap = [None] * COLUMNS_GAP
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(SHEET_NAME)
+
+    def get_header(columns: list[str]) -> list[WriteOnlyCell]:
+        cells = [WriteOnlyCell(worksheet, value=column) for column in columns]
+        for cell in cells:
+            cell.font, cell.border, cell.alignment = header_font, header_border, header_alignment
+
+        return cells
+
+    sum_row = report.get_sum_row()
+    orders_rows = itertools.chain(
+        _iter_rows(data),
+        [[None if pd.isna(value) else value for value in sum_row.reindex(data.columns).tolist()]],
+    )
+    worksheet.append(
+        ['Summary for ' + str(report.date), *[None] * (len(data.columns) - 1), *gap, 'Most often purchased']
+    )
+    worksheet.append([*get_header(data.columns.tolist()), *gap, *get_header(most_purchased.columns.tolist())])
+    for orders_row, most_purchased_row in itertools.zip_longest(orders_rows, _iter_rows(most_purchased)):
+        if most_purchased_row is None:
+            worksheet.append(orders_row)
+        else:
+            worksheet.append([*(orders_row or [None] * len(data.columns)), *gap, *most_purchased_row])
+
+    workbook.save(report.output_path)
+
+
+# Parts of the package written by `write_xml`, the sheet and shared strings are written separately.
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+PACKAGE_PARTS = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{SHEET_NAME}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '<Relationship Id="rId2" Target="sharedStrings.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+        '<Relationship Id="rId3" Target="styles.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+        '</Relationships>'
+    ),
+    # The second cell format is the header style of pandas.DataFrame.to_excel.
+    'xl/styles.xml': (
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+        '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/>'
+        '<diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" '
+        'applyAlignment="1"><alignment horizontal="center" vertical="top"/></xf></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+EMPTY_CELL = '<c/>'
+# Characters XML 1.0 does not allow, the control characters are the ILLEGAL_CHARACTERS_RE of openpyxl.
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class SharedStrings:
+    """Indices of the strings of a workbook, in the order they were added.
+
+    Strings with characters XML does not allow are rejected, like openpyxl does.
+    """
+
+    def __init__(self) -> None:
+        self.indices: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self.indices.get(value)
+        if index is None:
+            if ILLEGAL_CHARACTERS_RE.search(value):
+                raise ValueError(f'{value!r} cannot be used in worksheets')
+            index = self.indices[value] = len(self.indices)
+
+        return index
+
+    def get_cell(self, value: str, style: int = 0) -> str:
+        style_attribute = f' s="{style}"' if style else ''
+
+        return f'<c t="s"{style_attribute}><v>{self.add(value)}</v></c>'
+
+    def to_xml(self) -> str:
+        items = ''.join(f'<si><t xml:space="preserve">{escape(value)}</t></si>' for value in self.indices)
+
+        return (
+            f'{XML_HEADER}<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{len(self.indices)}" uniqueCount="{len(self.indices)}">{items}</sst>'
+        )
+
+
+def _get_cells(values: pd.Series, shared_strings: SharedStrings) -> pd.Series:
+    """XML of the cells of a column, missing and not finite numbers are written as empty cells."""
+    values = values.reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        finite = np.isfinite(values.to_numpy(dtype='float64'))
+        return ('<c><v>' + values.astype(str) + '</v></c>').where(finite, EMPTY_CELL)
+
+    codes, uniques = pd.factorize(values)
+    # Missing values are coded as -1, which picks the trailing -1 index.
+    indices = np.array([*(shared_strings.add(str(value)) for value in uniques), -1])[codes]
+    return ('<c t="s"><v>' + pd.Series(indices).astype(str) + '</v></c>').where(codes >= 0, EMPTY_CELL)
+
+
+def _get_rows(
+    data: pd.DataFrame,
+    most_purchased: pd.DataFrame,
+    start_row: int,
+    shared_strings: SharedStrings,
+) -> str:
+    """XML of the rows of the orders and the most often purchased products at the same positions."""
+    cells = pd.Series('', index=range(len(data)))
+    for column in data.columns:
+        cells += _get_cells(data[column], shared_strings)
+
+    if not most_purchased.empty:
+        side_cells = pd.Series(EMPTY_CELL * COLUMNS_GAP, index=range(len(most_purchased)))
+        for column in most_purchased.columns:
+            side_cells += _get_cells(most_purchased[column], shared_strings)
+        cells = cells.add(side_cells, fill_value='')
+
+    row_numbers = pd.Series(np.arange(start_row, start_row + len(cells))).astype(str)
+    return ''.join('<row r="' + row_numbers + '">' + cells + '</row>')
+
+
+def _write_workbook(path: pathlib.Path, rows: typing.Iterable[str], shared_strings: SharedStrings) -> None:
+    """Write a workbook of one sheet, its rows are XML strings streamed straight to the archive."""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for name, part in PACKAGE_PARTS.items():
+            archive.writestr(name, XML_HEADER + part)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((
+                f'{XML_HEADER}<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData>'
+            ).encode())
+            for rows_xml in rows:
+                sheet.write(rows_xml.encode())
+            sheet.write(b'</sheetData></worksheet>')
+
+        # Written last, once the rows added all of their strings.
+        archive.writestr('xl/sharedStrings.xml', shared_strings.to_xml())
+
+
+def write_xml(report: 'Report') -> None:
+    """Write the sheet XML straight to the archive, the sheet is laid out like by `write_pandas`.
+
+    Cells are formatted a column at a time and a chunk of rows at a time,
+    without a copy of the data with its sum row.
+    """
+    data = report.data
+    most_purchased = report.get_col_sum_by(col_name='name')
+    shared_strings = SharedStrings()
+    gap = EMPTY_CELL * COLUMNS_GAP
+
+    def get_rows() -> typing.Iterator[str]:
+        title = shared_strings.get_cell('Summary for ' + str(report.date))
+        side_title = shared_strings.get_cell('Most often purchased')
+        header, side_header = (
+            ''.join(shared_strings.get_cell(str(column), style=1) for column in columns)
+            for columns in [data.columns, most_purchased.columns]
+        )
+        yield f'<row r="1">{title}{EMPTY_CELL * (len(data.columns) - 1)}{gap}{side_title}</row>'
+        yield f'<row r="2">{header}{gap}{side_header}</row>'
+
+        for start in range(0, len(data), WRITE_CHUNK_ROWS):
+            stop = start + WRITE_CHUNK_ROWS
+            yield _get_rows(
+                from_cents_columns(data.iloc[start:stop]),
+                most_purchased.iloc[start:stop],
+                start + 3,
+                shared_strings,
+            )
+
+        sum_row = pd.DataFrame([report.get_sum_row()]).reindex(columns=data.columns).infer_objects()
+        yield _get_rows(sum_row, most_purchased.iloc[len(data):], len(data) + 3, shared_strings)
+
+    _write_workbook(report.output_path, get_rows(), shared_strings)
+
+
+def write_frame(path: pathlib.Path, data: pd.DataFrame) -> None:
+    """Write a sheet of `data` with a header row, like pandas.DataFrame.to_excel without the index."""
+    shared_strings = SharedStrings()
+
+    def get_rows() -> typing.Iterator[str]:
+        header = ''.join(shared_strings.get_cell(str(column), style=1) for column in data.columns)
+        yield f'<row r="1">{header}</row>'
+
+        for start in range(0, len(data), WRITE_CHUNK_ROWS):
+            stop = start + WRITE_CHUNK_ROWS
+            yield _get_rows(data.iloc[start:stop], pd.DataFrame(), start + 2, shared_strings)
+
+    _write_workbook(path, get_rows(), shared_strings)
+
+
+WRITERS = {
+    'pandas': write_pandas,
+    'openpyxl': write_openpyxl,
+    'xml': write_xml,
+}
@@ -0,0 +1,138 @@
+import pathlib
+
+import pandas as pd
+
+from datetime import datetime
+
+from src.aggregates import SummaryAggregates, get_rollups
+from src.compact import compact_orders
+from src.pricing import MONEY_COLUMNS, to_cents
+from src.report import Report
+
+
+def get_report(day: int, data: pd.DataFrame) -> Report:
+    """Report of the orders, the amounts of priced ones in cents as `Report.set_price_cols` keeps them."""
+    report = Report(pathlib.Path(f'2025_01_0{day}.xlsx'), datetime(2025, 1, day).date())
+    money_columns = MONEY_COLUMNS if 'gross' in data else []
+    report.data = data.assign(**{
+        column: to_cents(data[column].to_numpy(dtype='float64')) for column in money_columns
+    })
+
+    return report
+
+
+def test_add():
+    aggregates = SummaryAggregates()
+
+    aggregates.add(get_report(1, pd.DataFrame({
+        'name': ['Product1', 'Product2', 'Product1'],
+        'quantity': [10, 20, 30],
+        'price': [100.0, 150.0, 100.0],
+        'gross': [123.0, 184.5, 123.0],
+        'total': [1230.0, 3690.0, 3690.0],
+    })))
+    aggregates.add(get_report(2, pd.DataFrame({
+        'name': ['Product3', 'Product1'],
+        'quantity': [1, 1],
+        'price': [10.0, 100.0],
+        'gross': [12.3, 123.0],
+        'total': [12.3, 123.0],
+    })))
+
+    assert aggregates.rows_count == 5
+    assert aggregates.totals.round(2).to_dict() == {'price': 460.0, 'gross': 565.8, 'total': 8745.3}
+    assert aggregates.total_by_date == {
+        datetime(2025, 1, 1).date(): 8610.0, datetime(2025, 1, 2).date(): 135.3,
+    }
+    assert aggregates.total_by_name.to_dict() == {'Product1': 5043.0, 'Product2': 3690.0, 'Product3': 12.3}
+    assert aggregates.by_name['quantity'].to_dict() == {'Product1': 41, 'Product2': 20, 'Product3': 1}
+    assert aggregates.get_top_total_by_name(1).to_dict() == {'Product1': 5043.0, 'Other': 3702.3}
+    assert aggregates.get_top_by_name(2).values.tolist() == [[41, 5043.0], [20, 3690.0]]
+    assert aggregates.by_date.round(2).values.tolist() == [
+        [3, 60, 350.0, 430.5, 8610.0],
+        [2, 2, 110.0, 135.3, 135.3],
+    ]
+
+
+def test_add_compact():
+    data = pd.DataFrame({
+        'name': ['Product1', 'Product2', 'Product1'],
+        'quantity': [10, 20, 30],
+        'price': [100.0, 150.0, 100.0],
+        'gross': [123.0, 184.5, 123.0],
+        'total': [1230.0, 3690.0, 3690.0],
+    })
+    aggregates = SummaryAggregates()
+
+    aggregates.add(get_report(1, compact_orders(data)))
+    aggregates.add(get_report(2, data))
+    aggregates.add(get_report(3, compact_orders(data.iloc[1:])))
+
+    assert aggregates.by_name.index.dtype == object
+    assert aggregates.by_name['quantity'].to_dict() == {'Product1': 110, 'Product2': 60}
+
+
+def test_totals_match_report_sum_row():
+    rows = 100_000
+    report = get_report(1, pd.DataFrame({
+        'id': range(1, rows + 1),
+        'name': ['Product1', 'Product2'] * (rows // 2),
+        'price': [0.1, 19.99] * (rows // 2),
+        'quantity': [3, 7] * (rows // 2),
+    }))
+    report.set_price_cols()
+    aggregates = SummaryAggregates()
+
+    aggregates.add(report)
+
+    sum_row = report.get_sum_row()
+    assert aggregates.totals.to_dict() == {'price': 1_004_500.0, 'gross': 1_235_500.0, 'total': 8_624_500.0}
+    assert aggregates.totals.to_dict() == sum_row[['price', 'gross', 'total']].to_dict()
+    assert aggregates.total_by_name.sum() == sum_row['total']
+
+
+def test_get_rollups():
+    report = get_report(1, pd.DataFrame({
+        'name': ['Product2', 'Product1', 'Product2'],
+        'quantity': [1, 2, 3],
+        'price': [0.1, 100.0, 0.2],
+        'gross': [0.12, 123.0, 0.25],
+        'total': [0.12, 246.0, 0.75],
+    }))
+
+    rollups = get_rollups(report)
+
+    assert rollups.columns.tolist() == ['date', 'name', 'orders', 'quantity', 'price', 'gross', 'total']
+    assert rollups.values.tolist() == [
+        [datetime(2025, 1, 1).date(), 'Product1', 1, 2, 10000, 12300, 24600],
+        [datetime(2025, 1, 1).date(), 'Product2', 2, 4, 30, 37, 87],
+    ]
+
+
+def test_add_rollups():
+    report = get_report(1, pd.DataFrame({
+        'name': ['Product1', 'Product2'],
+        'quantity': [1, 2],
+        'price': [100.0, 10.0],
+        'gross': [123.0, 12.3],
+        'total': [123.0, 24.6],
+    }))
+    from_reports = SummaryAggregates()
+    from_reports.add(report)
+    from_rollups = SummaryAggregates()
+
+    from_rollups.add_rollups(get_rollups(report))
+
+    assert from_rollups.rows_count == from_reports.rows_count
+    assert from_rollups.totals.equals(from_reports.totals)
+    assert from_rollups.by_date.equals(from_reports.by_date)
+    assert from_rollups.by_name.equals(from_reports.by_name)
+
+
+def test_add_empty_report():
+    aggregates = SummaryAggregates()
+
+    aggregates.add(get_report(1, pd.DataFrame(columns=['name', 'quantity', 'price', 'gross', 'total'])))
+
+    assert aggregates.dates == [datetime(2025, 1, 1).date()]
+    assert aggregates.total_by_date == {datetime(2025, 1, 1).date(): 0.0}
@@ -0,0 +1,80 @@
+import os
+import pathlib
+import unittest.mock
+
+import pandas as pd
+import pytest
+
+from datetime import datetime
+
+from src.cache import ReportCache
+from src.report import Report
+
+
+def get_report(path: pathlib.Path, ids: list) -> Report:
+    pd.DataFrame(
+        {
+            'id': ids,
+            'name': ['Product1', 'Product2'],
+            'price': [100.0, 150.0],
+            'quantity': [10, 20]
+        }
+    ).to_excel(path, index=False, header=True)
+
+    return Report(path, datetime.strptime(path.stem, '%Y_%m_%d').date())
+
+
+@unittest.mock.patch('pandas.io.json.to_json')
+def test_save_and_load(to_json_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+    cache = ReportCache(path=tmp_path / 'cache')
+    report = get_report(tmp_path / '2025_01_01.xlsx', [1, -2])
+    report.set_orders()
+    report.set_price_cols()
+
+    assert cache.load(report) is None
+
+    cache.save(report)
+    data, errors = cache.load(report)
+
+    assert data.equals(report.data)
+    assert errors.equals(report.errors)
+
+
+def test_load_changed_source(tmp_path: pathlib.Path):
+    cache = ReportCache(path=tmp_path / 'cache')
+    report = get_report(tmp_path / '2025_01_01.xlsx', [1, 2])
+    report.set_orders()
+    report.set_price_cols()
+    cache.save(report)
+
+    report = get_report(tmp_path / '2025_01_01.xlsx', [1, 3])
+    os.utime(report.path, ns=(0, 0))
+
+    assert cache.load(report) is None
+
+    report.set_orders()
+    report.set_price_cols()
+    cache.save(report)
+
+    assert len(list(cache.path.iterdir())) == 1
+
+
+def test_evict(tmp_path: pathlib.Path):
+    cache = ReportCache(path=tmp_path / 'cache', max_entries=2)
+    reports = [get_report(tmp_path / f'2025_01_0{i}.xlsx', [1, 2]) for i in range(1, 4)]
+    for i, report in enumerate(reports):
+        report.set_orders()
+        report.set_price_cols()
+        cache.save(report)
+        os.utime(cache.get_entry_path(report), ns=(i, i))
+
+    cache.load(reports[0])
+    cache.evict()
+
+    assert cache.load(reports[0]) is not None
+    assert cache.load(reports[1]) is None
+    assert cache.load(reports[2]) is not None
+
+
+def test_init_raise_exception():
+    pytest.raises(ValueError, ReportCache, max_entries=-1)
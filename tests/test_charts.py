@@ -0,0 +1,61 @@
+import pathlib
+import unittest.mock
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from PIL import Image
+
+from src.charts import ChartRenderer, render_chart
+
+
+LINE_CHART = ('line', ['2025-01-01', '2025-01-02'], [8610.0, 21525.0])
+PIE_CHART = ('pie', [4920.0, 3690.0], ['Product1', 'Product2'])
+
+
+@pytest.mark.parametrize('chart', [LINE_CHART, PIE_CHART], ids=['Line', 'Pie'])
+def test_render_chart(chart: tuple, tmp_path: pathlib.Path):
+    rendered = render_chart(tmp_path / 'chart', chart)
+
+    with Image.open(rendered.path) as image:
+        assert image.size == (rendered.width, rendered.height)
+    assert rendered.path.name == f'chart-{rendered.width}x{rendered.height}.png'
+
+
+@unittest.mock.patch('src.charts.render_chart', wraps=render_chart)
+def test_render_from_cache(render_chart_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+    renderer = ChartRenderer(tmp_path)
+
+    rendered = renderer.render([LINE_CHART, PIE_CHART])
+    cached = renderer.render([LINE_CHART, PIE_CHART])
+
+    assert render_chart_mock.call_count == 2
+    assert cached == rendered
+    assert [chart.path.name.split('-')[0] for chart in rendered] == ['line', 'pie']
+
+
+@unittest.mock.patch('src.charts.render_chart', wraps=render_chart)
+def test_render_removes_stale_charts(render_chart_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+    renderer = ChartRenderer(tmp_path)
+
+    old_line_chart, pie_chart = renderer.render([LINE_CHART, PIE_CHART])
+    new_line_chart, = renderer.render([('line', ['2025-01-01'], [8610.0])])
+
+    assert render_chart_mock.call_count == 3
+    assert not old_line_chart.path.exists()
+    assert new_line_chart.path.exists()
+    assert pie_chart.path.exists()
+
+
+@unittest.mock.patch('src.charts.ProcessPoolExecutor', wraps=ThreadPoolExecutor)
+def test_render_with_workers(executor_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+    rendered = ChartRenderer(tmp_path, workers=4).render([LINE_CHART, PIE_CHART])
+
+    executor_mock.assert_called_once_with(max_workers=2)
+    assert [chart.path.name.split('-')[0] for chart in rendered] == ['line', 'pie']
+    assert all(chart.path.exists() for chart in rendered)
+
+
+def test_chart_renderer_raise_exception(tmp_path: pathlib.Path):
+    pytest.raises(ValueError, ChartRenderer, tmp_path, workers=0)
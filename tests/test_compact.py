@@ -0,0 +1,52 @@
+import pandas as pd
+
+from src.compact import compact_orders, concat_orders
+
+
+def get_orders(names: list[str], ids: list[int]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'id': ids,
+        'name': names,
+        'price': [100.0] * len(ids),
+        'quantity': [1] * len(ids),
+    })
+
+
+def test_compact_orders():
+    data = get_orders(['Product1', 'Product2', 'Product1'], [1, 2, 3])
+
+    compact = compact_orders(data)
+
+    assert compact['name'].cat.categories.tolist() == ['Product1', 'Product2']
+    assert compact[['id', 'quantity']].dtypes.tolist() == ['int32', 'int32']
+    assert compact['price'].dtype == 'float64'
+    assert compact.astype({'name': object, 'id': 'int64', 'quantity': 'int64'}).equals(data)
+    assert data['name'].dtype == object
+
+
+def test_compact_orders_large_ids():
+    compact = compact_orders(get_orders(['Product1'], [2 ** 40]))
+
+    assert compact['id'].dtype == 'int64'
+    assert compact['quantity'].dtype == 'int32'
+
+
+def test_concat_orders():
+    orders = concat_orders([
+        compact_orders(get_orders(['Product2', 'Product1'], [1, 2])),
+        compact_orders(get_orders(['Product3'], [3])),
+    ])
+
+    assert orders['name'].cat.categories.tolist() == ['Product1', 'Product2', 'Product3']
+    assert orders['name'].tolist() == ['Product2', 'Product1', 'Product3']
+    assert orders['id'].tolist() == [1, 2, 3]
+
+
+def test_concat_orders_not_compact():
+    orders = concat_orders([
+        compact_orders(get_orders(['Product1'], [1])),
+        get_orders(['Product2'], [2]),
+    ])
+
+    assert orders['name'].dtype == object
+    assert orders['name'].tolist() == ['Product1', 'Product2']
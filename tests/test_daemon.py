@@ -0,0 +1,111 @@
+import os
+import pathlib
+import unittest.mock
+
+import pandas as pd
+import pytest
+
+from src.charts import RenderedChart
+from src.daemon import Daemon
+from src.manifest import Manifest
+from src.report import Report
+from src.writers import write_frame
+
+
+def write_day(path: pathlib.Path, price: float) -> None:
+    write_frame(path, pd.DataFrame({
+        'id': [1, 2],
+        'name': ['Product1', 'Product2'],
+        'price': [price, 10.0],
+        'quantity': [1, 2],
+    }))
+
+
+@pytest.fixture
+def daemon(tmp_path: pathlib.Path) -> Daemon:
+    (tmp_path / 'data').mkdir()
+    summary_path = tmp_path / 'Summary.pdf'
+
+    with (
+        unittest.mock.patch('src.report.REPORTS_DIR_PATH', tmp_path),
+        unittest.mock.patch('src.report.VALIDATION_ERRORS_DIR_PATH', tmp_path),
+        unittest.mock.patch('src.summary.SUMMARY_PATH', summary_path),
+        unittest.mock.patch('src.summary.TEMP_DIR_PATH', tmp_path),
+        unittest.mock.patch('src.utils.TEMP_DIR_PATH', tmp_path),
+        unittest.mock.patch(
+            'src.summary.ChartRenderer.render', return_value=[RenderedChart(tmp_path / 'chart.png', 1, 1)]
+        ),
+        unittest.mock.patch(
+            'src.summary.SimpleDocTemplate.build', side_effect=lambda *args: summary_path.touch()
+        ),
+    ):
+        yield Daemon(path=tmp_path / 'data', manifest=Manifest(path=tmp_path / 'manifest.json'), settle=0)
+
+
+@unittest.mock.patch.object(Report, 'load', autospec=True, side_effect=Report.load)
+def test_run(load_mock: unittest.mock.MagicMock, daemon: Daemon, tmp_path: pathlib.Path):
+    write_day(tmp_path / 'data' / '2025_01_01.xlsx', 100.0)
+    write_day(tmp_path / 'data' / '2025_01_02.xlsx', 100.0)
+
+    assert daemon.run()
+    assert load_mock.call_count == 2
+    assert daemon.summary.aggregates.rows_count == 4
+
+    assert not daemon.run()
+    assert load_mock.call_count == 2
+
+    warm_report = daemon.reports[tmp_path / 'data' / '2025_01_02.xlsx']
+    write_day(tmp_path / 'data' / '2025_01_01.xlsx', 200.0)
+    os.utime(tmp_path / 'data' / '2025_01_01.xlsx', ns=(1, 1))
+    write_day(tmp_path / 'data' / '2025_01_03.xlsx', 100.0)
+
+    assert daemon.run()
+    assert load_mock.call_count == 4
+    assert daemon.reports[tmp_path / 'data' / '2025_01_02.xlsx'] is warm_report
+    assert [report.date.day for report in daemon.summary.reports] == [1, 2, 3]
+    assert daemon.summary.data['price'].max() == 20000
+
+    (tmp_path / 'data' / '2025_01_03.xlsx').unlink()
+
+    assert daemon.run()
+    assert load_mock.call_count == 4
+    assert not (tmp_path / '2025_01_03_report.xlsx').exists()
+    assert [report.date.day for report in daemon.summary.reports] == [1, 2]
+
+
+def test_run_summary_removed(daemon: Daemon, tmp_path: pathlib.Path):
+    write_day(tmp_path / 'data' / '2025_01_01.xlsx', 100.0)
+    daemon.run()
+
+    daemon.summary.path.unlink()
+
+    assert daemon.run()
+    assert daemon.summary.path.exists()
+
+
+def test_run_no_data(daemon: Daemon):
+    assert not daemon.run()
+    assert daemon.summary is None
+
+
+def test_run_safely_retries(daemon: Daemon, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture):
+    write_day(tmp_path / 'data' / '2025_01_01.xlsx', 100.0)
+
+    with unittest.mock.patch.object(Report, 'save', side_effect=OSError('Disk full')):
+        daemon.run_safely()
+
+    assert 'Disk full' in capsys.readouterr().err
+    assert daemon.run()
+
+
+def test_run_pending_file(daemon: Daemon, tmp_path: pathlib.Path):
+    daemon.watcher.settle_ns = 60 * 10 ** 9
+    write_day(tmp_path / 'data' / '2025_01_01.xlsx', 100.0)
+
+    assert not daemon.run()
+    assert daemon.reports == {}
+
+    os.utime(tmp_path / 'data' / '2025_01_01.xlsx', ns=(1, 1))
+
+    assert daemon.run()
+    assert list(daemon.reports) == [tmp_path / 'data' / '2025_01_01.xlsx']
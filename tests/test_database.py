@@ -0,0 +1,96 @@
+import pathlib
+import unittest.mock
+
+import pandas as pd
+import pytest
+
+from datetime import date
+
+from src.database import OrderDatabase
+from src.report import Report
+
+
+def get_report(day: int, data: pd.DataFrame) -> Report:
+    report = Report(pathlib.Path(f'2025_01_0{day}.xlsx'), date(2025, 1, day))
+    report.data = data
+    with unittest.mock.patch('src.report.Report.save_errors'):
+        report.set_orders()
+    report.set_price_cols()
+
+    return report
+
+
+@pytest.fixture
+def database(tmp_path: pathlib.Path) -> OrderDatabase:
+    database = OrderDatabase(tmp_path / 'database' / 'orders.sqlite')
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def report() -> Report:
+    return get_report(1, pd.DataFrame({
+        'id': [1, 2, 3],
+        'name': ['Product1', 'Product2', None],
+        'price': [10.01, 150.0, 100.0],
+        'quantity': [10, 2, 3],
+    }))
+
+
+def test_update(database: OrderDatabase, report: Report):
+    database.update(report)
+
+    assert database.query('SELECT * FROM orders ORDER BY id').values.tolist() == [
+        ['2025-01-01', 1, 'Product1', 1001, 10, .23, 1231, 12310],
+        ['2025-01-01', 2, 'Product2', 15000, 2, .23, 18450, 36900],
+    ]
+    assert database.query('SELECT * FROM errors').values.tolist() == [
+        ['2025-01-01', 2, 'name', 'Input should be a valid string'],
+    ]
+
+
+def test_update_replaces_date(database: OrderDatabase, report: Report):
+    database.update(report)
+    database.update(
+        get_report(2, pd.DataFrame({'id': [4], 'name': ['Product1'], 'price': [1.0], 'quantity': [1]}))
+    )
+    report.data = report.data.iloc[:1]
+    report.errors = report.errors.iloc[:0]
+    database.update(report)
+
+    assert database.query('SELECT date, id FROM orders ORDER BY date').values.tolist() == [
+        ['2025-01-01', 1], ['2025-01-02', 4],
+    ]
+    assert database.query('SELECT * FROM errors').empty
+
+
+def test_update_batches(database: OrderDatabase, report: Report):
+    with unittest.mock.patch('src.database.DATABASE_BATCH_ROWS', 2):
+        database.update(report)
+
+    assert database.query('SELECT COUNT(*) AS count FROM orders')['count'].tolist() == [2]
+
+
+def test_remove(database: OrderDatabase, report: Report, tmp_path: pathlib.Path):
+    database.update(report)
+    database.update(
+        get_report(2, pd.DataFrame({'id': [4], 'name': ['Product1'], 'price': [1.0], 'quantity': [1]}))
+    )
+
+    database.remove([date(2025, 1, 1)])
+    database.close()
+
+    reopened = OrderDatabase(tmp_path / 'database' / 'orders.sqlite')
+    assert reopened.get_dates() == [date(2025, 1, 2)]
+    assert reopened.has_date(date(2025, 1, 2))
+    assert not reopened.has_date(date(2025, 1, 1))
+    assert reopened.query('SELECT * FROM errors').empty
+    reopened.close()
+
+
+def test_indexes(database: OrderDatabase):
+    plan = database.query(
+        "EXPLAIN QUERY PLAN SELECT name, SUM(total) FROM orders WHERE date >= '2025-01-01' GROUP BY name"
+    )
+
+    assert plan['detail'].str.contains('USING INDEX').any()
@@ -0,0 +1,97 @@
+import os
+import pathlib
+import unittest.mock
+
+import pandas as pd
+import pytest
+
+from datetime import datetime
+
+from src.manifest import Manifest
+from src.report import Report
+
+
+@pytest.fixture
+def report(tmp_path: pathlib.Path) -> Report:
+    path = tmp_path / '2025_01_01.xlsx'
+    path.touch()
+    report = Report(path, datetime(2025, 1, 1).date())
+    report.errors = pd.DataFrame({'index': [0], 'col': ['id'], 'msg': ['Input should be greater than 0']})
+
+    with (
+        unittest.mock.patch('src.report.REPORTS_DIR_PATH', tmp_path),
+        unittest.mock.patch('src.report.VALIDATION_ERRORS_DIR_PATH', tmp_path),
+    ):
+        report.output_path.touch()
+        report.errors_path.touch()
+        yield report
+
+
+def test_update(tmp_path: pathlib.Path, report: Report):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+
+    assert not manifest.is_fresh(report)
+
+    manifest.update(report)
+    manifest.save()
+    manifest = Manifest.load(path=tmp_path / 'manifest.json')
+
+    assert manifest.is_fresh(report)
+    assert manifest.entries[str(report.path)]['outputs'] == [str(report.output_path), str(report.errors_path)]
+
+
+def test_is_fresh_missing_output(tmp_path: pathlib.Path, report: Report):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+    manifest.update(report)
+    report.errors_path.unlink()
+
+    assert not manifest.is_fresh(report)
+
+
+def test_get_sinks(tmp_path: pathlib.Path, report: Report):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+
+    assert manifest.get_sinks(report) == set()
+
+    manifest.update(report, sinks=['rollups'])
+    manifest.update(report, sinks=['database'])
+    manifest.save()
+    manifest = Manifest.load(path=tmp_path / 'manifest.json')
+
+    assert manifest.get_sinks(report) == {'database', 'rollups'}
+
+    os.utime(report.path, ns=(0, 0))
+    assert manifest.get_sinks(report) == set()
+    manifest.update(report)
+    assert manifest.get_sinks(report) == set()
+
+
+@pytest.mark.parametrize('deleted', [True, False], ids=['Deleted source', 'Changed source'])
+def test_remove_stale(tmp_path: pathlib.Path, report: Report, deleted: bool):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+    manifest.update(report)
+    os.utime(report.path, ns=(0, 0))
+
+    removed = manifest.remove_stale([] if deleted else [report])
+
+    assert removed == [report.output_path, report.errors_path]
+    assert manifest.entries == {}
+    assert not report.output_path.exists()
+
+
+def test_remove_stale_keeps_unchanged(tmp_path: pathlib.Path, report: Report):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+    manifest.update(report)
+
+    assert manifest.remove_stale([report]) == []
+    assert manifest.is_fresh(report)
+
+
+def test_remove_stale_out_of_range(tmp_path: pathlib.Path, report: Report):
+    manifest = Manifest(path=tmp_path / 'manifest.json')
+    manifest.update(report)
+    day = datetime.strptime(report.path.name[:10], '%Y_%m_%d').date()
+
+    assert manifest.remove_stale([], start=day.replace(year=day.year + 1)) == []
+    assert manifest.is_fresh(report)
+    assert manifest.remove_stale([], end=day) == [report.output_path, report.errors_path]
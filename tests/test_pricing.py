@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pricing import (
+    calculate_gross_cents,
+    calculate_gross_price,
+    calculate_total_price,
+    from_cents,
+    from_cents_columns,
+    to_basis_points,
+    to_cents,
+)
+
+
+@pytest.mark.parametrize(
+    'amount, expected',
+    [
+        (19.99, 1999), (0.1, 10), (0.125, 13), (0.135, 14), (0.0049, 0), (1.005, 101), (0.285, 29),
+        (2.675, 268),
+        (1.0049999999999997, 100), (400000000.0, 40000000000), (100000000.004, 10000000000),
+        (1e12, 100000000000000), (123456789012.345, 12345678901235),
+    ],
+)
+def test_to_cents(amount: float, expected: int):
+    assert to_cents(amount) == expected
+
+
+def test_to_cents_columns():
+    amounts = np.array([1.005, 0.285, 1.004999, 123456.785])
+
+    assert to_cents(amounts).tolist() == [101, 29, 100, 12345679]
+
+
+def test_from_cents_columns():
+    data = pd.DataFrame({'name': ['Product1'], 'price': [1999], 'quantity': [2], 'total': [4918]})
+
+    amounts = from_cents_columns(data)
+
+    assert amounts.values.tolist() == [['Product1', 19.99, 2, 49.18]]
+    assert data['price'].tolist() == [1999]
+
+
+def test_to_basis_points():
+    assert to_basis_points(np.array([.23, .08, .055])).tolist() == [2300, 800, 550]
+
+
+@pytest.mark.parametrize(
+    'price_cents, tax_rate, expected',
+    [(100, .23, 123), (50, .23, 62), (150, .23, 185), (1999, .08, 2159), (1, .5, 2)],
+    ids=['Exact', 'Half up', 'Above half', 'Below half', 'Half of a cent'],
+)
+def test_calculate_gross_cents(price_cents: int, tax_rate: float, expected: int):
+    assert calculate_gross_cents(price_cents, tax_rate) == expected
+
+
+def test_calculate_prices_columns():
+    price = np.array([100.0, 0.5, 19.99])
+    quantity = np.array([3, 7, 2])
+    tax_rate = np.array([.23, .23, .08])
+
+    assert calculate_gross_price(price, tax_rate).tolist() == [123.0, 0.62, 21.59]
+    assert calculate_total_price(price, quantity, tax_rate).tolist() == [369.0, 4.34, 43.18]
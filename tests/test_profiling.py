@@ -0,0 +1,92 @@
+import json
+import os
+import pathlib
+import unittest.mock
+
+from src.profiling import PROFILER, Profiler, run_profiled
+
+
+def test_stage():
+    profiler = Profiler(enabled=True)
+
+    with profiler.stage('prepare', report='2025_01_01') as prepare_stage:
+        with profiler.stage('read', report='2025_01_01') as read_stage:
+            read_stage.rows = 10
+        prepare_stage.rows = 8
+
+    read_stage, prepare_stage = profiler.stages
+    assert [stage.name for stage in profiler.stages] == ['read', 'prepare']
+    assert [stage.rows for stage in profiler.stages] == [10, 8]
+    assert prepare_stage.wall >= read_stage.wall >= 0
+    assert prepare_stage.start_ns <= read_stage.start_ns
+    assert all(stage.cpu >= 0 and stage.pid == os.getpid() for stage in profiler.stages)
+
+
+def test_stage_disabled():
+    profiler = Profiler()
+
+    with profiler.stage('read') as stage:
+        stage.rows = 10
+
+    assert profiler.stages == []
+
+
+def test_get_table():
+    profiler = Profiler(enabled=True)
+    for rows in [10, 20]:
+        with profiler.stage('read', rows=rows):
+            pass
+    with profiler.stage('pdf'):
+        pass
+
+    header, read_line, pdf_line = profiler.get_table().splitlines()
+
+    assert header.split()[:3] == ['stage', 'calls', 'wall']
+    assert read_line.split()[:2] == ['read', '2']
+    assert read_line.split()[-1] == '30'
+    assert pdf_line.split()[-1] == '-'
+
+
+def test_get_totals():
+    profiler = Profiler(enabled=True)
+    with profiler.stage('pdf'):
+        pass
+    for rows in [10, 20]:
+        with profiler.stage('read', rows=rows):
+            pass
+
+    totals = profiler.get_totals()
+
+    assert list(totals) == ['pdf', 'read']
+    assert totals['read']['calls'] == 2
+    assert totals['read']['rows'] == 30
+    assert totals['pdf']['rows'] is None
+
+
+def test_save_trace(tmp_path: pathlib.Path):
+    profiler = Profiler(enabled=True)
+    with profiler.stage('read', report='2025_01_01', rows=10):
+        pass
+
+    profiler.save_trace(tmp_path / 'trace.json')
+
+    with open(tmp_path / 'trace.json') as trace:
+        event, = json.load(trace)['traceEvents']
+    assert event['name'] == 'read 2025_01_01'
+    assert event['ph'] == 'X'
+    assert event['args']['rows'] == 10
+    assert event['args']['report'] == '2025_01_01'
+
+
+@unittest.mock.patch.object(PROFILER, 'stages', [])
+@unittest.mock.patch.object(PROFILER, 'enabled', False)
+def test_run_profiled():
+    def read() -> str:
+        with PROFILER.stage('read'):
+            return 'data'
+
+    profiler = Profiler(enabled=True)
+    results = list(profiler.collect([run_profiled(read), run_profiled(read)]))
+
+    assert results == ['data', 'data']
+    assert [stage.name for stage in profiler.stages] == ['read', 'read']
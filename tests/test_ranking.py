@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ranking import get_top, get_top_positions
+
+
+@pytest.mark.parametrize('k, expected', [
+    (1, [3]),
+    (2, [3, 1]),
+    (3, [3, 1, 4]),
+    (5, [3, 1, 4, 0, 2]),
+    (10, [3, 1, 4, 0, 2]),
+])
+def test_get_top_positions(k: int, expected: list[int]):
+    assert get_top_positions(np.array([1, 5, 0, 7, 5]), k).tolist() == expected
+
+
+def test_get_top_positions_matches_sort():
+    values = np.random.default_rng(0).integers(0, 100, 10_000)
+
+    expected = np.argsort(-values, kind='stable')[:250]
+
+    assert get_top_positions(values, 250).tolist() == expected.tolist()
+
+
+def test_get_top():
+    values = pd.Series([10, 40, 20, 30], index=pd.Index(['A', 'B', 'C', 'D'], name='name'), name='quantity')
+
+    top = get_top(values, 2)
+
+    assert top.to_dict() == {'B': 40, 'D': 30, 'Other': 30}
+    assert top.index.name == 'name'
+    assert top.name == 'quantity'
+    assert top.dtype == values.dtype
+    assert get_top(values).index.tolist() == ['B', 'D', 'C', 'A']
+    assert get_top(values, 4).index.tolist() == ['B', 'D', 'C', 'A']
+    assert get_top(values.iloc[:0], 2).empty
+
+
+def test_get_top_merged_days():
+    first_day = pd.Series({'A': 5, 'B': 3, 'C': 4})
+    second_day = pd.Series({'B': 3, 'C': 1, 'D': 2})
+
+    top = get_top(first_day.add(second_day, fill_value=0), 2)
+
+    assert top.to_dict() == {'B': 6, 'A': 5, 'Other': 7}
+
+
+def test_get_top_exception():
+    with pytest.raises(ValueError, match='k must be >= 1'):
+        get_top(pd.Series([1]), 0)
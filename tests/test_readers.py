@@ -0,0 +1,87 @@
+import numpy as np
+import pathlib
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from datetime import datetime, time, timedelta
+
+from src.readers import READ_COLUMNS, read_openpyxl, read_pandas, read_xml
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        pd.DataFrame(
+            {
+                'id': [1, 1, 2],
+                'name': ['Product1', 'Product2', 'Product1'],
+                'quantity': [10, 20, 30],
+                'price': [100.5, 150.0, 100.0],
+            }
+        ),
+        pd.DataFrame(
+            {
+                'id': [1, np.nan, 3],
+                'name': ['Product1', np.nan, 'NA'],
+                'quantity': [1, 'a', 2],
+                'price': [100, np.nan, 150.25],
+                'extra': ['a', 'b', 'c'],
+            }
+        ),
+        pd.DataFrame(
+            {
+                'id': [1, 2],
+                'namee': ['Product1', 'Product2'],
+                'TAX_RATE': [.08, np.nan],
+            }
+        ),
+    ],
+    ids=['Valid data', 'Missing data', 'Missing col']
+)
+@pytest.mark.parametrize('reader', [read_openpyxl, read_xml], ids=['openpyxl', 'xml'])
+def test_read_streaming(tmp_path: pathlib.Path, data: pd.DataFrame, reader):
+    path = tmp_path / '2025_01_01.xlsx'
+    data.to_excel(path, index=False, header=True)
+    expected_data = read_pandas(path)
+    expected_data = expected_data[[col for col in expected_data.columns if col in READ_COLUMNS]]
+
+    assert reader(path).equals(expected_data)
+
+
+@pytest.mark.parametrize('reader', [read_openpyxl, read_xml], ids=['openpyxl', 'xml'])
+def test_read_streaming_write_only_workbook(tmp_path: pathlib.Path, reader):
+    path = tmp_path / '2025_01_01.xlsx'
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    rows = [
+        ['name', 'id', 'price', 'quantity'], ['Product1', 1, 1.5, 2], [None, None], ['Product2', 2, 3, None],
+    ]
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+    assert reader(path).equals(read_pandas(path))
+
+
+@pytest.mark.parametrize('date1904', [False, True], ids=['1900 dates', '1904 dates'])
+@pytest.mark.parametrize('reader', [read_openpyxl, read_xml], ids=['openpyxl', 'xml'])
+def test_read_streaming_date_formats(tmp_path: pathlib.Path, date1904: bool, reader):
+    path = tmp_path / '2025_01_01.xlsx'
+    workbook = openpyxl.Workbook()
+    workbook.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904 if date1904 else workbook.epoch
+    sheet = workbook.active
+    for row in [['id', 'name', 'price', 'quantity'], [1, 'Product1', 45658, 0.5], [2, 'Product2', 1.5, 1.25]]:
+        sheet.append(row)
+    sheet['C2'].number_format = 'yyyy-mm-dd'
+    sheet['D2'].number_format = 'h:mm'
+    sheet['D3'].number_format = '[h]:mm'
+    workbook.save(path)
+
+    data = reader(path)
+
+    assert data.equals(read_pandas(path))
+    epoch = datetime(1904, 1, 1) if date1904 else datetime(1899, 12, 30)
+    assert data['price'].tolist()[0] == epoch + timedelta(45658)
+    assert data['quantity'].tolist() == [time(12), timedelta(hours=30)]
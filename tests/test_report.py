@@ -8,6 +8,7 @@ import pytest
 from datetime import datetime
 
 from src.constans import DATE_FORMAT
+import src.report
 from src.report import Report
 from src.utils import PROJECT_ROOT_PATH, VALIDATION_ERRORS_DIR_PATH
 
@@ -31,7 +32,27 @@ class TestReport:
         )
 
         read_excel_mock.return_value = data
-        return Report(TEST_REPORT_PATH, datetime.strptime(TEST_REPORT_PATH.stem, DATE_FORMAT).date())
+        report = Report(TEST_REPORT_PATH, datetime.strptime(TEST_REPORT_PATH.stem, DATE_FORMAT).date())
+        report.data = report.load()
+
+        return report
+
+    @pytest.mark.parametrize('reader', ['openpyxl', 'xml'])
+    def test_load_with_reader(self, reader: str):
+        date = datetime.strptime(TEST_REPORT_PATH.stem, DATE_FORMAT).date()
+        report = Report(TEST_REPORT_PATH, date, reader=reader)
+
+        reader_mock = unittest.mock.MagicMock()
+        with unittest.mock.patch.dict('src.report.READERS', {reader: reader_mock}):
+            report.load()
+
+        reader_mock.assert_called_once_with(TEST_REPORT_PATH)
+
+    @pytest.mark.parametrize(
+        'kwargs', [{'reader': 'xlrd'}, {'writer': 'xlsxwriter'}], ids=['Reader', 'Writer']
+    )
+    def test_init_raise_exception(self, kwargs: dict):
+        pytest.raises(ValueError, Report, TEST_REPORT_PATH, datetime(2025, 1, 1).date(), **kwargs)
 
     def test_read_orders(self):
         data = pd.DataFrame(
@@ -50,6 +71,18 @@ class TestReport:
             for attr in data.columns:
                 assert getattr(report_order.data, attr) == data_order[attr]
 
+    def test_set_orders_compact(self):
+        report = self.get_report()
+        report.compact = True
+
+        report.set_orders()
+        report.set_price_cols()
+
+        assert isinstance(report.data['name'].dtype, pd.CategoricalDtype)
+        assert report.data[['id', 'quantity']].dtypes.tolist() == ['int32', 'int32']
+        assert report.data['total'].tolist() == [123000, 369000, 369000]
+        assert report.get_col_sum_by('name').values.tolist() == [['Product1', 40], ['Product2', 20]]
+
     @pytest.mark.parametrize(
         'data, valid_orders_count',
         [
@@ -167,7 +200,7 @@ class TestReport:
                         'col': ['name', 'price', 'quantity', 'name'],
                         'msg': [
                             'Input should be a valid string',
-                            'Input should be greater than 0',
+                            'Input should be a finite number',
                             'Input should be a finite number',
                             'String should have at least 3 characters'
                         ]
@@ -257,19 +290,77 @@ class TestReport:
             {
                 'id': [1, 1, 2],
                 'name': ['Product1', 'Product2', 'Product1'],
-                'price': [100.0, 150.0, 100.0],
+                'price': [10000, 15000, 10000],
                 'quantity': [10, 20, 30],
                 'TAX': [.23, .23, .23],
-                'gross': [123.0, 184.5, 123.0],
-                'total': [1230.0, 3690.0, 3690.0]
+                'gross': [12300, 18450, 12300],
+                'total': [123000, 369000, 369000]
+            }
+        )
+
+        report = self.get_report()
+        report.set_orders()
+        report.set_price_cols()
+
+        assert report.data.equals(expected_data)
+
+    def test_set_price_cols_with_tax_rate_col(self):
+        expected_data = pd.DataFrame(
+            {
+                'id': [1, 1, 2],
+                'name': ['Product1', 'Product2', 'Product1'],
+                'price': [10000, 15000, 10000],
+                'quantity': [10, 20, 30],
+                'TAX': [.08, .23, 0],
+                'gross': [10800, 18450, 10000],
+                'total': [108000, 369000, 300000]
             }
         )
 
         report = self.get_report()
+        report.data['TAX_RATE'] = [.08, np.nan, 0]
         report.set_orders()
         report.set_price_cols()
 
         assert report.data.equals(expected_data)
+        assert [order.calculate_gross_price() for order in report.orders] == [108.0, 184.5, 100.0]
+
+    def test_set_price_cols_invalid_tax_rate(self):
+        report = self.get_report()
+        report.data['TAX_RATE'] = [.08, 'abc', 5]
+        report.set_orders(save_errors=False)
+        report.set_price_cols()
+
+        assert report.data['gross'].tolist() == [10800]
+        assert report.errors[['index', 'col']].values.tolist() == [[1, 'TAX_RATE'], [2, 'TAX_RATE']]
+
+    def test_set_price_cols_out_of_range(self):
+        report = self.get_report()
+        report.data = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5],
+            'name': ['Product1'] * 5,
+            'price': [np.inf, 1e17, 100.0, 100.0, 1e9],
+            'quantity': [1, 1, 10 ** 17, 2, 10 ** 6],
+        })
+        report.set_orders(save_errors=False)
+
+        with np.errstate(all='raise'):
+            report.set_price_cols()
+
+        assert report.data['total'].tolist() == [24600]
+        assert report.errors[['index', 'col']].values.tolist() == [
+            [0, 'price'], [1, 'price'], [2, 'quantity'], [4, 'total']
+        ]
+
+    @unittest.mock.patch('pandas.io.json.to_json')
+    def test_set_price_cols_without_valid_orders(self, to_json_mock: unittest.mock.MagicMock):
+        report = self.get_report()
+        report.data = report.data.drop(columns=['price'])
+        report.set_orders()
+        report.set_price_cols()
+
+        assert report.data.empty
+        assert report.orders == []
 
     def test_set_sum_row(self):
         expected_data = pd.DataFrame(
@@ -291,6 +382,48 @@ class TestReport:
 
         assert report.get_data_with_sum_row().equals(expected_data)
 
+    def test_sums_cached(self):
+        report = self.get_report()
+        report.set_orders()
+
+        assert report.get_sums_by('name') is report.get_sums_by('name')
+        assert 'total' not in report.get_sums_by('name')
+
+        report.set_price_cols()
+
+        assert report.get_sums_by('name')['total'].tolist() == [492000, 369000]
+        with unittest.mock.patch('src.report.from_cents', wraps=src.report.from_cents) as from_cents_mock:
+            assert report.get_sum_row()['total'] == 8610.0
+            report.get_sum_row()['total'] = 0
+
+            assert report.get_sum_row()['total'] == 8610.0
+            assert from_cents_mock.call_count == 3
+
+        report.data = report.data.iloc[:1]
+
+        assert report.get_sums_by('name')['quantity'].tolist() == [10]
+        assert report.get_sum_row()['total'] == 1230.0
+
+    def test_release(self):
+        report = self.get_report()
+        report.data.loc[3] = [4, 'A', 100.0, 'abc']
+        report.set_orders(save_errors=False)
+        data, errors = report.data, report.errors
+
+        report.release()
+
+        assert report.data.empty
+        assert report.data.columns.equals(data.columns)
+        assert report.errors.empty
+        # An empty view shares no elements with the rows, the array it keeps alive is checked instead.
+        for frame in [report.data, report.errors]:
+            for column in frame:
+                array = frame[column].to_numpy()
+                while array.base is not None:
+                    array = array.base
+                assert array.nbytes == 0
+        assert not errors.empty
+
     def test_get_col_sum_by(self):
         report = self.get_report()
         report.set_orders()
@@ -302,6 +435,9 @@ class TestReport:
         })
 
         assert report.get_col_sum_by(col_name='name').equals(expected_data)
+        assert report.get_col_sum_by(col_name='name', top_n=1).values.tolist() == [
+            ['Product1', 40], ['Other', 20],
+        ]
 
     @unittest.mock.patch('pandas.ExcelWriter', return_value=unittest.mock.MagicMock())
     @unittest.mock.patch('pandas.DataFrame.to_excel')
@@ -311,6 +447,7 @@ class TestReport:
         excel_writer: unittest.mock.MagicMock,
     ):
         report = self.get_report()
+        report.writer = 'pandas'
         report.set_orders()
         report.set_price_cols()
 
@@ -327,6 +464,14 @@ class TestReport:
                 startrow=1,
                 startcol=0
             ),
+            unittest.mock.call(
+                unittest.mock.ANY,
+                sheet_name='Report',
+                index=False,
+                header=False,
+                startrow=len(report.data) + 2,
+                startcol=0
+            ),
             unittest.mock.call(
                 unittest.mock.ANY,
                 sheet_name='Report',
@@ -338,4 +483,4 @@ class TestReport:
         ]
 
         to_excel_mock.assert_has_calls(expected_calls)
-        assert to_excel_mock.call_count == 2
+        assert to_excel_mock.call_count == 3
@@ -0,0 +1,99 @@
+import pathlib
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from datetime import date
+
+from src.rollups import SCHEMA, RollupStore
+
+
+def get_rollups(day: int, totals: list[int]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'date': date(2025, 1, day),
+        'name': [f'Product{i}' for i in range(1, len(totals) + 1)],
+        'orders': 1,
+        'quantity': 2,
+        'price': totals,
+        'gross': totals,
+        'total': totals,
+    })
+
+
+@pytest.fixture
+def store(tmp_path: pathlib.Path) -> RollupStore:
+    store = RollupStore(tmp_path / 'rollups' / 'rollups.sqlite')
+    yield store
+    store.close()
+
+
+def test_update(store: RollupStore):
+    store.update(date(2025, 1, 1), get_rollups(1, [100, 200]))
+    store.update(date(2025, 1, 2), get_rollups(2, [300]))
+    store.update(date(2025, 1, 1), get_rollups(1, [150]))
+
+    rollups = store.load()
+
+    assert rollups.values.tolist() == [
+        [date(2025, 1, 1), 'Product1', 1, 2, 150, 150, 150],
+        [date(2025, 1, 2), 'Product1', 1, 2, 300, 300, 300],
+    ]
+    assert store.get_dates() == [date(2025, 1, 1), date(2025, 1, 2)]
+
+
+def test_update_without_orders(store: RollupStore):
+    store.update(date(2025, 1, 1), get_rollups(1, [100, 200]))
+    store.update(date(2025, 1, 2), get_rollups(2, [300]))
+
+    store.update(date(2025, 1, 1), get_rollups(1, []))
+
+    assert store.load()['date'].tolist() == [date(2025, 1, 2)]
+    assert store.get_dates() == [date(2025, 1, 1), date(2025, 1, 2)]
+    assert store.get_dates(end=date(2025, 1, 1)) == [date(2025, 1, 1)]
+    assert store.has_date(date(2025, 1, 1))
+    assert not store.has_date(date(2025, 1, 3))
+
+
+def test_update_exception(store: RollupStore):
+    with pytest.raises(ValueError, match='rollups must all be of 2025-01-02'):
+        store.update(date(2025, 1, 2), get_rollups(1, [100]))
+
+
+def test_dates_of_older_store(tmp_path: pathlib.Path):
+    path = tmp_path / 'rollups.sqlite'
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(SCHEMA.split(';')[0])
+        connection.executemany(
+            'INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?)',
+            get_rollups(1, [1, 2]).astype({'date': str}).itertuples(index=False, name=None),
+        )
+    connection.close()
+
+    store = RollupStore(path)
+
+    assert store.get_dates() == [date(2025, 1, 1)]
+    store.close()
+
+
+def test_load_range(store: RollupStore):
+    for day in range(1, 6):
+        store.update(date(2025, 1, day), get_rollups(day, [day]))
+
+    assert store.load(date(2025, 1, 2), date(2025, 1, 4))['total'].tolist() == [2, 3, 4]
+    assert store.load(start=date(2025, 1, 4))['total'].tolist() == [4, 5]
+    assert store.load(end=date(2025, 1, 1))['total'].tolist() == [1]
+    assert store.load(date(2026, 1, 1)).empty
+
+
+def test_remove(store: RollupStore, tmp_path: pathlib.Path):
+    store.update(date(2025, 1, 1), get_rollups(1, [1]))
+    store.update(date(2025, 1, 2), get_rollups(2, [2]))
+
+    store.remove([date(2025, 1, 1)])
+    store.close()
+
+    reopened = RollupStore(tmp_path / 'rollups' / 'rollups.sqlite')
+    assert reopened.get_dates() == [date(2025, 1, 2)]
+    reopened.close()
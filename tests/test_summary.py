@@ -1,6 +1,8 @@
 import pathlib
 import unittest.mock
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import pytest
 
@@ -8,20 +10,22 @@ from datetime import datetime
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Image, LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
+from src.charts import RenderedChart
 from src.constans import TABLE_STYLE, TOTAL_TABLE_STYLE
-from src.summary import Summary
+from src.summary import Summary, map_bounded, prepare_report
 from src.report import Report
-from src.utils import TEMP_DIR_PATH
+from src.database import OrderDatabase
+from src.rollups import RollupStore
 
 
 @unittest.mock.patch('src.report.Report.save')
 class TestSummary:
     @unittest.mock.patch('pandas.read_excel', side_effect=[
         pd.DataFrame({
-            'id': [4, 5, 6],
-            'name': ['Product1', 'Product3', 'Product5'],
-            'price': [100.0, 180.0, 200.0],
-            'quantity': [1, 30, 60]
+            'id': [1, 1, 2],
+            'name': ['Product1', 'Product2', 'Product1'],
+            'price': [100.0, 150.0, 100.0],
+            'quantity': [10, 20, 30]
         }),
         pd.DataFrame({
             'id': [3, 3, 3],
@@ -30,20 +34,25 @@ class TestSummary:
             'quantity': [10, 20, 30]
         }),
         pd.DataFrame({
-            'id': [1, 1, 2],
-            'name': ['Product1', 'Product2', 'Product1'],
-            'price': [100.0, 150.0, 100.0],
-            'quantity': [10, 20, 30]
+            'id': [4, 5, 6],
+            'name': ['Product1', 'Product3', 'Product5'],
+            'price': [100.0, 180.0, 200.0],
+            'quantity': [1, 30, 60]
         })
     ])
-    def get_summary(self, *args, **kwargs) -> Summary:
+    def get_summary(
+        self,
+        read_excel_mock: unittest.mock.MagicMock,
+        reports_number: int = 3,
+        **kwargs,
+    ) -> Summary:
         reports = [
             Report(
                 pathlib.Path(f'2025_01_0{i}.xlsx'),
                 datetime(2025, 1, i).date())
-            for i in range(3, 0, -1)
+            for i in range(reports_number, 0, -1)
         ]
-        summary =  Summary(reports)
+        summary =  Summary(reports, **kwargs)
 
         return summary
 
@@ -56,19 +65,19 @@ class TestSummary:
             'name': ['Product1', 'Product2', 'Product1',
                      'Product1', 'Product2', 'Product3',
                      'Product1', 'Product3', 'Product5'],
-            'price': [100.0, 150.0, 100.0,
-                      100.0, 150.0, 100.0,
-                      100.0, 180.0, 200.0],
+            'price': [10000, 15000, 10000,
+                      10000, 15000, 10000,
+                      10000, 18000, 20000],
             'quantity': [10, 20, 30,
                          10, 20, 30,
                          1, 30, 60],
             'TAX': [.23 for _ in range(9)],
-            'gross': [123.0, 184.5, 123.0,
-                      123.0, 184.5, 123.0,
-                      123.0, 221.4, 246.0],
-            'total': [1230.0, 3690.0, 3690.0,
-                      1230.0, 3690.0, 3690.0,
-                      123.0, 6642.0, 14760.0]
+            'gross': [12300, 18450, 12300,
+                      12300, 18450, 12300,
+                      12300, 22140, 24600],
+            'total': [123000, 369000, 369000,
+                      123000, 369000, 369000,
+                      12300, 664200, 1476000]
         })
 
         summary = self.get_summary()
@@ -78,23 +87,269 @@ class TestSummary:
         assert report_save_mock.call_count == 3
         assert summary.data.equals(expected_data)
 
+    def test_init_streaming(
+        self,
+        report_save_mock: unittest.mock.MagicMock
+    ):
+        summary = self.get_summary(streaming=True)
+
+        assert summary.data.empty
+        assert all(report.data.empty for report in summary.reports)
+        assert summary.aggregates.rows_count == 9
+        assert summary.aggregates.totals.round(2).to_dict() == {
+            'price': 1180.0, 'gross': 1451.4, 'total': 38745.0,
+        }
+
+    @unittest.mock.patch('src.summary.ProcessPoolExecutor', wraps=ThreadPoolExecutor)
+    def test_init_with_workers(
+        self,
+        executor_mock: unittest.mock.MagicMock,
+        report_save_mock: unittest.mock.MagicMock
+    ):
+        reports = []
+        for i in range(3, 0, -1):
+            report = Report(pathlib.Path(f'2025_01_0{i}.xlsx'), datetime(2025, 1, i).date())
+            report.data = pd.DataFrame({
+                'id': [i, i],
+                'name': ['Product1', 'Product2'],
+                'price': [100.0, 150.0],
+                'quantity': [i, 1]
+            })
+            reports.append(report)
+
+        summary = Summary(reports, workers=2)
+
+        executor_mock.assert_called_once_with(max_workers=2)
+        assert [report.date for report in summary.reports] == [
+            datetime(2025, 1, i).date() for i in range(1, 4)
+        ]
+        assert summary.data['id'].tolist() == [1, 1, 2, 2, 3, 3]
+        assert summary.data['total'].tolist() == [12300, 18450, 24600, 18450, 36900, 18450]
+        assert report_save_mock.call_count == 3
+
+    @pytest.mark.parametrize('streaming', [False, True], ids=['In memory', 'Streaming'])
+    def test_init_with_read_ahead(
+        self,
+        report_save_mock: unittest.mock.MagicMock,
+        streaming: bool,
+    ):
+        reports = []
+        for i in range(4, 0, -1):
+            report = Report(pathlib.Path(f'2025_01_0{i}.xlsx'), datetime(2025, 1, i).date())
+            report.data = pd.DataFrame({
+                'id': [i, i],
+                'name': ['Product1', 'Product2'],
+                'price': [100.0, 150.0],
+                'quantity': [i, 1]
+            })
+            reports.append(report)
+        written_rows = []
+
+        with unittest.mock.patch(
+            'src.summary.save_report',
+            side_effect=lambda report, fresh: written_rows.append(len(report.data)),
+        ):
+            summary = Summary(reports, read_ahead=2, streaming=streaming)
+
+        assert [report.date for report in summary.reports] == [
+            datetime(2025, 1, i).date() for i in range(1, 5)
+        ]
+        assert summary.aggregates.total_by_date == {
+            datetime(2025, 1, i).date(): 123.0 * i + 184.5 for i in range(1, 5)
+        }
+        assert written_rows == [2, 2, 2, 2]
+        if not streaming:
+            assert summary.data['id'].tolist() == [1, 1, 2, 2, 3, 3, 4, 4]
+
+    def test_from_rollups(self, report_save_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+        rollups = RollupStore(tmp_path / 'rollups.sqlite')
+        summary = self.get_summary(rollups=rollups)
+
+        from_rollups = Summary.from_rollups(rollups, start=datetime(2025, 1, 1).date(), detail='daily')
+
+        assert from_rollups.reports == []
+        assert from_rollups.detail == 'daily'
+        assert from_rollups.aggregates.rows_count == summary.aggregates.rows_count == 9
+        assert from_rollups.aggregates.totals.equals(summary.aggregates.totals)
+        assert from_rollups.aggregates.by_date.equals(summary.aggregates.by_date)
+        assert from_rollups.aggregates.by_name.equals(summary.aggregates.by_name)
+
+        day = datetime(2025, 1, 2).date()
+        from_rollups = Summary.from_rollups(rollups, start=day, end=day)
+
+        assert from_rollups.aggregates.dates == [datetime(2025, 1, 2).date()]
+        assert from_rollups.aggregates.rows_count == 3
+        pytest.raises(ValueError, Summary.from_rollups, rollups, start=datetime(2025, 2, 1).date())
+        pytest.raises(ValueError, Summary.from_rollups, rollups, detail='full')
+        rollups.close()
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_init_database(
+        self,
+        report_save_mock: unittest.mock.MagicMock,
+        tmp_path: pathlib.Path,
+        streaming: bool,
+    ):
+        database = OrderDatabase(tmp_path / 'orders.sqlite')
+        self.get_summary(database=database, streaming=streaming)
+
+        orders = database.query('SELECT date, id, quantity FROM orders ORDER BY date, rowid')
+
+        assert orders['date'].unique().tolist() == ['2025-01-01', '2025-01-02', '2025-01-03']
+        assert orders['id'].tolist() == [1, 1, 2, 3, 3, 3, 4, 5, 6]
+        assert orders['quantity'].sum() == 211
+        database.close()
+
+    def test_init_saved_sinks(self, report_save_mock: unittest.mock.MagicMock, tmp_path: pathlib.Path):
+        database = OrderDatabase(tmp_path / 'orders.sqlite')
+        rollups = RollupStore(tmp_path / 'rollups.sqlite')
+        self.get_summary(database=database, rollups=rollups)
+        manifest = unittest.mock.MagicMock()
+        manifest.is_fresh.return_value = False
+        manifest.get_sinks.return_value = {'database', 'rollups'}
+
+        with (
+            unittest.mock.patch.object(database, 'update', wraps=database.update) as database_update_mock,
+            unittest.mock.patch.object(rollups, 'update', wraps=rollups.update) as rollups_update_mock,
+        ):
+            self.get_summary(database=database, rollups=rollups, manifest=manifest)
+
+            database_update_mock.assert_not_called()
+            rollups_update_mock.assert_not_called()
+            manifest.update.assert_called_with(unittest.mock.ANY, sinks=['rollups', 'database'])
+
+            database.remove([datetime(2025, 1, 2).date()])
+            rollups.remove([datetime(2025, 1, 2).date()])
+            self.get_summary(database=database, rollups=rollups, manifest=manifest)
+
+            assert database_update_mock.call_count == rollups_update_mock.call_count == 1
+        expected_dates = [datetime(2025, 1, i).date() for i in range(1, 4)]
+        assert database.get_dates() == rollups.get_dates() == expected_dates
+        database.close()
+        rollups.close()
+
+    def test_from_rollups_day_without_orders(
+        self,
+        report_save_mock: unittest.mock.MagicMock,
+        tmp_path: pathlib.Path,
+    ):
+        rollups = RollupStore(tmp_path / 'rollups.sqlite')
+        self.get_summary(rollups=rollups)
+        report = Report(pathlib.Path('2025_01_02.xlsx'), datetime(2025, 1, 2).date())
+        report.data = pd.DataFrame({'id': [7], 'name': ['Product1'], 'price': ['abc'], 'quantity': [1]})
+
+        with unittest.mock.patch.object(Report, 'save_errors'):
+            summary = Summary([report], rollups=rollups)
+        from_rollups = Summary.from_rollups(rollups)
+
+        assert summary.aggregates.total_by_date == {datetime(2025, 1, 2).date(): 0.0}
+        assert from_rollups.aggregates.dates == [datetime(2025, 1, i).date() for i in range(1, 4)]
+        assert from_rollups.aggregates.total_by_date[datetime(2025, 1, 2).date()] == 0.0
+        assert from_rollups.aggregates.rows_count == 6
+        day = datetime(2025, 1, 2).date()
+        assert Summary.from_rollups(rollups, start=day, end=day).aggregates.dates == [day]
+        rollups.close()
+
+    @unittest.mock.patch('reportlab.platypus.doctemplate.SimpleDocTemplate.build')
+    @unittest.mock.patch('src.summary.ChartRenderer.render', return_value=[
+        RenderedChart(pathlib.Path('line.png'), 100, 100),
+        RenderedChart(pathlib.Path('pie.png'), 100, 100),
+    ])
+    def test_save_from_rollups(
+        self,
+        render_mock: unittest.mock.MagicMock,
+        build_mock: unittest.mock.MagicMock,
+        report_save_mock: unittest.mock.MagicMock,
+        tmp_path: pathlib.Path,
+    ):
+        rollups = RollupStore(tmp_path / 'rollups.sqlite')
+        self.get_summary(rollups=rollups)
+
+        Summary.from_rollups(rollups).save()
+        rollups.close()
+
+        (line_chart, pie_chart), = render_mock.call_args.args
+        title = build_mock.call_args.args[0][0]
+        assert title.text == 'Summary 2025-01-01 - 2025-01-03'
+        assert line_chart == ('line', ['2025-01-01', '2025-01-02', '2025-01-03'], [8610.0, 8610.0, 21525.0])
+        assert pie_chart[0] == 'pie'
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            {'workers': 0},
+            {'detail': 'all'},
+            {'detail': 'full', 'streaming': True},
+            {'detail_top_n': 0},
+            {'read_ahead': -1},
+            {'read_ahead': 1, 'workers': 2},
+        ],
+        ids=[
+            'Workers',
+            'Detail',
+            'Full detail streaming',
+            'Detail top n',
+            'Read ahead',
+            'Read ahead with workers',
+        ]
+    )
+    def test_init_raise_exception(self, report_save_mock: unittest.mock.MagicMock, kwargs: dict):
+        pytest.raises(ValueError, Summary, [], **kwargs)
+
+    @unittest.mock.patch('src.report.Report.set_orders')
+    def test_prepare_report_from_cache(
+        self,
+        set_orders_mock: unittest.mock.MagicMock,
+        report_save_mock: unittest.mock.MagicMock
+    ):
+        data = pd.DataFrame({'id': [1], 'name': ['Product1'], 'price': [100.0], 'quantity': [1]})
+        cache = unittest.mock.MagicMock()
+        cache.load.return_value = (data, pd.DataFrame())
+
+        report = Report(pathlib.Path('2025_01_01.xlsx'), datetime(2025, 1, 1).date())
+        report = prepare_report(report, cache=cache)
+
+        set_orders_mock.assert_not_called()
+        cache.save.assert_not_called()
+        report_save_mock.assert_called_once()
+        assert report.data is data
+        assert report.validated
+
+    @unittest.mock.patch('src.report.Report.save_errors')
+    @unittest.mock.patch('pandas.read_excel', return_value=pd.DataFrame({
+        'id': [1, -1],
+        'name': ['Product1', 'Product2'],
+        'price': [100.0, 150.0],
+        'quantity': [1, 2]
+    }))
+    def test_prepare_fresh_report(
+        self,
+        read_excel_mock: unittest.mock.MagicMock,
+        save_errors_mock: unittest.mock.MagicMock,
+        report_save_mock: unittest.mock.MagicMock
+    ):
+        manifest = unittest.mock.MagicMock()
+        manifest.is_fresh.return_value = True
+
+        report = Report(pathlib.Path('2025_01_01.xlsx'), datetime(2025, 1, 1).date())
+        report = prepare_report(report, manifest=manifest)
+
+        save_errors_mock.assert_not_called()
+        report_save_mock.assert_not_called()
+        assert report.data['total'].tolist() == [12300]
+
     @pytest.mark.parametrize('reports_number', [1,2,3], ids=['One report', 'Two reports', 'Three reports'])
     @unittest.mock.patch.object(Image, '__repr__', return_value='Image obj')
     @unittest.mock.patch('reportlab.platypus.doctemplate.SimpleDocTemplate.build')
-    @unittest.mock.patch('matplotlib.pyplot.plot')
-    @unittest.mock.patch('matplotlib.pyplot.pie')
-    @unittest.mock.patch('matplotlib.pyplot.savefig')
-    @unittest.mock.patch('src.summary.Summary.get_image_size')
+    @unittest.mock.patch('src.charts.render_chart')
     def test_save(
         self,
-        get_image_size: unittest.mock.MagicMock,
-        savefig_mock: unittest.mock.MagicMock,
-        pie_plot_mock: unittest.mock.MagicMock,
-        plot_mock: unittest.mock.MagicMock,
+        render_chart_mock: unittest.mock.MagicMock,
         build_mock: unittest.mock.MagicMock,
         image_obj_mock: unittest.mock.MagicMock,
         report_save_mock: unittest.mock.MagicMock,
         reports_number: int,
+        tmp_path: pathlib.Path,
     ):
         expected_title = [
             'Summary 2025-01-01',
@@ -133,34 +388,26 @@ class TestSummary:
             ['Total'] + [sum([data[6] for data in expected_table])]
         ]
         expected_table.insert(0, ['Id', 'Name', 'Price', 'Quantity', 'Tax', 'Gross', 'Total'])
-        expected_plot_calls = [
-            unittest.mock.call(['2025-01-01'], [8610.0], marker='o'),
-            unittest.mock.call(['2025-01-01', '2025-01-02'], [8610.0, 8610.0], marker='o'),
-            unittest.mock.call(['2025-01-01', '2025-01-02', '2025-01-03'], [8610.0, 8610.0, 21525.0], marker='o'),
-        ]
-        expected_pie_plot_calls = [
-            unittest.mock.call(
-                [4920.0, 3690.0],
-                labels=['Product1', 'Product2'],
-                autopct='%1.1f%%'
-            ),
-            unittest.mock.call(
-                [6150.0, 7380.0, 3690.0],
-                labels=['Product1', 'Product2', 'Product3'],
-                autopct='%1.1f%%'
-            ),
-            unittest.mock.call(
-                [6273.0, 7380.0, 10332.0, 14760.0],
-                labels=['Product1', 'Product2', 'Product3', 'Product5'],
-                autopct='%1.1f%%'
-            )
-        ]
-        get_image_size.return_value = (100, 100)
+        expected_line_chart = (
+            'line',
+            ['2025-01-01', '2025-01-02', '2025-01-03'][:reports_number],
+            [8610.0, 8610.0, 21525.0][:reports_number],
+        )
+        expected_pie_chart = [
+            ('pie', [4920.0, 3690.0], ['Product1', 'Product2']),
+            ('pie', [7380.0, 6150.0, 3690.0], ['Product2', 'Product1', 'Product3']),
+            ('pie', [14760.0, 10332.0, 7380.0, 6273.0], ['Product5', 'Product3', 'Product2', 'Product1']),
+        ][reports_number - 1]
+        expected_charts = [expected_pie_chart]
+        if reports_number > 1:
+            expected_charts.insert(0, expected_line_chart)
+        render_chart_mock.side_effect = lambda path, chart: RenderedChart(
+            path.with_name(f'{path.name}-500x1000.png'), 500, 1000
+        )
 
-        summary = self.get_summary()
-        summary.reports = summary.reports[:reports_number]
-        summary.data = summary.data[:reports_number * 3]
-        summary.save()
+        summary = self.get_summary(reports_number=reports_number)
+        with unittest.mock.patch('src.summary.TEMP_DIR_PATH', tmp_path):
+            summary.save()
 
         expected_calls = [
             Paragraph(expected_title, style=getSampleStyleSheet()['Title']),
@@ -178,17 +425,132 @@ class TestSummary:
         if reports_number > 1:
             expected_calls.extend([
                 Paragraph(f'Total income by a date', style=getSampleStyleSheet()['Heading2']),
-                Image(f'{TEMP_DIR_PATH}/total_by_date.png', width=550, height=250),
+                Image(f'{tmp_path}/total_by_date.png', width=100, height=200),
                 Spacer(1, 12)
             ])
         expected_calls.extend([
             Paragraph(f'Total income by a product', style=getSampleStyleSheet()['Heading2']),
-            Image(f'{TEMP_DIR_PATH}/total_by_name.png', width=100, height=200)
+            Image(f'{tmp_path}/total_by_name.png', width=100, height=200)
         ])
 
-        assert get_image_size.call_count == 2
         assert str(build_mock.call_args) == str(unittest.mock.call(expected_calls))
-        assert savefig_mock.call_count == 2
-        assert plot_mock.call_args == expected_plot_calls[reports_number - 1]
-        assert pie_plot_mock.call_args == expected_pie_plot_calls[reports_number - 1]
+        assert [call.args[1] for call in render_chart_mock.call_args_list] == expected_charts
+        assert all(call.args[0].parent == tmp_path for call in render_chart_mock.call_args_list)
         report_save_mock.assert_called()
+
+    @unittest.mock.patch('src.summary.SUMMARY_TABLE_CHUNK_ROWS', 4)
+    def test_get_detail_elements_full(self, report_save_mock: unittest.mock.MagicMock):
+        summary = self.get_summary()
+
+        elements = summary._get_detail_elements()
+        tables = elements[:-1]
+
+        assert len(tables) == 3
+        assert all(table._flowable is None for table in tables)
+        # Outside of a frame only the first chunk starts with the header.
+        assert [len(table.flowable._cellvalues) for table in tables] == [5, 4, 1]
+        assert tables[0].flowable._cellvalues[0][0] == 'Id'
+        assert tables[2].flowable._cellvalues[0] == [6, 'Product5', 200.0, 60, 0.23, 246.0, 14760.0]
+        assert isinstance(elements[-1], Spacer)
+
+    @unittest.mock.patch('src.summary.SUMMARY_TABLE_CHUNK_ROWS', 7)
+    def test_orders_table_header_on_every_page(
+        self,
+        report_save_mock: unittest.mock.MagicMock,
+        tmp_path: pathlib.Path
+    ):
+        summary = self.get_summary()
+        summary.data = pd.concat([summary.data] * 40, ignore_index=True)
+        drawn = []
+
+        def draw_on(table: LongTable, canvas, *args, **kwargs) -> None:
+            drawn.append((canvas.getPageNumber(), table._cellvalues[0][0] == 'Id', table._nrows))
+
+        with unittest.mock.patch.object(LongTable, 'drawOn', autospec=True, side_effect=draw_on):
+            SimpleDocTemplate(str(tmp_path / 'summary.pdf')).build(summary._get_detail_elements())
+
+        pages = [page for page, _, _ in drawn]
+        assert pages[-1] > 1
+        assert [header for _, header, _ in drawn] == [
+            position == 0 or page != pages[position - 1] for position, page in enumerate(pages)
+        ]
+        assert sum(rows_count - header for _, header, rows_count in drawn) == 360
+
+    @pytest.mark.parametrize(
+        'detail, expected_heading, expected_table',
+        [
+            (
+                'top',
+                'Top 2 products',
+                [
+                    ['Name', 'Quantity', 'Total'],
+                    ['Product5', 60, 14760.0],
+                    ['Product3', 60, 10332.0],
+                ],
+            ),
+            (
+                'daily',
+                'Total by a date',
+                [
+                    ['Date', 'Orders', 'Quantity', 'Price', 'Gross', 'Total'],
+                    ['2025-01-01', 3, 60, 350.0, 430.5, 8610.0],
+                    ['2025-01-02', 3, 60, 350.0, 430.5, 8610.0],
+                    ['2025-01-03', 3, 91, 480.0, 590.4, 21525.0],
+                ],
+            ),
+        ],
+        ids=['Top', 'Daily']
+    )
+    def test_get_detail_elements_aggregated(
+        self,
+        report_save_mock: unittest.mock.MagicMock,
+        detail: str,
+        expected_heading: str,
+        expected_table: list[list],
+    ):
+        summary = self.get_summary(streaming=True, detail=detail, detail_top_n=2)
+
+        heading, table, spacer = summary._get_detail_elements()
+
+        assert heading.text == expected_heading
+        assert table._cellvalues == expected_table
+        assert isinstance(spacer, Spacer)
+
+    def test_get_detail_elements_off(self, report_save_mock: unittest.mock.MagicMock):
+        summary = self.get_summary(detail='off')
+
+        assert summary._get_detail_elements() == []
+
+    @unittest.mock.patch('reportlab.platypus.doctemplate.SimpleDocTemplate.build')
+    @unittest.mock.patch(
+        'src.summary.ChartRenderer.render', return_value=[RenderedChart(pathlib.Path('chart.png'), 100, 100)]
+    )
+    def test_save_streaming(
+        self,
+        render_mock: unittest.mock.MagicMock,
+        build_mock: unittest.mock.MagicMock,
+        report_save_mock: unittest.mock.MagicMock,
+    ):
+        summary = self.get_summary(streaming=True)
+        summary.save()
+
+        elements = build_mock.call_args.args[0]
+        assert not any(isinstance(element, LongTable) for element in elements)
+        assert any(isinstance(element, Table) for element in elements)
+
+
+def test_map_bounded():
+    pulled = []
+
+    def get_items():
+        for item in range(10):
+            pulled.append(item)
+            yield item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = map_bounded(executor, lambda item: item * 2, get_items(), window=3)
+
+        assert next(results) == 0
+        # Three items were submitted, the fourth waits for the first result to be consumed.
+        assert pulled == [0, 1, 2, 3]
+        assert list(results) == [item * 2 for item in range(1, 10)]
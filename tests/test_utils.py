@@ -1,8 +1,13 @@
+import datetime
 import pathlib
 import pytest
 import re
 import unittest.mock as mock
 
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
 from src.constans import XLSX_FILE_NAME_PATTERN
 import src.utils
 
@@ -22,6 +27,75 @@ def test_generate_fake_data():
     assert len(dummy_report) == 10
     assert re.match(XLSX_FILE_NAME_PATTERN, dummy_report_path.name)
 
+def test_generate_fake_data_seed():
+    dummy_report, dummy_report_path = src.utils.generate_fake_data(10, 10, seed=1)
+
+    assert dummy_report_path != src.utils.generate_fake_data(10, 10, seed=2)[1]
+    assert dummy_report.equals(src.utils.generate_fake_data(10, 10, seed=1)[0])
+    assert dummy_report_path == src.utils.generate_fake_data(10, 10, seed=1)[1]
+
 def test_generate_fake_data_raise_exception():
     pytest.raises(ValueError, src.utils.generate_fake_data, -1, 10)
 
+
+def test_generate_fake_orders():
+    orders = src.utils.generate_fake_orders(100_000, order_id_start=5, seed=1)
+
+    id_steps = orders['id'].diff().dropna()
+    assert orders.columns.tolist() == ['id', 'name', 'quantity', 'price']
+    assert orders['id'].iloc[0] == 5
+    assert set(id_steps.unique()) == {0, 1}
+    assert (id_steps == 0).mean() == pytest.approx(src.utils.FAKE_REPEATED_ID_CHANCE, abs=.01)
+    assert orders['quantity'].between(1, 9).all()
+    assert orders.groupby('name')['price'].nunique().eq(1).all()
+    assert orders.equals(src.utils.generate_fake_orders(100_000, order_id_start=5, seed=1))
+
+@pytest.fixture
+def data_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    names = ['2024/2024_12_31.xlsx', '2025/2025_01_01.xlsx', '2025_01_02.xlsx', 'notes.txt', '2023/notes.txt']
+    for name in names:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+
+    return tmp_path
+
+@pytest.mark.parametrize('start, end, names', [
+    (None, None, ['2024_12_31.xlsx', '2025_01_01.xlsx', '2025_01_02.xlsx']),
+    (datetime.date(2025, 1, 1), None, ['2025_01_01.xlsx', '2025_01_02.xlsx']),
+    (None, datetime.date(2025, 1, 1), ['2024_12_31.xlsx', '2025_01_01.xlsx']),
+    (datetime.date(2025, 1, 3), None, []),
+])
+def test_scan_data_files(
+    data_dir: pathlib.Path,
+    start: datetime.date | None,
+    end: datetime.date | None,
+    names: list[str],
+):
+    assert [path.name for path in src.utils.scan_data_files(data_dir, start=start, end=end)] == names
+
+def test_get_data_dirs(data_dir: pathlib.Path):
+    assert src.utils.get_data_dirs(data_dir) == [
+        data_dir, data_dir / '2023', data_dir / '2024', data_dir / '2025',
+    ]
+    assert src.utils.get_data_dirs(data_dir, start=datetime.date(2025, 1, 1)) == [data_dir, data_dir / '2025']
+
+def test_scan_data_files_raise_exception(data_dir: pathlib.Path):
+    (data_dir / '2025_01_01.xlsx').touch()
+
+    with pytest.raises(ValueError, match='are of the same date'):
+        src.utils.scan_data_files(data_dir)
+
+@pytest.mark.parametrize('workers', [1, 2])
+@mock.patch('src.utils.ProcessPoolExecutor', wraps=ThreadPoolExecutor)
+def test_generate_fake_days(executor_mock: mock.MagicMock, workers: int, tmp_path: pathlib.Path):
+    (tmp_path / 'data').mkdir()
+    with mock.patch('src.utils.DATA_DIR_PATH', tmp_path / 'data'):
+        paths = src.utils.generate_fake_days(
+            3, 20, end_date=datetime.date(2025, 1, 2), seed=1, workers=workers
+        )
+
+    reports = [pd.read_excel(path) for path in paths]
+    assert [path.name for path in paths] == ['2024_12_31.xlsx', '2025_01_01.xlsx', '2025_01_02.xlsx']
+    assert [report['id'].iloc[0] for report in reports] == [1, 21, 41]
+    assert all(len(report) == 20 for report in reports)
+    assert executor_mock.call_count == (workers > 1)
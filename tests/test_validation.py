@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pydantic
+import pytest
+
+from src.configs import OrderConfig
+from src.validation import ValidationErrors, validate_orders
+
+
+def validate_rows(data: pd.DataFrame) -> tuple[list, list[dict]]:
+    valid_rows, errors = [], []
+    for index, order in data.iterrows():
+        try:
+            OrderConfig(**order.to_dict())
+            valid_rows.append(index)
+        except pydantic.ValidationError as e:
+            errors.extend({'index': index, 'col': err['loc'][0], 'msg': err['msg']} for err in e.errors())
+
+    return valid_rows, errors
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        pd.DataFrame(
+            {
+                'id': [1, 2, -1, 0.5, 2.0, np.nan, '3', '', None, True, 1e20],
+                'name': ['Product1', 'ab', 'x' * 49, np.nan, 5, 'Product2', b'abc', '', 'Pro', 'Pro', 'Pro'],
+                'price': [1.5, -2, 0, np.nan, np.inf, '', '2.5', None, 3, 4, 5],
+                'quantity': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 0],
+            },
+            index=[10, 3, 4, 5, 6, 7, 8, 9, 0, 1, 2],
+        ),
+        pd.DataFrame(
+            {
+                'id': [1, -2, 3],
+                'name': ['Product1', 'Product2', 'P3'],
+                'quantity': [1.0, 2.5, np.nan],
+            }
+        ),
+    ],
+    ids=['Mixed types', 'Missing col']
+)
+def test_validate_orders_matches_order_config(data: pd.DataFrame):
+    expected_rows, expected_errors = validate_rows(data)
+
+    valid_data, errors = validate_orders(data)
+
+    assert valid_data.index.tolist() == expected_rows
+    assert errors.to_dict('records') == expected_errors
+
+
+def test_validate_orders_coerces_types():
+    data = pd.DataFrame(
+        {
+            'id': [1.0, 2.0, 0.1],
+            'name': ['Product1', 'Product2', 'Product3'],
+            'price': [100, '150.5', 200],
+            'quantity': ['3', 4, 5],
+            'extra': ['a', 'b', 'c'],
+        }
+    )
+    expected_data = pd.DataFrame(
+        {
+            'id': [1, 2],
+            'name': ['Product1', 'Product2'],
+            'price': [100.0, 150.5],
+            'quantity': [3, 4],
+            'extra': ['a', 'b'],
+        }
+    )
+
+    valid_data, errors = validate_orders(data)
+
+    assert valid_data.equals(expected_data)
+    assert errors['index'].tolist() == [2]
+
+
+def test_validate_orders_tax_rates():
+    data = pd.DataFrame(
+        {
+            'id': [1, 2, 3, 4, 5, 6, 7, 8],
+            'name': ['Product1'] * 8,
+            'price': [100.0] * 8,
+            'quantity': [1] * 8,
+            'TAX_RATE': [.08, None, ' ', '0.05', 'abc', -.5, 5, True],
+        }
+    )
+
+    valid_data, errors = validate_orders(data)
+
+    assert valid_data['id'].tolist() == [1, 2, 3, 4]
+    np.testing.assert_array_equal(valid_data['TAX_RATE'].to_numpy(), [.08, np.nan, np.nan, .05])
+    assert errors.values.tolist() == [
+        [4, 'TAX_RATE', 'Input should be a valid number'],
+        [5, 'TAX_RATE', 'Input should be greater than or equal to 0 and less than 1'],
+        [6, 'TAX_RATE', 'Input should be greater than or equal to 0 and less than 1'],
+        [7, 'TAX_RATE', 'Input should be a valid number'],
+    ]
+
+
+def test_validate_orders_out_of_range():
+    data = pd.DataFrame(
+        {
+            'id': [1, 2, 3, 4, 5, 6],
+            'name': ['Product1'] * 6,
+            'price': [np.inf, np.nan, 1e17, 'inf', 1e9, 1e9],
+            'quantity': [1, 1, 1, 1, 10 ** 17, 10 ** 4],
+        }
+    )
+    data['TAX_RATE'] = [np.nan] * 5 + [.5]
+
+    valid_data, errors = validate_orders(data)
+
+    assert valid_data.empty
+    assert errors.values.tolist() == [
+        [0, 'price', 'Input should be a finite number'],
+        [1, 'price', 'Input should be a finite number'],
+        [2, 'price', 'Input should be less than or equal to 1000000000'],
+        [3, 'price', 'Input should be a finite number'],
+        [4, 'quantity', 'Input should be less than or equal to 1000000000'],
+        [5, 'total', 'Total price should be less than or equal to 10000000000000'],
+    ]
+
+
+def test_validate_orders_numeric_tax_rates():
+    data = pd.DataFrame({
+        'id': [1, 2, 3],
+        'name': ['Product1'] * 3,
+        'price': [-1.0, 1.0, 1.0],
+        'quantity': [1] * 3,
+    })
+    data['TAX_RATE'] = [2.0, 1.0, np.nan]
+
+    valid_data, errors = validate_orders(data)
+
+    assert valid_data['id'].tolist() == [3]
+    assert errors[['index', 'col']].values.tolist() == [[0, 'price'], [0, 'TAX_RATE'], [1, 'TAX_RATE']]
+
+
+@pytest.mark.parametrize('max_errors, expected_errors_count', [(None, 6), (4, 4), (0, 0)])
+def test_validate_orders_max_errors(max_errors: int | None, expected_errors_count: int):
+    data = pd.DataFrame(
+        {
+            'id': [-1, 2, -3, 4],
+            'name': ['Product1', 'P2', 'Product3', 'P4'],
+            'price': [100, 150, -200, 250],
+            'quantity': [1, 2, 3, 4],
+        }
+    )
+    _, expected_errors = validate_rows(data)
+
+    valid_data, errors = validate_orders(data, max_errors=max_errors)
+
+    assert valid_data.empty
+    assert errors.to_dict('records') == expected_errors[:expected_errors_count]
+
+
+def test_validation_errors_raise_exception():
+    pytest.raises(ValueError, ValidationErrors, -1)
@@ -0,0 +1,102 @@
+import os
+import pathlib
+import unittest.mock
+
+import pytest
+
+import src.utils
+
+from src.watcher import DataWatcher
+
+
+OLD_NS = 10 ** 18
+
+
+@pytest.fixture
+def watcher(tmp_path: pathlib.Path) -> DataWatcher:
+    return DataWatcher(tmp_path, settle=60)
+
+
+def write(path: pathlib.Path, content: bytes = b'orders', mtime_ns: int | None = None) -> None:
+    path.write_bytes(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_poll(watcher: DataWatcher, tmp_path: pathlib.Path):
+    write(tmp_path / '2025_01_01.xlsx', mtime_ns=OLD_NS)
+    write(tmp_path / '2025_01_02.xlsx')
+    write(tmp_path / 'notes.txt', mtime_ns=OLD_NS)
+
+    assert watcher.poll()
+    assert watcher.states == {tmp_path / '2025_01_01.xlsx': (OLD_NS, 6)}
+    assert watcher.pending == {tmp_path / '2025_01_02.xlsx'}
+
+    assert not watcher.poll()
+
+    os.utime(tmp_path / '2025_01_02.xlsx', ns=(OLD_NS, OLD_NS))
+
+    assert watcher.poll()
+    assert set(watcher.states) == {tmp_path / '2025_01_01.xlsx', tmp_path / '2025_01_02.xlsx'}
+    assert watcher.pending == set()
+
+
+def test_poll_overwritten(watcher: DataWatcher, tmp_path: pathlib.Path):
+    write(tmp_path / '2025_01_01.xlsx', mtime_ns=OLD_NS)
+    watcher.poll()
+
+    write(tmp_path / '2025_01_01.xlsx', b'more orders')
+
+    assert not watcher.poll()
+    assert watcher.states == {tmp_path / '2025_01_01.xlsx': (OLD_NS, 6)}
+
+    write(tmp_path / '2025_01_01.xlsx', b'more orders', mtime_ns=OLD_NS + 1)
+
+    assert watcher.poll()
+    assert watcher.states == {tmp_path / '2025_01_01.xlsx': (OLD_NS + 1, 11)}
+
+
+def test_poll_removed(watcher: DataWatcher, tmp_path: pathlib.Path):
+    write(tmp_path / '2025_01_01.xlsx', mtime_ns=OLD_NS)
+    watcher.poll()
+
+    (tmp_path / '2025_01_01.xlsx').unlink()
+
+    assert watcher.poll()
+    assert watcher.states == {}
+
+
+def test_poll_lists_changed_directory(watcher: DataWatcher, tmp_path: pathlib.Path):
+    write(tmp_path / '2025_01_01.xlsx', mtime_ns=OLD_NS)
+    os.utime(tmp_path, ns=(OLD_NS, OLD_NS))
+
+    with unittest.mock.patch('src.utils.scan_data_files', wraps=src.utils.scan_data_files) as scan_mock:
+        watcher.poll()
+        watcher.poll()
+
+        assert scan_mock.call_count == 1
+
+        write(tmp_path / '2025_01_02.xlsx', mtime_ns=OLD_NS)
+        watcher.poll()
+
+        assert scan_mock.call_count == 2
+    assert len(watcher.states) == 2
+
+
+def test_poll_year_partitions(watcher: DataWatcher, tmp_path: pathlib.Path):
+    write(tmp_path / '2024_12_31.xlsx', mtime_ns=OLD_NS)
+    (tmp_path / '2025').mkdir()
+    write(tmp_path / '2025' / '2025_01_01.xlsx', mtime_ns=OLD_NS)
+
+    assert watcher.poll()
+    assert list(watcher.states) == [tmp_path / '2024_12_31.xlsx', tmp_path / '2025' / '2025_01_01.xlsx']
+
+    write(tmp_path / '2025' / '2025_01_02.xlsx', mtime_ns=OLD_NS)
+
+    assert watcher.poll()
+    assert tmp_path / '2025' / '2025_01_02.xlsx' in watcher.states
+
+
+def test_init_exception(tmp_path: pathlib.Path):
+    with pytest.raises(ValueError, match='settle must be >= 0'):
+        DataWatcher(tmp_path, settle=-1)
@@ -0,0 +1,76 @@
+import pathlib
+import unittest.mock
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from datetime import datetime
+
+from src.report import Report
+from src.writers import write_openpyxl, write_pandas, write_xml
+
+
+def get_report(rows: int) -> Report:
+    report = Report(pathlib.Path('2025_01_01.xlsx'), datetime(2025, 1, 1).date())
+    report.data = pd.DataFrame(
+        {
+            'id': [i // 2 + 1 for i in range(rows)],
+            'name': [['Product1', 'Product2', 'A & <B>'][i % 3] for i in range(rows)],
+            'price': [100.0 + i * .25 for i in range(rows)],
+            'quantity': [i % 7 + 1 for i in range(rows)],
+        }
+    )
+    report.validated = True
+    report.set_price_cols()
+
+    return report
+
+
+def read_sheet(path: pathlib.Path) -> list[list]:
+    workbook = openpyxl.load_workbook(path)
+    try:
+        rows = [[cell.value for cell in row] for row in workbook['Report'].iter_rows()]
+    finally:
+        workbook.close()
+
+    # Floats are compared in Excel precision, pandas writes ids of the sum row as floats.
+    return [[round(value, 9) if isinstance(value, float) else value for value in row] for row in rows]
+
+
+@pytest.mark.parametrize('chunk_rows', [10_000, 2], ids=['One chunk', 'Many chunks'])
+@pytest.mark.parametrize('writer', [write_openpyxl, write_xml], ids=['openpyxl', 'xml'])
+def test_write_streaming(tmp_path: pathlib.Path, chunk_rows: int, writer):
+    report = get_report(7)
+
+    with unittest.mock.patch.object(Report, 'output_path', tmp_path / 'expected.xlsx'):
+        write_pandas(report)
+    with (
+        unittest.mock.patch.object(Report, 'output_path', tmp_path / 'report.xlsx'),
+        unittest.mock.patch('src.writers.WRITE_CHUNK_ROWS', chunk_rows),
+    ):
+        writer(report)
+
+    assert read_sheet(tmp_path / 'report.xlsx') == read_sheet(tmp_path / 'expected.xlsx')
+
+
+def test_write_xml_illegal_characters(tmp_path: pathlib.Path):
+    report = get_report(3)
+    report.data.loc[1, 'name'] = 'ab\x01cd'
+
+    with (
+        unittest.mock.patch.object(Report, 'output_path', tmp_path / 'report.xlsx'),
+        pytest.raises(ValueError, match='cannot be used in worksheets'),
+    ):
+        write_xml(report)
+
+
+def test_write_xml_header_style(tmp_path: pathlib.Path):
+    with unittest.mock.patch.object(Report, 'output_path', tmp_path / 'report.xlsx'):
+        write_xml(get_report(3))
+
+    workbook = openpyxl.load_workbook(tmp_path / 'report.xlsx')
+    header = [cell for cell in workbook['Report'][2] if cell.value is not None]
+
+    assert len(header) == 9
+    assert all(cell.font.b and cell.border.left.style == 'thin' for cell in header)